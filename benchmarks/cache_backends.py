@@ -0,0 +1,108 @@
+"""
+✅ Benchmark de backends de caché con los artefactos reales del CV:
+
+- versiones:  get_many de las 7 versiones de sección (cada request)
+- fragmento:  un {% cache %} de ~2 KB
+- pagina:     entrada de compresion.py con la página (~25 KB + br + gzip)
+- pdf:        entrada con un PDF de ~1 MB
+
+Compara cv.cache_mmap.CacheMmap con FileBasedCache y LocMemCache
+(LocMemCache no se comparte: cada worker de gunicorn tiene su copia).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/cache_backends.py --veces 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+BACKENDS = {
+    "mmap": "cv.cache_mmap.CacheMmap",
+    "filebased": "django.core.cache.backends.filebased.FileBasedCache",
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+def artefactos():
+    pagina = os.urandom(8 * 1024) + b"<li>experiencia</li>" * 850
+    pdf = b"%PDF-1.4\n" + os.urandom(1024 * 1024)
+    return {
+        "versiones": {f"cv:version:1:{s}": 1_700_000_000_000 + i for i, s in enumerate(
+            ("datos", "experiencia", "cursos", "reconocimientos", "prod_academicos", "prod_laborales", "garage")
+        )},
+        "fragmento": "<section>" + "x" * 2000 + "</section>",
+        "pagina": {
+            "content_type": "text/html; charset=utf-8",
+            "cabeceras": {},
+            "variantes": {"identity": pagina, "br": pagina[:9000], "gzip": pagina[:10000]},
+        },
+        "pdf": {
+            "content_type": "application/pdf",
+            "cabeceras": {"Content-Disposition": 'inline; filename="hoja_vida.pdf"'},
+            "variantes": {"identity": pdf},
+        },
+    }
+
+
+def medir(cache, datos, veces):
+    tiempos = {}
+    cache.set_many(datos["versiones"], None)
+    claves = list(datos["versiones"])
+    inicio = time.perf_counter()
+    for _ in range(veces):
+        cache.get_many(claves)
+    tiempos["versiones"] = (time.perf_counter() - inicio) / veces
+
+    for nombre in ("fragmento", "pagina", "pdf"):
+        cache.set(nombre, datos[nombre], None)
+        inicio = time.perf_counter()
+        for _ in range(veces):
+            valor = cache.get(nombre)
+            if nombre != "fragmento":
+                # Lo que hace respuesta_desde_entrada: tomar el cuerpo
+                valor["variantes"]["identity"][:16]
+        tiempos[nombre] = (time.perf_counter() - inicio) / veces
+
+    inicio = time.perf_counter()
+    for i in range(min(veces, 200)):
+        cache.set(f"pdf:{i}", datos["pdf"], None)
+    tiempos["set pdf"] = (time.perf_counter() - inicio) / min(veces, 200)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--veces", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.configure(CACHES={
+            nombre: {
+                "BACKEND": backend,
+                "LOCATION": os.path.join(tmp, nombre),
+                "OPTIONS": {"MAX_ENTRIES": 100_000, "MAX_BYTES": 2 * 1024 ** 3},
+            }
+            for nombre, backend in BACKENDS.items()
+        })
+        django.setup()
+        from django.core.cache import caches
+
+        datos = artefactos()
+        resultados = {nombre: medir(caches[nombre], datos, args.veces) for nombre in BACKENDS}
+
+    operaciones = list(next(iter(resultados.values())))
+    print(f"{'µs/op':<12}" + "".join(f"{op:>12}" for op in operaciones))
+    for nombre, tiempos in resultados.items():
+        print(f"{nombre:<12}" + "".join(f"{tiempos[op] * 1e6:>12.1f}" for op in operaciones))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+✅ Benchmark de las calidades del PDF (cv/calidad_pdf.py): tiempo de render
+contra bytes del CV completo.
+
+Dibuja con cv.pdf.dibujar_cv sobre datos sintéticos (sin base de datos) y
+reescribe con qpdf cuando la calidad lo pide, igual que views.renderizar_pdf.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/calidad_pdf.py --filas 30 --veces 5
+"""
+import argparse
+import io
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from django.conf import settings  # noqa: E402
+
+settings.configure(CV_PDF_CALIDAD="equilibrado")
+
+from cv.calidad_pdf import CALIDADES  # noqa: E402
+from cv.linealizado import reescribir  # noqa: E402
+from cv.pdf import dibujar_cv  # noqa: E402
+
+SECCIONES = {"datos", "experiencia", "cursos", "reconocimientos", "prod_academicos", "prod_laborales", "garage"}
+
+TEXTO = (
+    "Desarrollo y mantenimiento de aplicaciones web con Django, administración de bases de "
+    "datos PostgreSQL y coordinación de equipos multidisciplinarios en proyectos tecnológicos."
+)
+
+
+def datos(filas):
+    perfil = SimpleNamespace(
+        nombres="María", apellidos="Lobatón", descripcionperfil="Ingeniera de software",
+        numerocedula="1300000000", nacionalidad="Ecuatoriana", direcciondomiciliaria="Manta",
+    )
+    fila = SimpleNamespace
+    return dict(
+        perfil=perfil,
+        experiencia=[fila(cargodesempenado=f"Cargo {i}", nombrempresa="ACME", lugarempresa="Quito",
+                          descripcionfunciones=TEXTO) for i in range(filas)],
+        cursos=[fila(nombrecurso=f"Curso {i}", totalhoras=40, fechainicio=date(2020, 1, 1),
+                     fechafin=date(2020, 2, 1), descripcioncurso=TEXTO) for i in range(filas)],
+        reconocimientos=[fila(tiporeconocimiento="Académico", descripcionreconocimiento=f"Premio {i}",
+                              entidadpatrocinadora="Universidad") for i in range(filas)],
+        productos_academicos=[fila(nombrerecurso=f"Artículo {i}", clasificador="Revista",
+                                   descripcion=TEXTO) for i in range(filas)],
+        productos_laborales=[fila(nombreproducto=f"Sistema {i}", fechaproducto=date(2022, 5, 1),
+                                  descripcion=TEXTO) for i in range(filas)],
+        garage=[fila(nombreproducto=f"Producto {i}", valordelbien=Decimal("25.00"),
+                     estadoproducto="Bueno", descripcion=TEXTO) for i in range(filas)],
+    )
+
+
+def renderizar(argumentos, calidad):
+    salida = io.BytesIO()
+    dibujar_cv(salida, secciones=SECCIONES, calidad=calidad, invariante=True, **argumentos)
+    return reescribir(salida.getvalue(), compactar=calidad.compactar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=30, help="filas por sección")
+    parser.add_argument("--veces", type=int, default=5)
+    args = parser.parse_args()
+
+    argumentos = datos(args.filas)
+    print(f"{args.filas} filas por sección")
+    print(f"{'':<14}{'ms/render':>12}{'KB':>10}")
+    for nombre, calidad in CALIDADES.items():
+        renderizar(argumentos, calidad)  # warmup (fuentes, guionado)
+        inicio = time.perf_counter()
+        for _ in range(args.veces):
+            pdf = renderizar(argumentos, calidad)
+        milisegundos = (time.perf_counter() - inicio) / args.veces * 1000
+        print(f"{nombre:<14}{milisegundos:>12.1f}{len(pdf) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+✅ Benchmark de cortes de línea del PDF: el algoritmo voraz anterior de
+cv/pdf.py contra cv/parrafos.py (óptimo con guionado).
+
+Para un lote de descripciones en español mide:
+
+- µs/párrafo:  costo de cortar cada párrafo dos veces, como draw_card (contar
+               líneas y dibujarlas); en frío = cachés vacías, en caliente = otro
+               render del mismo CV en un worker en marcha
+- stringWidth: llamadas a la medición de ReportLab
+- desparejo:   suma de (espacio sobrante / ancho)² sin contar la última línea
+               (lo que el ojo ve como borde irregular; menos es mejor)
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/cortes_linea.py --parrafos 500
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reportlab.pdfbase import pdfmetrics  # noqa: E402
+
+from cv import parrafos  # noqa: E402
+
+FUENTE, TAMANO, ANCHO = "Helvetica", 9, 443.0  # cuerpo de las tarjetas de dibujar_cv
+
+PALABRAS = (
+    "desarrollo mantenimiento de aplicaciones web con Django administración bases datos "
+    "PostgreSQL coordinación equipos multidisciplinarios capacitación usuarios finales en "
+    "procesos administrativos implementación sistemas información gestión proyectos "
+    "tecnológicos análisis requerimientos documentación técnica soporte infraestructura "
+    "servidores Linux automatización despliegues integración continua atención clientes "
+    "elaboración informes mensuales seguimiento indicadores calidad universidad nacional"
+).split()
+
+
+def textos(cantidad, semilla=7, palabras=(12, 30)):
+    azar = random.Random(semilla)
+    return [" ".join(azar.choice(PALABRAS) for _ in range(azar.randint(*palabras))) for _ in range(cantidad)]
+
+
+def voraz(texto, fuente, tamano, ancho_maximo):
+    """Copia del corte de cv/pdf.py antes de cv/parrafos.py."""
+    lineas = []
+    linea = ""
+    for w in texto.split():
+        prueba = (linea + " " + w).strip()
+        if pdfmetrics.stringWidth(prueba, fuente, tamano) <= ancho_maximo:
+            linea = prueba
+        else:
+            lineas.append(linea)
+            linea = w
+    if linea:
+        lineas.append(linea)
+    return lineas
+
+
+def desparejo(lineas):
+    return sum(
+        ((ANCHO - pdfmetrics.stringWidth(linea, FUENTE, TAMANO)) / ANCHO) ** 2
+        for linea in lineas[:-1]
+    )
+
+
+def contar_mediciones(cortar, lote):
+    original = pdfmetrics.stringWidth
+    llamadas = 0
+
+    def contando(*args, **kwargs):
+        nonlocal llamadas
+        llamadas += 1
+        return original(*args, **kwargs)
+
+    pdfmetrics.stringWidth = parrafos.stringWidth = contando
+    try:
+        for t in lote:
+            cortar(t, FUENTE, TAMANO, ANCHO)
+    finally:
+        pdfmetrics.stringWidth = parrafos.stringWidth = original
+    return llamadas
+
+
+def medir(nombre, cortar, lote, preparar=None):
+    """Cada párrafo se corta dos veces, como en draw_card (contar líneas y dibujar)."""
+    if preparar:
+        preparar()
+    llamadas = contar_mediciones(cortar, lote)
+
+    if preparar:
+        preparar()
+    inicio = time.perf_counter()
+    for t in lote:
+        cortar(t, FUENTE, TAMANO, ANCHO)
+        resultado = cortar(t, FUENTE, TAMANO, ANCHO)
+    segundos = time.perf_counter() - inicio
+
+    resultados = [cortar(t, FUENTE, TAMANO, ANCHO) for t in lote]
+    total = sum(desparejo(list(r)) for r in resultados)
+    lineas = sum(len(r) for r in resultados)
+    print(
+        f"{nombre:<24}{segundos / len(lote) * 1e6:>12.1f}{llamadas / len(lote):>14.1f}"
+        f"{total / len(lote):>12.4f}{lineas / len(lote):>9.2f}"
+    )
+    return resultado
+
+
+def vaciar_caches():
+    for funcion in (parrafos.cortar_lineas, parrafos.medidas, parrafos.silabas, parrafos.ancho):
+        funcion.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parrafos", type=int, default=500)
+    args = parser.parse_args()
+
+    parrafos.diccionario()  # la carga del diccionario va aparte (warmup)
+
+    lotes = {
+        # descripciones del modelo: CharField(max_length=100), casi siempre 1-2 líneas
+        "descripciones del CV": [t[:100].rsplit(" ", 1)[0] for t in textos(args.parrafos)],
+        "párrafos largos": textos(args.parrafos, palabras=(40, 120)),
+    }
+    for titulo, lote in lotes.items():
+        print(f"\n{titulo} ({len(lote)}, ancho {ANCHO:g} pt, {FUENTE} {TAMANO})")
+        print(f"{'':<24}{'µs/párrafo':>12}{'stringWidth':>14}{'desparejo':>12}{'líneas':>9}")
+        medir("voraz", voraz, lote)
+        medir("parrafos (frío)", parrafos.cortar_lineas, lote, preparar=vaciar_caches)
+        # Otro render del mismo CV (otras secciones, otro request): todo memorizado
+        medir("parrafos (caliente)", parrafos.cortar_lineas, lote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+✅ Benchmark de cv/estadisticas.py con N filas por sección en un perfil:
+
+- bucle python:  lo que se haría sin agregados (traer cada fila y sumar)
+- consulta:      calcular(), la consulta única con SUM/COUNT en la BD
+- hit caché:     obtener() con la versión de contenido sin cambios
+
+La columna "hit caché" debe quedar constante aunque crezca N.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/estadisticas.py --filas 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import django  # noqa: E402
+
+
+def cronometrar(funcion, veces):
+    inicio = time.perf_counter()
+    for _ in range(veces):
+        funcion()
+    return (time.perf_counter() - inicio) / veces
+
+
+def poblar(perfil, desde, hasta):
+    from django.db.models import QuerySet
+    from cv.models import CursosRealizados, ExperienciaLaboral, Reconocimientos, VentaGarage
+
+    # QuerySet base: sin reconstruir el snapshot en cada lote (cv/models.ContenidoQuerySet)
+    def insertar(modelo, crear):
+        QuerySet(modelo).bulk_create((crear(i) for i in range(desde, hasta)), batch_size=5000)
+
+    insertar(CursosRealizados, lambda i: CursosRealizados(
+        perfil=perfil, nombrecurso=f"Curso {i}", fechainicio=date(2020, 1, 1), fechafin=date(2020, 2, 1),
+        totalhoras=i % 80, descripcioncurso="x", entidadpatrocinadora="y",
+    ))
+    insertar(ExperienciaLaboral, lambda i: ExperienciaLaboral(
+        perfil=perfil, cargodesempenado=f"Cargo {i}", nombrempresa="ACME", lugarempresa="Quito",
+        emailempresa="a@b.c", fechainiciogestion=date(2000 + i % 20, 1, 1),
+        fechafingestion=None if i % 3 else date(2024, 1, 1), descripcionfunciones="x",
+    ))
+    insertar(Reconocimientos, lambda i: Reconocimientos(
+        perfil=perfil, tiporeconocimiento=("Académico", "Público", "Privado")[i % 3],
+        fechareconocimiento=date(2020, 1, 1), descripcionreconocimiento="x", entidadpatrocinadora="y",
+    ))
+    insertar(VentaGarage, lambda i: VentaGarage(
+        perfil=perfil, nombreproducto=f"Producto {i}", estadoproducto=("Bueno", "Regular")[i % 2],
+        descripcion="x", valordelbien=Decimal(i % 500),
+    ))
+
+
+def bucle_python(perfil):
+    """Referencia: sumar en Python recorriendo instancias."""
+    from cv.models import CursosRealizados, ExperienciaLaboral, Reconocimientos, VentaGarage
+
+    hoy = date.today()
+    horas = sum(c.totalhoras for c in CursosRealizados.objects.filter(perfil=perfil))
+    dias = sum(
+        ((e.fechafingestion or hoy) - e.fechainiciogestion).days
+        for e in ExperienciaLaboral.objects.filter(perfil=perfil)
+    )
+    tipos = {}
+    for r in Reconocimientos.objects.filter(perfil=perfil):
+        tipos[r.tiporeconocimiento] = tipos.get(r.tiporeconocimiento, 0) + 1
+    valor = sum(g.valordelbien for g in VentaGarage.objects.filter(perfil=perfil))
+    return horas, dias, tipos, valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--veces", type=int, default=2000, help="repeticiones del hit de caché")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CACHE_DIR"] = os.path.join(tmp, "cache")
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        from django.conf import settings
+        settings.DATABASES = {
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(tmp, "bench.sqlite3")}
+        }
+        django.setup()
+
+        from django.core.management import call_command
+        from django.db.models import QuerySet
+        from cv.estadisticas import calcular, obtener
+        from cv.models import CVSnapshot, DatosPersonales
+
+        call_command("migrate", verbosity=0)
+        QuerySet(DatosPersonales).bulk_create([DatosPersonales(
+            idperfil=1, descripcionperfil="Bench", apellidos="A", nombres="B", nacionalidad="EC",
+            lugarnacimiento="Quito", numerocedula="0102030405", sexo="H", estadocivil="Soltero",
+        )])
+        perfil = DatosPersonales.objects.get(pk=1)
+        # Solo hace falta la versión de contenido, no el documento completo
+        CVSnapshot.objects.create(perfil=perfil, documento=b"")
+
+        print(f"{'filas':>8}{'bucle python ms':>18}{'consulta ms':>14}{'hit caché µs':>15}")
+        hechas = 0
+        for filas in sorted(args.filas):
+            poblar(perfil, hechas, filas)
+            hechas = filas
+
+            bucle = cronometrar(lambda: bucle_python(perfil), 3)
+            consulta = cronometrar(lambda: calcular(1), 5)
+            CVSnapshot.objects.filter(pk=1).update(version=filas)  # versión nueva: entrada fría
+            obtener(1)
+            hit = cronometrar(lambda: obtener(1), args.veces)
+            print(f"{filas:>8}{bucle * 1e3:>18.1f}{consulta * 1e3:>14.2f}{hit * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+✅ Perfil de importación (-X importtime) del arranque de un worker.
+
+Compara lo que importa un worker que solo sirve la página HTML contra uno
+que además genera PDFs (ReportLab se carga perezosamente desde cv_pdf).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --top 30 --repeticiones 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+ESCENARIOS = {
+    "html": "import django; django.setup(); import config.urls, cv.views",
+    "pdf": "import django; django.setup(); import config.urls, cv.views, cv.pdf",
+}
+
+
+def medir(codigo):
+    """Devuelve [(modulo, self_us, acumulado_us, nivel)] de una ejecución en frío."""
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    env["PYTHONDONTWRITEBYTECODE"] = "0"
+
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        filas.append((nombre.strip(), int(propio), int(acumulado), nivel))
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    for escenario, codigo in ESCENARIOS.items():
+        totales = []
+        for _ in range(args.repeticiones):
+            filas = medir(codigo)
+            # El total es la suma de los acumulados de primer nivel
+            totales.append(sum(a for _, _, a, nivel in filas if nivel == 0) / 1000)
+
+        modulos = {nombre for nombre, *_ in filas}
+        print(f"\n== {escenario}: mediana {statistics.median(totales):.1f} ms "
+              f"({len(modulos)} módulos, reportlab={'sí' if 'reportlab' in modulos else 'no'})")
+
+        for nombre, propio, acumulado, _ in sorted(filas, key=lambda f: f[2], reverse=True)[:args.top]:
+            print(f"  {acumulado / 1000:8.1f} ms acum  {propio / 1000:7.1f} ms propio  {nombre}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+✅ Benchmark de concurrencia SQLite: lectores (workers de gunicorn) contra
+un escritor (el admin) sobre el mismo archivo.
+
+Escenarios:
+- defecto:      pragmas por defecto (journal DELETE, synchronous FULL)
+- rendimiento:  SQLITE_PRAGMAS_RENDIMIENTO de config/settings.py
+- replica:      rendimiento + lectores sobre una copia (lo que hace el router)
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/sqlite_concurrencia.py --lectores 8 --segundos 5
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import SQLITE_PRAGMAS_RENDIMIENTO  # noqa: E402
+
+FILAS = 20_000
+
+
+def conectar(ruta, pragmas):
+    conn = sqlite3.connect(ruta, timeout=5, isolation_level=None)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def preparar(ruta, pragmas):
+    conn = conectar(ruta, pragmas)
+    conn.execute(
+        "CREATE TABLE cursos (id INTEGER PRIMARY KEY, perfil INTEGER, nombre TEXT, "
+        "descripcion TEXT, horas INTEGER)"
+    )
+    conn.execute("CREATE INDEX cursos_perfil ON cursos(perfil)")
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO cursos (perfil, nombre, descripcion, horas) VALUES (?, ?, ?, ?)",
+        ((i % 50, f"Curso {i}", "x" * 80, i % 120) for i in range(FILAS)),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def lector(ruta, pragmas, fin, cola):
+    conn = conectar(ruta, pragmas)
+    lecturas = errores = 0
+    perfil = 0
+    while time.time() < fin:
+        try:
+            conn.execute(
+                "SELECT id, nombre, descripcion, horas FROM cursos WHERE perfil = ?", (perfil,)
+            ).fetchall()
+            lecturas += 1
+        except sqlite3.OperationalError:
+            errores += 1
+        perfil = (perfil + 1) % 50
+    cola.put(("lector", lecturas, errores))
+
+
+def escritor(ruta, pragmas, fin, cola):
+    conn = conectar(ruta, pragmas)
+    escrituras = errores = 0
+    while time.time() < fin:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE cursos SET horas = horas + 1 WHERE id = ?", (escrituras % FILAS + 1,))
+            conn.execute("COMMIT")
+            escrituras += 1
+        except sqlite3.OperationalError:
+            errores += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        time.sleep(0.002)
+    cola.put(("escritor", escrituras, errores))
+
+
+def escenario(nombre, pragmas, usar_replica, lectores, segundos):
+    with tempfile.TemporaryDirectory() as tmp:
+        primario = os.path.join(tmp, "primario.sqlite3")
+        preparar(primario, pragmas)
+
+        ruta_lectura = primario
+        if usar_replica:
+            ruta_lectura = os.path.join(tmp, "replica.sqlite3")
+            origen, destino = sqlite3.connect(primario), sqlite3.connect(ruta_lectura)
+            origen.backup(destino)
+            origen.close()
+            destino.close()
+
+        cola = mp.Queue()
+        fin = time.time() + segundos
+        procesos = [mp.Process(target=escritor, args=(primario, pragmas, fin, cola))]
+        procesos += [
+            mp.Process(target=lector, args=(ruta_lectura, pragmas, fin, cola))
+            for _ in range(lectores)
+        ]
+        for proc in procesos:
+            proc.start()
+        resultados = [cola.get() for _ in procesos]
+        for proc in procesos:
+            proc.join()
+
+    lecturas = sum(r[1] for r in resultados if r[0] == "lector")
+    errores_l = sum(r[2] for r in resultados if r[0] == "lector")
+    escrituras, errores_e = next((r[1], r[2]) for r in resultados if r[0] == "escritor")
+
+    print(f"{nombre:<12} lecturas/s={lecturas / segundos:9.0f}  escrituras/s={escrituras / segundos:7.0f}  "
+          f"errores lectura={errores_l}  errores escritura={errores_e}")
+    return lecturas / segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5)
+    args = parser.parse_args()
+
+    base = escenario("defecto", [], False, args.lectores, args.segundos)
+    rapido = escenario("rendimiento", SQLITE_PRAGMAS_RENDIMIENTO, False, args.lectores, args.segundos)
+    replica = escenario("replica", SQLITE_PRAGMAS_RENDIMIENTO, True, args.lectores, args.segundos)
+
+    print(f"\nganancia de lectura: rendimiento x{rapido / base:.2f}, replica x{replica / base:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Generated by 'django-admin startproject' using Django 6.0.1.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -54,10 +55,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # ✅ Presupuesto de consultas por vista y detector de N+1 (cv/consultas.py)
+    "cv.consultas.ConsultasMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # ✅ ?_perfil=cpu|memoria|frio para staff (cv/perfilado.py)
+    "cv.perfilado.PerfiladoMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -84,13 +89,48 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+# ✅ Perfil de rendimiento SQLite (opt-in con SQLITE_PERFORMANCE=1):
+# WAL deja leer mientras el admin escribe; synchronous=NORMAL es seguro con WAL.
+SQLITE_PRAGMAS_RENDIMIENTO = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",    # 64 MB (negativo = KiB)
+    "PRAGMA temp_store=MEMORY",
+]
+SQLITE_RENDIMIENTO = os.environ.get("SQLITE_PERFORMANCE", "0").lower() in ("1", "true", "yes")
+
+# ✅ Réplica de lectura para cv_view / cv_pdf (ver cv/routers.py).
+# Local: SQLITE_REPLICA=ruta/al/archivo.sqlite3 (se copia con `manage.py sync_replica`).
+# Producción: DATABASE_REPLICA_URL apuntando a la réplica de Postgres.
+SQLITE_REPLICA = os.environ.get("SQLITE_REPLICA")
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+
 if not DATABASE_URL:
+    opciones_sqlite = {}
+    if SQLITE_RENDIMIENTO:
+        opciones_sqlite = {
+            "init_command": ";".join(SQLITE_PRAGMAS_RENDIMIENTO),
+            # El escritor toma el lock al inicio: sin "database is locked" a mitad de transacción
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        }
+
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": opciones_sqlite,
         }
     }
+
+    if SQLITE_REPLICA:
+        DATABASES["replica"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": SQLITE_REPLICA,
+            "OPTIONS": opciones_sqlite,
+            "TEST": {"MIRROR": "default"},
+        }
 else:
     DATABASES = {
         "default": dj_database_url.parse(
@@ -100,6 +140,17 @@ else:
         )
     }
 
+    if DATABASE_REPLICA_URL:
+        DATABASES["replica"] = dj_database_url.parse(
+            DATABASE_REPLICA_URL,
+            conn_max_age=600,
+            ssl_require=True,
+        )
+        DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+if "replica" in DATABASES:
+    DATABASE_ROUTERS = ["cv.routers.ReplicaLecturaRouter"]
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -133,6 +184,94 @@ STORAGES = {
     },
 }
 
+# ✅ Caché compartida entre workers de gunicorn (los fragmentos del CV y
+# sus versiones deben verse igual en todos los procesos).
+# cv/cache_mmap.py: índice SQLite + segmentos mmap, LRU acotado y etiquetas por perfil
+CACHES = {
+    "default": {
+        "BACKEND": "cv.cache_mmap.CacheMmap",
+        "LOCATION": os.environ.get("CACHE_DIR", str(BASE_DIR / ".cache")),
+        "OPTIONS": {
+            "MAX_BYTES": int(os.environ.get("CACHE_MAX_MB", 256)) * 1024 * 1024,
+            "MAX_ENTRIES": 20000,
+        },
+    }
+}
+
+# Segundos que vive cada fragmento de sección en cv.html (la versión invalida antes)
+CV_CACHE_FRAGMENTOS = int(os.environ.get("CV_CACHE_FRAGMENTOS", 60 * 60 * 24))
+
+# Segundos que vive la página/PDF completos (con variantes br/gzip) en caché
+CV_CACHE_PAGINAS = int(os.environ.get("CV_CACHE_PAGINAS", 60 * 60 * 24))
+
+# ✅ Single-flight (cv/coalescencia.py): segundos máximos que un request espera
+# el render idéntico de otro antes de renderizar por su cuenta
+CV_SINGLE_FLIGHT_ESPERA = int(os.environ.get("CV_SINGLE_FLIGHT_ESPERA", 30))
+
+# ✅ Cola de trabajos en BD (cv/trabajos.py, `manage.py run_workers`)
+# Segundos tras los cuales un trabajo "en curso" sin terminar se considera abandonado
+CV_TRABAJOS_TIMEOUT = int(os.environ.get("CV_TRABAJOS_TIMEOUT", 600))
+# Días que se guardan los trabajos hechos o fallidos antes de borrarlos
+CV_TRABAJOS_RETENCION = int(os.environ.get("CV_TRABAJOS_RETENCION", 7))
+# Pre-renderizar página y PDF en segundo plano cuando cambia un perfil (requiere workers)
+CV_PRERENDER_EN_COLA = os.environ.get("CV_PRERENDER_EN_COLA", "0").lower() in ("1", "true", "yes")
+
+# ✅ Snapshot desnormalizado por perfil (cv/snapshots.py): por defecto se reconstruye
+# en línea al confirmar la transacción del cambio; con esto lo hace un worker (run_workers)
+CV_SNAPSHOT_EN_COLA = os.environ.get("CV_SNAPSHOT_EN_COLA", "0").lower() in ("1", "true", "yes")
+
+# ✅ PDF linealizado ("fast web view", cv/linealizado.py, requiere pikepdf): el visor
+# del navegador muestra la primera página con el primer trozo (Range/206). A cambio
+# el PDF se sirve sin br (los rangos van sobre los bytes sin comprimir): ~50% más bytes
+CV_PDF_LINEALIZADO = os.environ.get("CV_PDF_LINEALIZADO", "0").lower() in ("1", "true", "yes")
+
+# ✅ Anexo de certificados (sec=certificados, cv/certificados.py): certificados
+# abiertos que se mantienen por hash de contenido, y tope (MB) de certificados anexados
+CV_CERTIFICADOS_ABIERTOS = int(os.environ.get("CV_CERTIFICADOS_ABIERTOS", "64"))
+CV_ANEXO_MAX_MB = int(os.environ.get("CV_ANEXO_MAX_MB", "20"))
+# Copias locales de los certificados cuando el almacenamiento es remoto (Cloudinary)
+CV_CERTIFICADOS_LOCALES = os.environ.get(
+    "CV_CERTIFICADOS_LOCALES", os.path.join(tempfile.gettempdir(), "cv-certificados"),
+)
+
+# ✅ Subidas por contenido (cv/blobs.py): gc_blobs no borra blobs sin referencias
+# que se subieron o reutilizaron hace menos de esto (segundos)
+CV_BLOBS_GRACIA = int(os.environ.get("CV_BLOBS_GRACIA", str(24 * 3600)))
+
+# ✅ Perfilados guardados (cv/perfilado.py): se conservan los últimos N
+CV_PERFILADOS_MAXIMO = int(os.environ.get("CV_PERFILADOS_MAXIMO", "50"))
+
+# ✅ Consultas SQL por request (cv/consultas.py): la misma consulta (salvo
+# parámetros) N veces es un N+1; los changelists del admin tienen este presupuesto.
+# Estricto: el exceso lanza ConsultasExcedidas en vez de ir al log (se activa en los tests)
+CV_CONSULTAS_REPETIDAS = int(os.environ.get("CV_CONSULTAS_REPETIDAS", "5"))
+CV_PRESUPUESTO_ADMIN = int(os.environ.get("CV_PRESUPUESTO_ADMIN", "15"))
+CV_CONSULTAS_ESTRICTO = os.environ.get("CV_CONSULTAS_ESTRICTO", "0") == "1"
+
+# ✅ Control de admisión del render de PDF (cv/admision.py): renders a la vez por
+# proceso y por host, cuántos esperan turno y cuánto; el resto recibe 503 con
+# Retry-After (segundos). Los aciertos de caché no pasan por aquí
+CV_PDF_RENDERS_PROCESO = int(os.environ.get("CV_PDF_RENDERS_PROCESO", "2"))
+CV_PDF_RENDERS_HOST = int(os.environ.get("CV_PDF_RENDERS_HOST", str(os.cpu_count() or 1)))
+CV_PDF_COLA = int(os.environ.get("CV_PDF_COLA", "4"))
+CV_PDF_ESPERA = float(os.environ.get("CV_PDF_ESPERA", "10"))
+CV_PDF_REINTENTO = int(os.environ.get("CV_PDF_REINTENTO", "5"))
+CV_ADMISION_DIR = os.environ.get("CV_ADMISION_DIR", os.path.join(tempfile.gettempdir(), "cv-admision"))
+
+# ✅ Calidad por defecto del PDF (cv/calidad_pdf.py): rapido | equilibrado | minimo
+# (cada request puede pedir otra con ?calidad=)
+CV_PDF_CALIDAD = os.environ.get("CV_PDF_CALIDAD", "equilibrado")
+
+# ✅ Parte del ETag de página/PDF: un deploy nuevo (plantillas, PDF) invalida los 304
+CV_VERSION_DESPLIEGUE = (
+    os.environ.get("CV_VERSION_DESPLIEGUE") or os.environ.get("RENDER_GIT_COMMIT", "")[:12] or "dev"
+)
+
+# ✅ Calentamiento en frío: precargar plantillas/BD (y ReportLab si CV_WARMUP_PDF)
+# al iniciar cada worker. Los workers que no generan PDF no importan ReportLab.
+CV_WARMUP_AL_INICIAR = os.environ.get("CV_WARMUP", "0").lower() in ("1", "true", "yes")
+CV_WARMUP_PDF = os.environ.get("CV_WARMUP_PDF", "0").lower() in ("1", "true", "yes")
+
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -1,8 +1,14 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
 from .models import (
     DatosPersonales, ExperienciaLaboral, Reconocimientos, CursosRealizados,
-    ProductosAcademicos, ProductosLaborales, VentaGarage
+    ProductosAcademicos, ProductosLaborales, VentaGarage, Trabajo, CVSnapshot, Blob, Perfilado
 )
+from .perfilado import resumen
 
 admin.site.register(DatosPersonales)
 admin.site.register(ExperienciaLaboral)
@@ -11,3 +17,90 @@ admin.site.register(CursosRealizados)
 admin.site.register(ProductosAcademicos)
 admin.site.register(ProductosLaborales)
 admin.site.register(VentaGarage)
+
+
+@admin.register(Trabajo)
+class TrabajoAdmin(admin.ModelAdmin):
+    list_display = ("idtrabajo", "tipo", "estado", "prioridad", "intentos", "progreso", "ejecutar_despues", "actualizado")
+    list_filter = ("estado", "tipo")
+    search_fields = ("clave",)
+    readonly_fields = ("resultado", "error", "bloqueado_por", "bloqueado_en", "creado", "actualizado")
+
+
+@admin.register(CVSnapshot)
+class CVSnapshotAdmin(admin.ModelAdmin):
+    # Solo lectura: lo mantienen las señales (cv/snapshots.py)
+    list_display = ("perfil_id", "version", "actualizado")
+    readonly_fields = ("perfil", "version", "actualizado")
+    exclude = ("documento",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    # Solo lectura: lo mantienen las subidas y gc_blobs (cv/blobs.py)
+    list_display = ("nombre", "tamano", "referencias", "ultimo_uso")
+    list_filter = ("referencias",)
+    search_fields = ("hash", "nombre")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Perfilado)
+class PerfiladoAdmin(admin.ModelAdmin):
+    # Los crea cv/perfilado.py; aquí solo se leen y se descargan
+    list_display = ("idperfilado", "creado", "metodo", "ruta", "estado", "duracion_ms", "memoria_pico_kb", "usuario")
+    list_filter = ("metodo", "estado")
+    search_fields = ("ruta", "secciones")
+    fields = (
+        "creado", "metodo", "ruta", "estado", "usuario", "secciones", "version_contenido",
+        "duracion_ms", "memoria_pico_kb", "descargas", "funciones", "memoria",
+    )
+    readonly_fields = fields
+
+    def get_urls(self):
+        return [
+            path("<int:pk>/descargar/<str:formato>/", self.admin_site.admin_view(self.descargar),
+                 name="cv_perfilado_descargar"),
+        ] + super().get_urls()
+
+    def descargar(self, request, pk, formato):
+        perfilado = get_object_or_404(Perfilado, pk=pk)
+        if formato == "pstats":
+            contenido, tipo = bytes(perfilado.pstats), "application/octet-stream"
+        elif formato == "folded":
+            contenido, tipo = perfilado.colapsado, "text/plain; charset=utf-8"
+        else:
+            return HttpResponse(status=404)
+        response = HttpResponse(contenido, content_type=tipo)
+        response["Content-Disposition"] = f'attachment; filename="perfilado-{pk}.{formato}"'
+        return response
+
+    @admin.display(description="Descargas")
+    def descargas(self, obj):
+        def enlace(formato):
+            return reverse("admin:cv_perfilado_descargar", args=[obj.pk, formato])
+
+        return format_html(
+            '<a href="{}">.pstats</a> (snakeviz) · <a href="{}">.folded</a> (flamegraph / speedscope)',
+            enlace("pstats"), enlace("folded"),
+        )
+
+    @admin.display(description="Funciones (tiempo acumulado)")
+    def funciones(self, obj):
+        return format_html("<pre style=\"font-size: 11px\">{}</pre>", resumen(bytes(obj.pstats)))
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
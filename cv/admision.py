@@ -0,0 +1,140 @@
+"""
+✅ Control de admisión del render de PDF (ReportLab es CPU puro).
+
+En un pico de tráfico todos los hilos de gunicorn terminaban dentro de
+``cv_pdf`` maquetando PDFs y la página (barata) esperaba detrás de ellos. Ahora
+un render necesita un turno:
+
+- por proceso: como mucho ``CV_PDF_RENDERS_PROCESO`` a la vez y
+  ``CV_PDF_COLA`` esperando (el resto ni espera);
+- por host: ``CV_PDF_RENDERS_HOST`` ranuras, cada una un ``flock`` sobre un
+  archivo de ``CV_ADMISION_DIR`` (el sistema lo suelta si el proceso muere).
+
+Quien no consigue turno en ``CV_PDF_ESPERA`` segundos (o encuentra la cola
+llena) recibe 503 con ``Retry-After``: una página corta que se recarga sola,
+así la ventana que abrió cv.html no queda en blanco. Los aciertos de caché y
+los 304 no llegan hasta aquí (``con_admision`` va debajo de
+``con_variantes_comprimidas``), y los hilos libres siguen sirviendo la página.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: solo el límite por proceso
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_condicion = threading.Condition()
+_en_curso = 0
+_en_cola = 0
+
+PAGINA_OCUPADO = (
+    '<!doctype html><meta charset="utf-8"><meta http-equiv="refresh" content="{segundos}">'
+    '<p style="font-family:sans-serif">Hay muchos PDFs generándose en este momento. '
+    "Se reintenta en {segundos} s…</p>"
+)
+
+
+class Saturado(Exception):
+    """No hubo turno de render: la cola estaba llena o se agotó la espera."""
+
+
+def estado():
+    """(renders en curso, en cola) de este proceso."""
+    with _condicion:
+        return _en_curso, _en_cola
+
+
+@contextmanager
+def _ranura_host(limite):
+    total = settings.CV_PDF_RENDERS_HOST
+    if fcntl is None or not total:
+        yield
+        return
+
+    carpeta = Path(settings.CV_ADMISION_DIR)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    desde = random.randrange(total)  # repartir: no todos prueban primero la 0
+    pausa = 0.01
+    while True:
+        for n in range(total):
+            archivo = open(carpeta / f"pdf-{(desde + n) % total}.lock", "ab")
+            try:
+                fcntl.flock(archivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                archivo.close()
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(archivo, fcntl.LOCK_UN)
+                archivo.close()
+            return
+
+        if time.monotonic() >= limite:
+            raise Saturado("sin ranuras libres en el host")
+        time.sleep(pausa)
+        pausa = min(pausa * 2, 0.1)
+
+
+@contextmanager
+def turno_pdf():
+    """✅ Turno de render (proceso y host); lanza ``Saturado`` si no lo hay a tiempo."""
+    global _en_curso, _en_cola
+
+    limite = time.monotonic() + settings.CV_PDF_ESPERA
+    maximo = settings.CV_PDF_RENDERS_PROCESO
+    with _condicion:
+        if _en_curso >= maximo and _en_cola >= settings.CV_PDF_COLA:
+            raise Saturado("cola llena")
+        _en_cola += 1
+        try:
+            while _en_curso >= maximo:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise Saturado("espera agotada")
+                _condicion.wait(restante)
+        finally:
+            _en_cola -= 1
+        _en_curso += 1
+
+    try:
+        with _ranura_host(limite):
+            yield
+    finally:
+        with _condicion:
+            _en_curso -= 1
+            _condicion.notify()
+
+
+def respuesta_ocupado():
+    segundos = settings.CV_PDF_REINTENTO
+    response = HttpResponse(PAGINA_OCUPADO.format(segundos=segundos), status=503)
+    response["Retry-After"] = str(segundos)
+    add_never_cache_headers(response)
+    return response
+
+
+def con_admision(vista):
+    """✅ Decorador de vista: el cuerpo de la vista (el render) corre con turno o responde 503."""
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        try:
+            with turno_pdf():
+                return vista(request, *args, **kwargs)
+        except Saturado as motivo:
+            en_curso, en_cola = estado()
+            logger.warning("render de PDF rechazado (%s): %s en curso, %s en cola", motivo, en_curso, en_cola)
+            return respuesta_ocupado()
+    return envoltura
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CvConfig(AppConfig):
     name = 'cv'
+
+    def ready(self):
+        from . import signals
+        signals.conectar()
+
+        # ✅ Calentamiento opcional del worker (ver cv/arranque.py)
+        if settings.CV_WARMUP_AL_INICIAR:
+            from . import arranque
+            arranque.calentar(arranque.pasos_al_iniciar())
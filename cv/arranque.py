@@ -0,0 +1,80 @@
+"""
+✅ Calentamiento en frío (cold start).
+
+El primer request después de levantar un worker pagaba: compilar cv.html,
+importar ReportLab, cargar las métricas de Helvetica y abrir la conexión a
+la BD. Aquí está todo eso en pasos independientes, usados por
+``python manage.py warmup`` y (opcional) por ``CvConfig.ready()``.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+PLANTILLAS = ("cv/cv.html", "cv/garage_items.html")
+
+FUENTES = ("Helvetica", "Helvetica-Bold")
+
+
+def precargar_plantillas():
+    # Con el loader cacheado de Django, la plantilla compilada queda en memoria
+    for nombre in PLANTILLAS:
+        get_template(nombre)
+
+
+def precargar_fuentes():
+    from reportlab.pdfbase import pdfmetrics
+    from . import pdf  # noqa: F401  (importa ReportLab y el módulo de dibujo)
+    from .parrafos import diccionario
+
+    for fuente in FUENTES:
+        pdfmetrics.getFont(fuente)
+        pdfmetrics.stringWidth("Hoja de vida", fuente, 10)
+
+    # Patrones de guionado de Pyphen (cortes de línea del PDF)
+    diccionario()
+
+
+def precargar_bd():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+PASOS = {
+    "plantillas": precargar_plantillas,
+    "fuentes": precargar_fuentes,
+    "bd": precargar_bd,
+}
+
+
+def calentar(pasos=None):
+    """
+    ✅ Ejecuta los pasos pedidos y devuelve {paso: milisegundos | "error"}.
+    Un paso fallido nunca debe impedir que el worker arranque.
+    """
+    tiempos = {}
+    for nombre in pasos or PASOS:
+        inicio = time.perf_counter()
+        try:
+            PASOS[nombre]()
+            tiempos[nombre] = round((time.perf_counter() - inicio) * 1000, 1)
+        except Exception:
+            logger.warning("warmup: falló el paso %s", nombre, exc_info=True)
+            tiempos[nombre] = "error"
+    return tiempos
+
+
+def pasos_al_iniciar():
+    """
+    Pasos que corre ``ready()`` cuando ``CV_WARMUP_AL_INICIAR`` está activo.
+    Sin consultas (Django desaconseja usar la BD durante la inicialización);
+    la conexión sí se abre, así que no combinar con ``gunicorn --preload``.
+    """
+    pasos = ["plantillas", "bd"]
+    if settings.CV_WARMUP_PDF:
+        pasos.append("fuentes")
+    return pasos
@@ -0,0 +1,184 @@
+"""
+✅ Subidas guardadas por contenido (certificados).
+
+``AlmacenamientoPorContenido`` envuelve al almacenamiento por defecto
+(Cloudinary en producción): al subir, calcula el sha256 leyendo el archivo por
+trozos y lo guarda como ``blobs/<2>/<sha256>.<ext>``. Si ese contenido ya
+estaba (el mismo certificado en varias filas o perfiles) no se sube de nuevo:
+la fila apunta al blob existente.
+
+Cada blob tiene su fila ``Blob`` con el conteo de filas que lo usan. Las
+señales lo recalculan para los archivos de la fila guardada o borrada; como
+``update()`` no dispara señales, ``python manage.py gc_blobs`` recuenta todo
+antes de borrar los blobs sin referencias (pasado ``CV_BLOBS_GRACIA``, para no
+borrar una subida cuya fila todavía no se guardó).
+
+El hash en el nombre es además una clave de contenido estable para las
+cachés (p. ej. cv/miniaturas.py no necesita leer el archivo).
+"""
+import hashlib
+import re
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage, default_storage
+from django.db.models import Count, FileField
+from django.utils import timezone
+
+CARPETA = "blobs/"
+
+_NOMBRE_BLOB = re.compile(rf"^{CARPETA}[0-9a-f]{{2}}/([0-9a-f]{{64}})(\.\w+)?$")
+
+
+def nombre_blob(contenido, original):
+    extension = Path(original or "").suffix.lower()
+    return f"{CARPETA}{contenido[:2]}/{contenido}{extension if len(extension) <= 10 else ''}"
+
+
+def hash_de_nombre(nombre):
+    """sha256 del contenido si ``nombre`` es un blob (sin leer el archivo), o None."""
+    coincidencia = _NOMBRE_BLOB.match(nombre or "")
+    return coincidencia.group(1) if coincidencia else None
+
+
+class AlmacenamientoPorContenido(Storage):
+    """Storage de Django: nombres por contenido sobre el almacenamiento por defecto."""
+
+    base = default_storage
+
+    def save(self, name, content, max_length=None):
+        from .models import Blob
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        tamano = 0
+        for bloque in content.chunks():
+            digest.update(bloque)
+            tamano += len(bloque)
+        contenido = digest.hexdigest()
+
+        existente = Blob.objects.filter(hash=contenido).first()
+        if existente is not None:
+            # Ya subido: sin tocar el almacenamiento remoto
+            Blob.objects.filter(hash=contenido).update(ultimo_uso=timezone.now())
+            return existente.nombre
+
+        content.seek(0)
+        guardado = self.base.save(nombre_blob(contenido, name), content, max_length=max_length)
+        blob, creado = Blob.objects.get_or_create(
+            hash=contenido, defaults={"nombre": guardado, "tamano": tamano},
+        )
+        if not creado and blob.nombre != guardado:
+            self.base.delete(guardado)  # otra subida igual ganó la carrera
+        return blob.nombre
+
+    def delete(self, name):
+        # Otras filas pueden usar el mismo blob: solo lo borra recolectar()
+        pass
+
+    def _open(self, name, mode="rb"):
+        return self.base.open(name, mode)
+
+    def exists(self, name):
+        return self.base.exists(name)
+
+    def url(self, name):
+        return self.base.url(name)
+
+    def size(self, name):
+        return self.base.size(name)
+
+    def path(self, name):
+        return self.base.path(name)
+
+    def listdir(self, path):
+        return self.base.listdir(path)
+
+    def get_modified_time(self, name):
+        return self.base.get_modified_time(name)
+
+
+_almacenamiento = AlmacenamientoPorContenido()
+
+
+def almacenamiento_por_contenido():
+    """``storage=`` de los FileField (callable: la migración guarda solo la referencia)."""
+    return _almacenamiento
+
+
+# ===============================
+# ✅ REFERENCIAS Y RECOLECCIÓN
+# ===============================
+
+def campos():
+    """[(modelo, nombre del campo)] de los FileField guardados por contenido."""
+    return [
+        (modelo, campo.name)
+        for modelo in apps.get_app_config("cv").get_models()
+        for campo in modelo._meta.get_fields()
+        if isinstance(campo, FileField) and isinstance(campo.storage, AlmacenamientoPorContenido)
+    ]
+
+
+def nombres_en(instancia):
+    """Blobs que usa la fila."""
+    nombres = (getattr(instancia, c).name for m, c in campos() if isinstance(instancia, m))
+    return {n for n in nombres if hash_de_nombre(n)}
+
+
+def referencias(nombres=None):
+    """✅ Counter {nombre: filas que lo usan}, de ``nombres`` o de todos."""
+    conteo = Counter()
+    for modelo, campo in campos():
+        filas = modelo._base_manager.filter(**{f"{campo}__startswith": CARPETA})
+        if nombres is not None:
+            filas = filas.filter(**{f"{campo}__in": nombres})
+        conteo.update(dict(filas.order_by().values(campo).annotate(n=Count("pk")).values_list(campo, "n")))
+    return conteo
+
+
+def recontar(nombres=None):
+    """✅ Recalcula ``Blob.referencias`` (de ``nombres`` o de todos los blobs)."""
+    from .models import Blob
+
+    conteo = referencias(nombres)
+    blobs = Blob.objects.all() if nombres is None else Blob.objects.filter(nombre__in=nombres)
+    cambiados = []
+    for blob in blobs.only("hash", "nombre", "referencias"):
+        if blob.referencias != conteo[blob.nombre]:
+            blob.referencias = conteo[blob.nombre]
+            cambiados.append(blob)
+    Blob.objects.bulk_update(cambiados, ["referencias"], batch_size=500)
+    return len(cambiados)
+
+
+def recolectar(gracia=None, simular=False):
+    """
+    ✅ Recuenta y borra los blobs sin referencias que nadie subió en los últimos
+    ``gracia`` segundos. Devuelve (blobs, bytes) liberados.
+    """
+    from .models import Blob
+
+    recontar()
+    gracia = settings.CV_BLOBS_GRACIA if gracia is None else gracia
+    limite = timezone.now() - timedelta(seconds=gracia)
+
+    borrados = liberados = 0
+    for blob in Blob.objects.filter(referencias=0, ultimo_uso__lt=limite).order_by("hash"):
+        if not simular:
+            # Condicional: si justo lo reutilizó una subida, se queda
+            filas, _ = Blob.objects.filter(hash=blob.hash, referencias=0, ultimo_uso__lt=limite).delete()
+            if not filas:
+                continue
+            _almacenamiento.base.delete(blob.nombre)
+        borrados += 1
+        liberados += blob.tamano
+    return borrados, liberados
@@ -0,0 +1,236 @@
+"""
+✅ Búsqueda full-text sobre todas las secciones del CV.
+
+- SQLite (local): tabla virtual FTS5 ``indicebusqueda_fts`` con ranking bm25.
+- Postgres (producción): columna ``vector`` tsvector + índice GIN, ranking ts_rank_cd.
+
+La tabla ``indicebusqueda`` se mantiene al día con señales (cv/signals.py)
+y se puede reconstruir con ``python manage.py rebuild_search_index``.
+"""
+import math
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .cursores import codificar_cursor, decodificar_cursor
+from .models import (
+    ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage, IndiceBusqueda
+)
+
+
+def _unir(*partes):
+    return " ".join(str(p) for p in partes if p)
+
+
+# modelo -> (sección, título, contenido)
+SECCIONES_INDEXADAS = {
+    ExperienciaLaboral: (
+        "experiencia",
+        lambda e: f"{e.cargodesempenado} - {e.nombrempresa}",
+        lambda e: _unir(e.lugarempresa, e.descripcionfunciones),
+    ),
+    CursosRealizados: (
+        "cursos",
+        lambda c: c.nombrecurso,
+        lambda c: _unir(c.entidadpatrocinadora, c.descripcioncurso),
+    ),
+    Reconocimientos: (
+        "reconocimientos",
+        lambda r: f"{r.tiporeconocimiento}: {r.descripcionreconocimiento}",
+        lambda r: r.entidadpatrocinadora,
+    ),
+    ProductosAcademicos: (
+        "prod_academicos",
+        lambda p: p.nombrerecurso,
+        lambda p: _unir(p.clasificador, p.descripcion),
+    ),
+    ProductosLaborales: (
+        "prod_laborales",
+        lambda p: p.nombreproducto,
+        lambda p: p.descripcion,
+    ),
+    VentaGarage: (
+        "garage",
+        lambda g: g.nombreproducto,
+        lambda g: _unir(g.estadoproducto, g.descripcion),
+    ),
+}
+
+LIMITE_MAXIMO = 50
+
+
+def es_visible(obj):
+    """✅ Mismo criterio que cv_view: activo en front y (garage) no vendido."""
+    if not obj.activarparaqueseveaenfront:
+        return False
+    if isinstance(obj, VentaGarage) and obj.estadoproducto == "Vendido":
+        return False
+    return True
+
+
+def indexar_objeto(obj):
+    seccion, titulo, contenido = SECCIONES_INDEXADAS[type(obj)]
+
+    if not es_visible(obj):
+        eliminar_objeto(obj)
+        return
+
+    IndiceBusqueda.objects.update_or_create(
+        seccion=seccion,
+        idobjeto=obj.pk,
+        defaults={
+            "perfil_id": obj.perfil_id,
+            "titulo": titulo(obj)[:250],
+            "contenido": contenido(obj) or "",
+        },
+    )
+
+
+def eliminar_objeto(obj):
+    seccion = SECCIONES_INDEXADAS[type(obj)][0]
+    IndiceBusqueda.objects.filter(seccion=seccion, idobjeto=obj.pk).delete()
+
+
+@transaction.atomic
+def reconstruir_indice(lote=2000):
+    """✅ Vacía y vuelve a llenar el índice. Devuelve cuántas filas quedaron."""
+    IndiceBusqueda.objects.all().delete()
+
+    total = 0
+    for modelo, (seccion, titulo, contenido) in SECCIONES_INDEXADAS.items():
+        filas = []
+        for obj in modelo.objects.filter(activarparaqueseveaenfront=True).iterator(chunk_size=lote):
+            if not es_visible(obj):
+                continue
+            filas.append(IndiceBusqueda(
+                perfil_id=obj.perfil_id,
+                seccion=seccion,
+                idobjeto=obj.pk,
+                titulo=titulo(obj)[:250],
+                contenido=contenido(obj) or "",
+            ))
+            if len(filas) >= lote:
+                IndiceBusqueda.objects.bulk_create(filas)
+                total += len(filas)
+                filas = []
+        IndiceBusqueda.objects.bulk_create(filas)
+        total += len(filas)
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cur:
+            # Re-sincroniza la tabla FTS con el contenido y compacta sus segmentos
+            cur.execute("INSERT INTO indicebusqueda_fts(indicebusqueda_fts) VALUES('rebuild')")
+            cur.execute("INSERT INTO indicebusqueda_fts(indicebusqueda_fts) VALUES('optimize')")
+
+    return total
+
+
+# ===============================
+# ✅ CONSULTA RANKEADA + KEYSET
+# ===============================
+
+SQL_SQLITE = """
+    SELECT idindice, seccion, idobjeto, titulo, rango FROM (
+        SELECT i.idindice, i.seccion, i.idobjeto, i.titulo,
+               bm25(indicebusqueda_fts, 10.0, 1.0) AS rango
+        FROM indicebusqueda_fts
+        JOIN indicebusqueda i ON i.idindice = indicebusqueda_fts.rowid
+        WHERE indicebusqueda_fts MATCH %s AND i.idperfilconqueestaactivo = %s
+    ) AS r
+    {keyset}
+    ORDER BY rango, idindice
+    LIMIT %s
+"""
+
+SQL_POSTGRES = """
+    SELECT idindice, seccion, idobjeto, titulo, rango FROM (
+        SELECT i.idindice, i.seccion, i.idobjeto, i.titulo,
+               -ts_rank_cd(i.vector, q)::float8 AS rango
+        FROM indicebusqueda i, to_tsquery('spanish', %s) q
+        WHERE i.vector @@ q AND i.idperfilconqueestaactivo = %s
+    ) AS r
+    {keyset}
+    ORDER BY rango, idindice
+    LIMIT %s
+"""
+
+# ts_rank_cd devuelve real (float4): se pasa a float8 en la subconsulta para que
+# el valor del cursor sea exactamente el que se ordena y se compara (si no, los
+# empates se saltan o se repiten entre páginas)
+KEYSET = "WHERE rango > %s OR (rango = %s AND idindice > %s)"
+
+
+def _terminos(texto):
+    return re.findall(r"\w+", texto.lower())[:10]
+
+
+def _despues(cursor):
+    """(rango, idindice) del cursor, o None si falta o viene manipulado."""
+    valores = decodificar_cursor(cursor, 2)
+    if not valores:
+        return None
+    rango, idindice = valores
+    # bool es subclase de int: no cuenta como número
+    if type(rango) not in (int, float) or type(idindice) is not int:
+        return None
+    try:
+        rango = float(rango)
+    except OverflowError:
+        return None
+    if not math.isfinite(rango) or not -2 ** 63 <= idindice < 2 ** 63:
+        return None
+    return [rango, idindice]
+
+
+def _buscar_sin_fulltext(idperfil, terminos, despues, limite):
+    """Respaldo para motores sin FTS: solo útil en desarrollo."""
+    qs = IndiceBusqueda.objects.filter(perfil_id=idperfil)
+    for t in terminos:
+        qs = qs.filter(Q(titulo__icontains=t) | Q(contenido__icontains=t))
+    if despues:
+        qs = qs.filter(idindice__gt=despues[1])
+    filas = qs.order_by("idindice").values_list("idindice", "seccion", "idobjeto", "titulo")[:limite]
+    return [(*f, 0.0) for f in filas]
+
+
+def buscar(idperfil, texto, cursor=None, limite=20):
+    """
+    ✅ Devuelve (resultados, siguiente_cursor).
+    Orden: mejor ranking primero; desempate por idindice para un keyset estable.
+    """
+    terminos = _terminos(texto)
+    if not terminos:
+        return [], None
+
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+    despues = _despues(cursor)
+
+    vendor = connection.vendor
+    if vendor in ("sqlite", "postgresql"):
+        if vendor == "sqlite":
+            sql, consulta = SQL_SQLITE, " ".join(f'"{t}"*' for t in terminos)
+        else:
+            sql, consulta = SQL_POSTGRES, " & ".join(f"{t}:*" for t in terminos)
+
+        params = [consulta, idperfil]
+        if despues:
+            params += [despues[0], despues[0], despues[1]]
+        params.append(limite + 1)
+
+        with connection.cursor() as cur:
+            cur.execute(sql.format(keyset=KEYSET if despues else ""), params)
+            filas = cur.fetchall()
+    else:
+        filas = _buscar_sin_fulltext(idperfil, terminos, despues, limite + 1)
+
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    resultados = [
+        {"seccion": seccion, "id": idobjeto, "titulo": titulo, "rango": rango}
+        for (_, seccion, idobjeto, titulo, rango) in filas
+    ]
+    siguiente = codificar_cursor(filas[-1][4], filas[-1][0]) if hay_mas else None
+    return resultados, siguiente
@@ -0,0 +1,518 @@
+"""
+✅ Backend de caché compartido entre los workers del mismo host, pensado para
+los artefactos del CV (PDFs, HTML comprimido, fragmentos y versiones).
+
+- Índice en SQLite (WAL) dentro de ``LOCATION``: clave, vencimiento, último
+  acceso, tamaño y etiquetas. SQLite se encarga del bloqueo entre procesos.
+- Valores chicos (versiones, fragmentos): inline en el índice.
+- Valores grandes: un segmento por entrada en ``LOCATION/segmentos``, leído
+  con ``mmap``. Los ``bytes`` grandes viajan fuera de banda (pickle protocolo 5)
+  y se devuelven como ``memoryview`` sobre el mapa: sin read() ni copia al
+  deserializar. Los segmentos nunca se reescriben (nombre único por escritura),
+  así que una vista ya entregada sigue siendo válida aunque se expulse la entrada.
+- Expulsión LRU acotada por ``MAX_BYTES`` (y ``MAX_ENTRIES`` de Django); los
+  totales los llevan triggers, así una escritura no suma toda la tabla.
+- Etiquetas (``set_con_etiquetas`` / ``invalidar_etiqueta``) para borrar de una
+  vez todo lo de un perfil o una sección.
+- ``estadisticas()``: aciertos, fallos, escrituras, expulsiones, bytes.
+
+Configuración::
+
+    CACHES = {"default": {
+        "BACKEND": "cv.cache_mmap.CacheMmap",
+        "LOCATION": "/var/tmp/cv-cache",
+        "OPTIONS": {"MAX_BYTES": 256 * 1024 * 1024},
+    }}
+"""
+import mmap
+import os
+import pickle
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    clave    TEXT PRIMARY KEY,
+    expira   REAL,
+    accedido REAL NOT NULL,
+    tamano   INTEGER NOT NULL,
+    valor    BLOB,
+    archivo  TEXT
+);
+CREATE INDEX IF NOT EXISTS entradas_lru ON entradas (accedido);
+CREATE INDEX IF NOT EXISTS entradas_expira ON entradas (expira) WHERE expira IS NOT NULL;
+CREATE TABLE IF NOT EXISTS etiquetas (
+    etiqueta TEXT NOT NULL,
+    clave    TEXT NOT NULL,
+    PRIMARY KEY (etiqueta, clave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS etiquetas_clave ON etiquetas (clave);
+CREATE TABLE IF NOT EXISTS estadisticas (
+    nombre TEXT PRIMARY KEY,
+    valor  INTEGER NOT NULL
+);
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS totales (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    bytes    INTEGER NOT NULL,
+    cantidad INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entradas_alta AFTER INSERT ON entradas BEGIN
+    UPDATE totales SET bytes = bytes + NEW.tamano, cantidad = cantidad + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entradas_baja AFTER DELETE ON entradas BEGIN
+    UPDATE totales SET bytes = bytes - OLD.tamano, cantidad = cantidad - 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entradas_tamano AFTER UPDATE OF tamano ON entradas BEGIN
+    UPDATE totales SET bytes = bytes - OLD.tamano + NEW.tamano;
+END;
+INSERT OR IGNORE INTO totales (id, bytes, cantidad)
+    SELECT 1, COALESCE(SUM(tamano), 0), COUNT(*) FROM entradas
+    WHERE NOT EXISTS (SELECT 1 FROM totales);
+COMMIT;
+"""
+
+# Cabecera de un segmento: magia, nº de buffers fuera de banda, largo del pickle
+CABECERA = struct.Struct("<4sIQ")
+MAGIA = b"CVS1"
+
+# Lo que puede lanzar leer una entrada dañada: pickle truncado o de otra versión
+# del código, segmento corrupto, vacío o borrado a mano
+ERRORES_LECTURA = (
+    OSError, ValueError, EOFError, pickle.UnpicklingError, struct.error,
+    AttributeError, ImportError, IndexError, KeyError, TypeError,
+)
+
+# No se reescribe "accedido" en cada lectura (sería una escritura por request)
+REFRESCO_LRU = 1.0
+# Los contadores se acumulan en memoria y se vuelcan al índice cada tanto
+VOLCADO_ESTADISTICAS = 1.0
+
+
+def _fuera_de_banda(valor, umbral):
+    """Marca los bytes grandes (dentro de dict/list/tuple) para pickle fuera de banda."""
+    tipo = type(valor)
+    if tipo is bytes and len(valor) >= umbral:
+        return pickle.PickleBuffer(valor)
+    if tipo is dict:
+        return {k: _fuera_de_banda(v, umbral) for k, v in valor.items()}
+    if tipo is list:
+        return [_fuera_de_banda(v, umbral) for v in valor]
+    if tipo is tuple:
+        return tuple(_fuera_de_banda(v, umbral) for v in valor)
+    return valor
+
+
+class CacheMmap(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        opciones = params.get("OPTIONS", {})
+        self._dir = Path(location)
+        self._segmentos = self._dir / "segmentos"
+        self._max_bytes = int(opciones.get("MAX_BYTES", 256 * 1024 * 1024))
+        self._umbral = int(opciones.get("UMBRAL_SEGMENTO", 16 * 1024))
+
+        self._local = threading.local()
+        self._candado = threading.Lock()
+        self._contadores = Counter()
+        self._ultimo_volcado = time.monotonic()
+        self._pid = os.getpid()
+
+    # ===============================
+    # ✅ ÍNDICE (SQLite)
+    # ===============================
+
+    def _conexion(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        self._segmentos.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._dir / "indice.sqlite3", timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Es una caché: perder la última escritura ante un corte de luz no importa
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # INSERT OR REPLACE borra la fila previa: que eso también descuente en "totales"
+        conn.execute("PRAGMA recursive_triggers=ON")
+        conn.executescript(ESQUEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaccion(self):
+        conn = self._conexion()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ===============================
+    # ✅ SEGMENTOS (mmap)
+    # ===============================
+
+    def _escribir_segmento(self, datos, buffers):
+        vistas = [b.raw() for b in buffers]
+        nombre = uuid.uuid4().hex
+        ruta = self._segmentos / nombre
+        temporal = ruta.with_suffix(".tmp")
+
+        try:
+            f = open(temporal, "wb")
+        except FileNotFoundError:
+            # Primera escritura del proceso o alguien borró la carpeta de la caché
+            self._segmentos.mkdir(parents=True, exist_ok=True)
+            f = open(temporal, "wb")
+        with f:
+            f.write(CABECERA.pack(MAGIA, len(vistas), len(datos)))
+            f.write(struct.pack(f"<{len(vistas)}Q", *(v.nbytes for v in vistas)))
+            f.write(datos)
+            for vista in vistas:
+                f.write(vista)
+        os.replace(temporal, ruta)
+        return nombre, CABECERA.size + 8 * len(vistas) + len(datos) + sum(v.nbytes for v in vistas)
+
+    def _leer_segmento(self, nombre):
+        with open(self._segmentos / nombre, "rb") as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        vista = memoryview(mapa)
+        magia, n, largo = CABECERA.unpack_from(vista)
+        if magia != MAGIA:
+            raise ValueError(f"Segmento de caché inválido: {nombre}")
+
+        pos = CABECERA.size
+        largos = struct.unpack_from(f"<{n}Q", vista, pos)
+        pos += 8 * n
+        datos = vista[pos:pos + largo]
+        pos += largo
+
+        buffers = []
+        for tam in largos:
+            buffers.append(vista[pos:pos + tam])
+            pos += tam
+        return pickle.loads(datos, buffers=buffers)
+
+    def _descartar(self, clave, valor, archivo):
+        """Borra una entrada ilegible, salvo que otro proceso ya la haya reescrito."""
+        try:
+            with self._transaccion() as conn:
+                if archivo is None:
+                    cursor = conn.execute(
+                        "DELETE FROM entradas WHERE clave = ? AND archivo IS NULL AND valor = ?", (clave, valor)
+                    )
+                else:
+                    cursor = conn.execute("DELETE FROM entradas WHERE clave = ? AND archivo = ?", (clave, archivo))
+                if cursor.rowcount:
+                    conn.execute("DELETE FROM etiquetas WHERE clave = ?", (clave,))
+        except sqlite3.OperationalError:
+            # Índice ocupado: se descartará en la próxima lectura
+            return
+        self._borrar_segmentos([archivo])
+
+    def _borrar_segmentos(self, nombres):
+        for nombre in nombres:
+            if nombre:
+                try:
+                    os.unlink(self._segmentos / nombre)
+                except OSError:
+                    pass
+
+    def _serializar(self, valor):
+        """(valor_inline, archivo, tamano): inline si es chico y no tiene bytes grandes."""
+        buffers = []
+        datos = pickle.dumps(_fuera_de_banda(valor, self._umbral), protocol=5, buffer_callback=buffers.append)
+        if not buffers and len(datos) < self._umbral:
+            return datos, None, len(datos)
+        archivo, tamano = self._escribir_segmento(datos, buffers)
+        return None, archivo, tamano
+
+    def _cargar(self, valor, archivo):
+        if archivo is None:
+            return pickle.loads(valor)
+        return self._leer_segmento(archivo)
+
+    # ===============================
+    # ✅ API DE DJANGO
+    # ===============================
+
+    def get(self, key, default=None, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        conn = self._conexion()
+        fila = conn.execute(
+            "SELECT expira, accedido, valor, archivo FROM entradas WHERE clave = ?", (clave,)
+        ).fetchone()
+
+        ahora = time.time()
+        if fila is None or (fila[0] is not None and fila[0] <= ahora):
+            self._contar("fallos")
+            return default
+
+        try:
+            valor = self._cargar(fila[2], fila[3])
+        except ERRORES_LECTURA:
+            # Segmento expulsado entre el SELECT y el open(), o entrada dañada: fallo
+            self._descartar(clave, fila[2], fila[3])
+            self._contar("fallos")
+            return default
+
+        if ahora - fila[1] > REFRESCO_LRU:
+            try:
+                conn.execute("UPDATE entradas SET accedido = ? WHERE clave = ?", (ahora, clave))
+            except sqlite3.OperationalError:
+                # Índice ocupado por otra escritura: una lectura no falla por el LRU
+                pass
+        self._contar("aciertos")
+        return valor
+
+    def get_many(self, keys, version=None):
+        claves = {self.make_and_validate_key(k, version=version): k for k in keys}
+        if not claves:
+            return {}
+
+        conn = self._conexion()
+        marcas = ",".join("?" * len(claves))
+        filas = conn.execute(
+            f"SELECT clave, expira, valor, archivo FROM entradas WHERE clave IN ({marcas})", list(claves)
+        ).fetchall()
+
+        ahora = time.time()
+        encontrados = {}
+        for clave, expira, valor, archivo in filas:
+            if expira is not None and expira <= ahora:
+                continue
+            try:
+                encontrados[claves[clave]] = self._cargar(valor, archivo)
+            except ERRORES_LECTURA:
+                self._descartar(clave, valor, archivo)
+        self._contar("aciertos", len(encontrados))
+        self._contar("fallos", len(claves) - len(encontrados))
+        return encontrados
+
+    def has_key(self, key, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        fila = self._conexion().execute("SELECT expira FROM entradas WHERE clave = ?", (clave,)).fetchone()
+        return fila is not None and (fila[0] is None or fila[0] > time.time())
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._guardar(key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._guardar(key, value, timeout, version, solo_si_falta=True)
+
+    def set_con_etiquetas(self, key, value, etiquetas, timeout=DEFAULT_TIMEOUT, version=None):
+        """✅ Como ``set``, y además asocia la entrada a ``etiquetas`` (ver invalidar_etiqueta)."""
+        self._guardar(key, value, timeout, version, etiquetas=etiquetas)
+
+    def _guardar(self, key, value, timeout, version, etiquetas=(), solo_si_falta=False):
+        clave = self.make_and_validate_key(key, version=version)
+        expira = self.get_backend_timeout(timeout)
+        if expira is not None and expira <= time.time():
+            # timeout <= 0: Django lo trata como "borrar"
+            self.delete(key, version=version)
+            return False
+
+        valor, archivo, tamano = self._serializar(value)
+        huerfanos = []
+        guardado = False
+        try:
+            with self._transaccion() as conn:
+                ahora = time.time()
+                previo = conn.execute(
+                    "SELECT expira, archivo FROM entradas WHERE clave = ?", (clave,)
+                ).fetchone()
+                if previo is not None:
+                    if solo_si_falta and (previo[0] is None or previo[0] > ahora):
+                        return False
+                    huerfanos.append(previo[1])
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO entradas (clave, expira, accedido, tamano, valor, archivo) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (clave, expira, ahora, tamano, valor, archivo),
+                )
+                conn.execute("DELETE FROM etiquetas WHERE clave = ?", (clave,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO etiquetas (etiqueta, clave) VALUES (?, ?)",
+                    [(etiqueta, clave) for etiqueta in etiquetas],
+                )
+                huerfanos += self._recortar(conn, ahora)
+                guardado = True
+        finally:
+            if not guardado:
+                huerfanos = [archivo]
+            self._borrar_segmentos(huerfanos)
+
+        self._contar("escrituras")
+        return True
+
+    def _recortar(self, conn, ahora):
+        """Borra vencidas y, si se pasó de MAX_BYTES/MAX_ENTRIES, las menos usadas."""
+        archivos = [
+            fila[0] for fila in conn.execute(
+                "DELETE FROM entradas WHERE expira IS NOT NULL AND expira <= ? RETURNING archivo", (ahora,)
+            )
+        ]
+
+        # Totales que mantienen los triggers: sin recorrer la tabla en cada escritura
+        total, cantidad = conn.execute("SELECT bytes, cantidad FROM totales").fetchone()
+        if total <= self._max_bytes and cantidad <= self._max_entries:
+            return archivos
+
+        # Se libera hasta el 90% para no recortar en cada escritura
+        objetivo_bytes = self._max_bytes * 0.9
+        objetivo_cantidad = self._max_entries * 0.9
+        expulsadas = []
+        cursor = conn.execute("SELECT clave, tamano, archivo FROM entradas ORDER BY accedido")
+        for clave, tamano, archivo in cursor:
+            if total <= objetivo_bytes and cantidad <= objetivo_cantidad:
+                break
+            expulsadas.append(clave)
+            archivos.append(archivo)
+            total -= tamano
+            cantidad -= 1
+        cursor.close()
+
+        conn.executemany("DELETE FROM entradas WHERE clave = ?", [(c,) for c in expulsadas])
+        conn.execute("DELETE FROM etiquetas WHERE clave NOT IN (SELECT clave FROM entradas)")
+        self._contar("expulsiones", len(expulsadas))
+        return archivos
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        conn = self._conexion()
+        cursor = conn.execute(
+            "UPDATE entradas SET expira = ? WHERE clave = ? AND (expira IS NULL OR expira > ?)",
+            (self.get_backend_timeout(timeout), clave, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        """Atómico entre procesos (BEGIN IMMEDIATE): lo usan las versiones de sección."""
+        clave = self.make_and_validate_key(key, version=version)
+        with self._transaccion() as conn:
+            fila = conn.execute(
+                "SELECT expira, valor, archivo FROM entradas WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None or (fila[0] is not None and fila[0] <= time.time()):
+                raise ValueError("Key '%s' not found" % key)
+
+            nuevo = self._cargar(fila[1], fila[2]) + delta
+            datos = pickle.dumps(nuevo, protocol=5)
+            conn.execute(
+                "UPDATE entradas SET valor = ?, archivo = NULL, tamano = ? WHERE clave = ?",
+                (datos, len(datos), clave),
+            )
+        self._borrar_segmentos([fila[2]])
+        return nuevo
+
+    def delete(self, key, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        return self._borrar_claves([clave]) > 0
+
+    def delete_many(self, keys, version=None):
+        self._borrar_claves([self.make_and_validate_key(k, version=version) for k in keys])
+
+    def _borrar_claves(self, claves):
+        if not claves:
+            return 0
+        marcas = ",".join("?" * len(claves))
+        with self._transaccion() as conn:
+            archivos = [
+                fila[0] for fila in conn.execute(
+                    f"DELETE FROM entradas WHERE clave IN ({marcas}) RETURNING archivo", claves
+                )
+            ]
+            conn.execute(f"DELETE FROM etiquetas WHERE clave IN ({marcas})", claves)
+        self._borrar_segmentos(archivos)
+        return len(archivos)
+
+    def clear(self):
+        with self._transaccion() as conn:
+            conn.execute("DELETE FROM entradas")
+            conn.execute("DELETE FROM etiquetas")
+            # Con el candado de escritura tomado nadie crea segmentos nuevos en el índice
+            shutil.rmtree(self._segmentos, ignore_errors=True)
+            self._segmentos.mkdir(parents=True, exist_ok=True)
+
+    # ===============================
+    # ✅ ETIQUETAS Y ESTADÍSTICAS
+    # ===============================
+
+    def invalidar_etiqueta(self, *etiquetas):
+        """✅ Borra todas las entradas con alguna de las etiquetas. Devuelve cuántas."""
+        if not etiquetas:
+            return 0
+        marcas = ",".join("?" * len(etiquetas))
+        claves = [
+            fila[0] for fila in self._conexion().execute(
+                f"SELECT DISTINCT clave FROM etiquetas WHERE etiqueta IN ({marcas})", etiquetas
+            )
+        ]
+        borradas = self._borrar_claves(claves)
+        self._contar("invalidadas", borradas)
+        return borradas
+
+    def _contar(self, nombre, n=1):
+        if not n:
+            return
+        with self._candado:
+            if self._pid != os.getpid():
+                # Proceso hijo (fork): los contadores heredados son del padre
+                self._contadores.clear()
+                self._pid = os.getpid()
+            self._contadores[nombre] += n
+            if time.monotonic() - self._ultimo_volcado < VOLCADO_ESTADISTICAS:
+                return
+            pendientes = dict(self._contadores)
+            self._contadores.clear()
+            self._ultimo_volcado = time.monotonic()
+        self._volcar(pendientes)
+
+    def _volcar(self, pendientes):
+        try:
+            self._conexion().executemany(
+                "INSERT INTO estadisticas (nombre, valor) VALUES (?, ?) "
+                "ON CONFLICT (nombre) DO UPDATE SET valor = valor + excluded.valor",
+                list(pendientes.items()),
+            )
+        except sqlite3.OperationalError:
+            # Índice ocupado: se reintenta en el próximo volcado
+            with self._candado:
+                self._contadores.update(pendientes)
+
+    def estadisticas(self):
+        """✅ Contadores de todos los procesos + ocupación actual."""
+        with self._candado:
+            pendientes = dict(self._contadores)
+            self._contadores.clear()
+            self._ultimo_volcado = time.monotonic()
+        if pendientes:
+            self._volcar(pendientes)
+
+        conn = self._conexion()
+        datos = {nombre: 0 for nombre in ("aciertos", "fallos", "escrituras", "expulsiones", "invalidadas")}
+        datos.update(conn.execute("SELECT nombre, valor FROM estadisticas"))
+        entradas, total, segmentos = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamano), 0), COUNT(archivo) FROM entradas"
+        ).fetchone()
+        consultas = datos["aciertos"] + datos["fallos"]
+        datos.update({
+            "entradas": entradas,
+            "segmentos": segmentos,
+            "bytes": total,
+            "max_bytes": self._max_bytes,
+            "tasa_aciertos": round(datos["aciertos"] / consultas, 3) if consultas else None,
+        })
+        return datos
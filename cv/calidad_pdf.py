@@ -0,0 +1,38 @@
+"""
+✅ Calidades de salida del PDF: tamaño contra tiempo de render.
+
+- rapido:       sin comprimir las páginas (menos CPU, más bytes)
+- equilibrado:  páginas con zlib (lo de siempre)
+- minimo:       páginas con zlib y además el PDF se reescribe con qpdf
+                (object streams, Flate nivel 9)
+
+Solo cambian la compresión de páginas y la reescritura con qpdf: el perfil
+(``DatosPersonales``) no tiene foto desde la migración 0006, así que no hay
+imágenes que reducir ni re-codificar.
+
+Se elige con ``?calidad=`` en /pdf/ (también acepta fast/balanced/smallest) o
+con ``CV_PDF_CALIDAD``. ``python benchmarks/calidad_pdf.py`` mide cada una.
+
+El CV usa Helvetica (Type1 estándar, no se incrusta). Si algún día se registra
+una fuente TTF, ReportLab ya la incrusta solo con los glifos usados (subset).
+"""
+from collections import namedtuple
+
+from django.conf import settings
+
+Calidad = namedtuple("Calidad", "compresion_paginas compactar")
+
+CALIDADES = {
+    "rapido": Calidad(compresion_paginas=0, compactar=False),
+    "equilibrado": Calidad(compresion_paginas=1, compactar=False),
+    "minimo": Calidad(compresion_paginas=1, compactar=True),
+}
+
+ALIAS = {"fast": "rapido", "balanced": "equilibrado", "smallest": "minimo"}
+
+
+def nombre_calidad(nombre=None):
+    """✅ Nombre canónico pedido (alias en inglés incluidos) o el de la configuración."""
+    nombre = ALIAS.get(nombre, nombre)
+    return nombre if nombre in CALIDADES else settings.CV_PDF_CALIDAD
+
@@ -0,0 +1,390 @@
+"""
+✅ Prueba de carga local: ``config.wsgi.application`` contra ``config.asgi.application``.
+
+Todo corre en el mismo proceso y sin servidor: el app WSGI se llama desde
+``concurrencia`` hilos (como un worker gthread de gunicorn) y el ASGI desde
+``concurrencia`` tareas de asyncio (como un worker de uvicorn). Cada request
+pasa por todos los middlewares y vistas reales.
+
+Para que dos corridas (p. ej. dos commits) sean comparables:
+
+- BD de prueba nueva (como ``manage.py test``) con datos sintéticos generados
+  con ``semilla``: perfil, ``filas`` por sección y ``certificados`` PDF con sus
+  miniaturas. La BD y los archivos del sitio no se tocan.
+- Caché del mismo backend configurado, pero en un directorio temporal (o con
+  otro KEY_PREFIX): cada app arranca con la caché vacía y no ensucia la real.
+- Cada hilo/tarea elige la ruta siguiente con su propio ``random.Random``
+  sembrado, y los segundos de ``calentamiento`` no se cuentan.
+
+Los /media/ los sirve ``django.views.static.serve`` (en producción los sirve
+Cloudinary, así que solo miden el costo de servir un archivo desde Django).
+
+Es un solo proceso: con vistas síncronas el ASGI de Django las corre de a una
+en su hilo (``thread_sensitive``), y el GIL limita a ambos. Para dimensionar
+workers se multiplica el req/s de un proceso por los núcleos disponibles.
+"""
+import asyncio
+import io
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.urls import include, re_path
+from django.views.static import serve
+
+# Combinaciones de ``sec`` del PDF que se piden por defecto (además de "/")
+SECCIONES_PDF = (
+    (),
+    ("datos",),
+    ("datos", "experiencia"),
+    ("experiencia", "cursos", "reconocimientos"),
+    ("cursos", "reconocimientos", "certificados"),
+)
+
+CACHES_EN_DISCO = ("cv.cache_mmap.CacheMmap", "django.core.cache.backends.filebased.FileBasedCache")
+
+Resultado = namedtuple("Resultado", "ruta estado ms")
+
+
+# ===============================
+# ✅ URLCONF DE LA PRUEBA (el del sitio + /media/)
+# ===============================
+
+def _servir_media(request, path):
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+urlpatterns = [
+    re_path(r"^media/(?P<path>.*)$", _servir_media),
+    re_path(r"", include("config.urls")),
+]
+
+
+# ===============================
+# ✅ DATOS SINTÉTICOS
+# ===============================
+
+def _texto(azar, palabras, largo):
+    return " ".join(azar.choice(palabras) for _ in range(12))[:largo].strip()
+
+
+def _certificado_pdf(titulo):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    salida = io.BytesIO()
+    lienzo = canvas.Canvas(salida, pagesize=A4)
+    lienzo.setFont("Helvetica-Bold", 20)
+    lienzo.drawCentredString(A4[0] / 2, A4[1] / 2, titulo)
+    lienzo.showPage()
+    lienzo.save()
+    return salida.getvalue()
+
+
+def sembrar(semilla, filas, certificados):
+    """✅ Perfil activo con ``filas`` por sección; devuelve las rutas /media/ a pedir."""
+    from . import miniaturas
+    from .models import (
+        CursosRealizados, DatosPersonales, ExperienciaLaboral, ProductosAcademicos,
+        ProductosLaborales, Reconocimientos, VentaGarage,
+    )
+
+    azar = random.Random(semilla)
+    palabras = (
+        "desarrollo gestión proyectos análisis datos django postgresql equipo sistemas "
+        "diseño calidad servicio soporte redes docencia investigación manta ecuador"
+    ).split()
+    inicio = date(2015, 1, 1)
+
+    def fecha():
+        return inicio + timedelta(days=azar.randrange(3000))
+
+    DatosPersonales.objects.bulk_create([DatosPersonales(
+        descripcionperfil="Perfil de carga", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+        lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+        sexo="M", estadocivil="Soltera", direcciondomiciliaria="Manta",
+    )])
+    perfil = DatosPersonales.objects.get()
+
+    almacenamiento = CursosRealizados._meta.get_field("rutacertificado").storage
+    nombres = [
+        almacenamiento.save(f"certificado-{i}.pdf", ContentFile(_certificado_pdf(f"Certificado {i}")))
+        for i in range(certificados)
+    ]
+
+    def certificado(i):
+        return nombres[i] if i < len(nombres) else None
+
+    ExperienciaLaboral.objects.bulk_create([ExperienciaLaboral(
+        perfil=perfil, cargodesempenado=_texto(azar, palabras, 100), nombrempresa=_texto(azar, palabras, 50),
+        lugarempresa="Manta", emailempresa="empresa@example.com", fechainiciogestion=fecha(),
+        descripcionfunciones=_texto(azar, palabras, 100),
+    ) for _ in range(filas)])
+    CursosRealizados.objects.bulk_create([CursosRealizados(
+        perfil=perfil, nombrecurso=_texto(azar, palabras, 100), fechainicio=inicio, fechafin=fecha(),
+        totalhoras=azar.randrange(8, 120), descripcioncurso=_texto(azar, palabras, 100),
+        entidadpatrocinadora=_texto(azar, palabras, 100), rutacertificado=certificado(i),
+    ) for i in range(filas)])
+    Reconocimientos.objects.bulk_create([Reconocimientos(
+        perfil=perfil, tiporeconocimiento=azar.choice(("Académico", "Público", "Privado")),
+        fechareconocimiento=fecha(), descripcionreconocimiento=_texto(azar, palabras, 100),
+        entidadpatrocinadora=_texto(azar, palabras, 100), rutacertificado=certificado(filas + i),
+    ) for i in range(filas)])
+    ProductosAcademicos.objects.bulk_create([ProductosAcademicos(
+        perfil=perfil, nombrerecurso=_texto(azar, palabras, 100), clasificador=_texto(azar, palabras, 100),
+        descripcion=_texto(azar, palabras, 100),
+    ) for _ in range(filas)])
+    ProductosLaborales.objects.bulk_create([ProductosLaborales(
+        perfil=perfil, nombreproducto=_texto(azar, palabras, 100), fechaproducto=fecha(),
+        descripcion=_texto(azar, palabras, 100),
+    ) for _ in range(filas)])
+    VentaGarage.objects.bulk_create([VentaGarage(
+        perfil=perfil, nombreproducto=_texto(azar, palabras, 100), estadoproducto=azar.choice(("Bueno", "Regular")),
+        descripcion=_texto(azar, palabras, 100), valordelbien=Decimal(azar.randrange(100, 100000)) / 100,
+    ) for _ in range(filas)])
+
+    # Las miniaturas las haría el worker: aquí en línea, para que la página las enlace
+    media = [almacenamiento.url(nombre) for nombre in nombres]
+    for seccion, modelo in miniaturas.MODELOS.items():
+        for pk in modelo.objects.exclude(rutacertificado=None).values_list("pk", flat=True):
+            miniatura = miniaturas.generar(seccion, pk)
+            if miniatura:
+                media.append(modelo._meta.get_field("miniaturacertificado").storage.url(miniatura))
+    return media
+
+
+def rutas_por_defecto(media):
+    rutas = ["/"]
+    rutas += ["/pdf/" + ("?" + "&".join(f"sec={s}" for s in secciones) if secciones else "")
+              for secciones in SECCIONES_PDF]
+    # Un certificado y una miniatura (todos cuestan lo mismo de servir)
+    for extension in (".pdf", ".webp"):
+        rutas += [url for url in sorted(media) if url.endswith(extension)][:1]
+    return rutas
+
+
+# ===============================
+# ✅ CLIENTES WSGI Y ASGI
+# ===============================
+
+def _cabeceras():
+    return {"accept": "text/html,application/pdf,*/*", "accept-encoding": "br, gzip"}
+
+
+def _pedir_wsgi(aplicacion, ruta):
+    partes = urlsplit(ruta)
+    entorno = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": partes.path, "QUERY_STRING": partes.query,
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1", "wsgi.version": (1, 0), "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr, "wsgi.multithread": True,
+        "wsgi.multiprocess": False, "wsgi.run_once": False,
+    }
+    entorno.update({f"HTTP_{k.upper().replace('-', '_')}": v for k, v in _cabeceras().items()})
+
+    estado = []
+    cuerpo = aplicacion(entorno, lambda status, headers, exc_info=None: estado.append(int(status[:3])))
+    try:
+        for _ in cuerpo:  # consumir el cuerpo, como el servidor
+            pass
+    finally:
+        if hasattr(cuerpo, "close"):
+            cuerpo.close()
+    return estado[0]
+
+
+async def _pedir_asgi(aplicacion, ruta):
+    partes = urlsplit(ruta)
+    alcance = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": partes.path, "raw_path": partes.path.encode(),
+        "query_string": partes.query.encode(), "root_path": "",
+        "headers": [(k.encode(), v.encode()) for k, v in _cabeceras().items()] + [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    terminado = asyncio.Event()
+    estado = []
+    pedido = False
+
+    async def recibir():
+        nonlocal pedido
+        if not pedido:
+            pedido = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await terminado.wait()
+        return {"type": "http.disconnect"}
+
+    async def enviar(mensaje):
+        if mensaje["type"] == "http.response.start":
+            estado.append(mensaje["status"])
+        elif mensaje["type"] == "http.response.body" and not mensaje.get("more_body"):
+            terminado.set()
+
+    await aplicacion(alcance, recibir, enviar)
+    terminado.set()
+    return estado[0]
+
+
+def _medir(pedir, ruta):
+    inicio = time.perf_counter()
+    try:
+        estado = pedir(ruta)
+    except Exception:
+        estado = None  # excepción sin respuesta: cuenta como error
+    return Resultado(ruta, estado, (time.perf_counter() - inicio) * 1000)
+
+
+def correr_wsgi(rutas, concurrencia, duracion, calentamiento, semilla):
+    from config.wsgi import application
+
+    resultados = []
+    candado = threading.Lock()
+    empezar = time.perf_counter() + calentamiento
+    fin = empezar + duracion
+
+    def trabajador(numero):
+        azar = random.Random(semilla * 1000 + numero)
+        propios = []
+        while (ahora := time.perf_counter()) < fin:
+            resultado = _medir(lambda r: _pedir_wsgi(application, r), azar.choice(rutas))
+            if ahora >= empezar:
+                propios.append(resultado)
+        with candado:
+            resultados.extend(propios)
+
+    hilos = [threading.Thread(target=trabajador, args=(n,)) for n in range(concurrencia)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return resultados
+
+
+def correr_asgi(rutas, concurrencia, duracion, calentamiento, semilla):
+    from config.asgi import application
+
+    async def principal():
+        resultados = []
+        empezar = time.perf_counter() + calentamiento
+        fin = empezar + duracion
+
+        async def trabajador(numero):
+            azar = random.Random(semilla * 1000 + numero)
+            while (ahora := time.perf_counter()) < fin:
+                ruta = azar.choice(rutas)
+                inicio = time.perf_counter()
+                try:
+                    estado = await _pedir_asgi(application, ruta)
+                except Exception:
+                    estado = None
+                if ahora >= empezar:
+                    resultados.append(Resultado(ruta, estado, (time.perf_counter() - inicio) * 1000))
+
+        await asyncio.gather(*(trabajador(n) for n in range(concurrencia)))
+        return resultados
+
+    return asyncio.run(principal())
+
+
+APPS = {"wsgi": correr_wsgi, "asgi": correr_asgi}
+
+
+# ===============================
+# ✅ RESUMEN
+# ===============================
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return None
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def resumir(resultados, duracion):
+    """{ruta: {...}} más "total": req/s, p50/p95/p99 en ms y % de errores (5xx o excepción)."""
+    por_ruta = defaultdict(list)
+    for resultado in resultados:
+        por_ruta[resultado.ruta].append(resultado)
+        por_ruta["total"].append(resultado)
+
+    resumen = {}
+    for ruta, lista in sorted(por_ruta.items(), key=lambda par: (par[0] == "total", par[0])):
+        tiempos = sorted(r.ms for r in lista)
+        errores = sum(1 for r in lista if r.estado is None or r.estado >= 500)
+        resumen[ruta] = {
+            "requests": len(lista),
+            "rps": round(len(lista) / duracion, 1),
+            "p50": round(percentil(tiempos, 50), 1),
+            "p95": round(percentil(tiempos, 95), 1),
+            "p99": round(percentil(tiempos, 99), 1),
+            "errores": round(100 * errores / len(lista), 2),
+            "estados": dict(sorted(Counter(str(r.estado) for r in lista).items())),
+        }
+    return resumen
+
+
+# ===============================
+# ✅ CORRIDA COMPLETA
+# ===============================
+
+def _caches_aisladas(directorio):
+    caches = {}
+    for alias, config in settings.CACHES.items():
+        config = dict(config, KEY_PREFIX=f"carga-{uuid.uuid4().hex[:8]}")
+        if config["BACKEND"] in CACHES_EN_DISCO:
+            config["LOCATION"] = str(Path(directorio) / alias)
+        caches[alias] = config
+    return caches
+
+
+def ejecutar(apps, concurrencia, duracion, calentamiento=1.0, semilla=0, filas=30, certificados=5,
+             rutas=None, informar=print):
+    """
+    ✅ Siembra una BD de prueba y corre cada app de ``apps``; devuelve
+    {"parametros": {...}, "apps": {app: resumir(...)}}.
+    """
+    with tempfile.TemporaryDirectory(prefix="cv-carga-") as directorio:
+        configuracion = override_settings(
+            ROOT_URLCONF=__name__,
+            MEDIA_ROOT=str(Path(directorio) / "media"),
+            STORAGES=dict(settings.STORAGES, default={"BACKEND": "django.core.files.storage.FileSystemStorage"}),
+            CV_CERTIFICADOS_LOCALES=str(Path(directorio) / "certificados"),
+            # Snapshot en línea al sembrar; nada de trabajos que nadie va a procesar
+            CV_SNAPSHOT_EN_COLA=False,
+            CV_PRERENDER_EN_COLA=False,
+        )
+        configuracion.enable()
+        bases = setup_databases(verbosity=0, interactive=False)
+        try:
+            informar(f"sembrando (semilla {semilla}, {filas} filas por sección, {certificados} certificados)…")
+            media = sembrar(semilla, filas, certificados)
+            rutas = list(rutas or rutas_por_defecto(media))
+
+            resultado = {
+                "parametros": {
+                    "concurrencia": concurrencia, "duracion": duracion, "calentamiento": calentamiento,
+                    "semilla": semilla, "filas": filas, "certificados": certificados, "rutas": rutas,
+                },
+                "apps": {},
+            }
+            for app in apps:
+                # Cada app con su caché vacía
+                with override_settings(CACHES=_caches_aisladas(Path(directorio) / f"cache-{app}")):
+                    informar(f"{app}: {concurrencia} concurrentes, {duracion:g} s (+{calentamiento:g} s de calentamiento)…")
+                    medidos = APPS[app](rutas, concurrencia, duracion, calentamiento, semilla)
+                resultado["apps"][app] = resumir(medidos, duracion)
+            return resultado
+        finally:
+            teardown_databases(bases, verbosity=0)
+            configuracion.disable()
@@ -0,0 +1,101 @@
+"""
+✅ Catálogo de venta de garage: filtros indexados + paginación keyset.
+
+El cursor es (valordelbien, idventagarage) para los órdenes por precio y
+(idventagarage,) para "recientes"; así la página 500 cuesta lo mismo que la 1.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+
+from .cursores import codificar_cursor, decodificar_cursor
+from .models import VentaGarage
+from .proyecciones import filas, visibles
+
+
+ESTADOS = {valor for valor, _ in VentaGarage._meta.get_field("estadoproducto").choices}
+
+ORDENES = {
+    "precio": ("valordelbien", "idventagarage"),
+    "-precio": ("-valordelbien", "-idventagarage"),
+    "recientes": ("-idventagarage",),
+}
+
+LIMITE_POR_DEFECTO = 24
+LIMITE_MAXIMO = 100
+
+
+def _decimal(valor):
+    """Decimal finito, o None (vacío, texto inválido, NaN, Infinity, listas...)."""
+    if valor in (None, "") or isinstance(valor, (bool, list, dict)):
+        return None
+    try:
+        numero = Decimal(str(valor))
+    except InvalidOperation:
+        return None
+    return numero if numero.is_finite() else None
+
+
+def _entero(valor):
+    # bool es subclase de int: un cursor con true no es un id; fuera de 64 bits
+    # tampoco (la BD no lo puede comparar)
+    return valor if type(valor) is int and -2 ** 63 <= valor < 2 ** 63 else None
+
+
+def _keyset(orden, cursor):
+    """Q de las filas después del cursor, o None si falta o viene manipulado."""
+    if orden == "recientes":
+        valores = decodificar_cursor(cursor, 1)
+        idventagarage = _entero(valores[0]) if valores else None
+        return Q(idventagarage__lt=idventagarage) if idventagarage is not None else None
+
+    valores = decodificar_cursor(cursor, 2)
+    if not valores:
+        return None
+    valor, idventagarage = _decimal(valores[0]), _entero(valores[1])
+    if valor is None or idventagarage is None:
+        return None
+
+    if orden == "precio":
+        return Q(valordelbien__gt=valor) | Q(valordelbien=valor, idventagarage__gt=idventagarage)
+    return Q(valordelbien__lt=valor) | Q(valordelbien=valor, idventagarage__lt=idventagarage)
+
+
+def pagina_garage(perfil, estado=None, minimo=None, maximo=None,
+                  orden="precio", cursor=None, limite=LIMITE_POR_DEFECTO):
+    """
+    ✅ Devuelve (productos, siguiente_cursor) de los productos visibles del perfil.
+    Filtros inválidos se ignoran en vez de romper la página.
+    """
+    if orden not in ORDENES:
+        orden = "precio"
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+
+    qs = visibles(VentaGarage, perfil)
+
+    if estado in ESTADOS:
+        qs = qs.filter(estadoproducto=estado)
+
+    minimo, maximo = _decimal(minimo), _decimal(maximo)
+    if minimo is not None:
+        qs = qs.filter(valordelbien__gte=minimo)
+    if maximo is not None:
+        qs = qs.filter(valordelbien__lte=maximo)
+
+    despues = _keyset(orden, cursor)
+    if despues is not None:
+        qs = qs.filter(despues)
+
+    productos = filas(qs.order_by(*ORDENES[orden])[:limite + 1], "html")
+    hay_mas = len(productos) > limite
+    productos = productos[:limite]
+
+    siguiente = None
+    if hay_mas:
+        ultimo = productos[-1]
+        if orden == "recientes":
+            siguiente = codificar_cursor(ultimo.idventagarage)
+        else:
+            siguiente = codificar_cursor(ultimo.valordelbien, ultimo.idventagarage)
+
+    return productos, siguiente
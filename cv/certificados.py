@@ -0,0 +1,147 @@
+"""
+✅ Anexo de certificados: con ``sec=certificados`` el PDF del CV lleva al final
+las páginas de los ``rutacertificado`` (PDF) de los cursos y reconocimientos
+pedidos.
+
+La unión es por páginas y sin cargar los archivos en memoria: qpdf (pikepdf)
+abre cada certificado en modo ``stream`` (lee del disco cada objeto cuando lo
+necesita) y al guardar copia los streams de las páginas uno a uno a la salida.
+
+Los certificados abiertos se guardan por hash de contenido (LRU de
+``CV_CERTIFICADOS_ABIERTOS``): otro PDF con los mismos certificados no vuelve a
+parsearlos, y un archivo reemplazado con otro contenido se abre de nuevo.
+
+El PDF resultante se guarda entero en la caché (con sus variantes br/gzip):
+el anexo se corta cuando los certificados suman ``CV_ANEXO_MAX_MB``, lo que
+acota la memoria del render aunque el CV tenga 50 certificados o más.
+
+Con un almacenamiento sin rutas locales (Cloudinary en producción) cada
+certificado se descarga una vez a ``CV_CERTIFICADOS_LOCALES``: los nombres
+subidos no se reutilizan, así que la copia no queda vieja.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from functools import lru_cache
+
+from django.conf import settings
+
+try:
+    import pikepdf
+except ImportError:  # pragma: no cover - opcional, está en requirements.txt
+    pikepdf = None
+
+logger = logging.getLogger(__name__)
+
+ANEXO = "certificados"
+SECCIONES_CON_CERTIFICADO = ("cursos", "reconocimientos")
+
+BLOQUE = 1 << 20
+
+# huella -> pikepdf.Pdf (None si el archivo no es un PDF legible)
+_abiertos = OrderedDict()
+
+
+def rutas(documento, secciones):
+    """✅ Rutas de los certificados de las secciones pedidas, en el orden del CV."""
+    resultado = []
+    for seccion in SECCIONES_CON_CERTIFICADO:
+        if seccion not in secciones:
+            continue
+        for fila in documento.filas(seccion, "html"):
+            archivo = fila.rutacertificado
+            if archivo and archivo.name.lower().endswith(".pdf"):
+                resultado.append(ruta_local(archivo))
+    return resultado
+
+
+def ruta_local(archivo):
+    """✅ Ruta en disco del FieldFile (descargado una vez si el almacenamiento es remoto)."""
+    try:
+        return archivo.path
+    except NotImplementedError:
+        pass
+
+    destino = Path(settings.CV_CERTIFICADOS_LOCALES) / archivo.name
+    if not destino.exists():
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        copia = tempfile.NamedTemporaryFile(dir=destino.parent, delete=False)
+        try:
+            with archivo.storage.open(archivo.name, "rb") as origen, copia:
+                shutil.copyfileobj(origen, copia, BLOQUE)
+            os.replace(copia.name, destino)  # atómico: nunca se lee una copia a medias
+        except Exception as error:
+            # _abrir lo registra como no encontrado y el anexo sigue sin él
+            logger.warning("no se pudo descargar el certificado %s (%s)", archivo.name, error)
+            Path(copia.name).unlink(missing_ok=True)
+    return str(destino)
+
+
+@lru_cache(maxsize=1024)
+def _huella(ruta, tamano, modificado):
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        while bloque := archivo.read(BLOQUE):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def huella(ruta):
+    """(sha256, tamaño) del archivo; el hash se recalcula solo si cambia su tamaño o fecha."""
+    estado = os.stat(ruta)
+    return _huella(ruta, estado.st_size, estado.st_mtime_ns), estado.st_size
+
+
+def _recortar():
+    while len(_abiertos) > settings.CV_CERTIFICADOS_ABIERTOS:
+        _, pdf = _abiertos.popitem(last=False)
+        if pdf is not None:
+            pdf.close()
+
+
+def _abrir(ruta):
+    """(pikepdf.Pdf o None si no se puede anexar, tamaño en bytes)."""
+    try:
+        clave, tamano = huella(ruta)
+    except OSError:
+        logger.warning("certificado no encontrado: %s", ruta)
+        return None, 0
+
+    if clave in _abiertos:
+        _abiertos.move_to_end(clave)
+        return _abiertos[clave], tamano
+
+    try:
+        pdf = pikepdf.open(ruta, access_mode=pikepdf.AccessMode.stream)
+    except (pikepdf.PdfError, pikepdf.PasswordError, OSError) as error:
+        logger.warning("certificado ilegible, no se anexa: %s (%s)", ruta, error)
+        pdf = None
+    _abiertos[clave] = pdf
+    return pdf, tamano
+
+
+def anexar(pdf, rutas_certificados):
+    """
+    ✅ Agrega al final de ``pdf`` las páginas de cada certificado y devuelve
+    cuántas agregó. Solo se llama desde cv/linealizado.reescribir, con su
+    candado tomado y antes de guardar: por eso los certificados que sobran en
+    la LRU se cierran al empezar el anexo siguiente y no ahora.
+    """
+    _recortar()
+    presupuesto = settings.CV_ANEXO_MAX_MB * 1024 * 1024
+    agregadas = 0
+    for ruta in rutas_certificados:
+        certificado, tamano = _abrir(ruta)
+        if certificado is None:
+            continue
+        if tamano > presupuesto:
+            logger.warning("anexo de certificados cortado en %s páginas (CV_ANEXO_MAX_MB)", agregadas)
+            break
+        presupuesto -= tamano
+        pdf.pages.extend(certificado.pages)
+        agregadas += len(certificado.pages)
+    return agregadas
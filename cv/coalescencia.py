@@ -0,0 +1,121 @@
+"""
+✅ Single-flight: requests idénticos y simultáneos comparten un solo render.
+
+Cuando se comparte el link del CV llegan decenas de ``/pdf/?sec=...`` iguales
+a la vez. El primero (líder) renderiza; el resto espera su resultado:
+
+- en el mismo proceso (hilos de gunicorn --threads): un ``threading.Event``;
+- entre procesos: un candado ``cache.add(clave + ":vuelo")`` en la caché
+  compartida; los demás consultan la caché hasta que aparece la entrada.
+
+Si el líder falla o tarda más de ``CV_SINGLE_FLIGHT_ESPERA`` segundos, cada
+seguidor renderiza por su cuenta (nunca se queda colgado un request).
+"""
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_vuelos = {}
+_candado = threading.Lock()
+
+METRICAS = ("lideres", "coalescidos", "esperas_vencidas")
+
+
+class _Vuelo:
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+
+
+def _clave_metrica(nombre):
+    return f"cv:metricas:single_flight:{nombre}"
+
+
+def _contar(nombre):
+    clave = _clave_metrica(nombre)
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.add(clave, 0, timeout=None)
+        cache.incr(clave)
+
+
+def metricas():
+    """✅ Contadores globales (todos los procesos): {nombre: n}."""
+    encontradas = cache.get_many([_clave_metrica(m) for m in METRICAS])
+    return {m: encontradas.get(_clave_metrica(m), 0) for m in METRICAS}
+
+
+def una_sola_vez(clave, calcular):
+    """
+    ✅ Devuelve ``cache.get(clave)`` o, si falta, el resultado de ``calcular()``
+    ejecutado una sola vez entre todos los requests concurrentes.
+
+    ``calcular`` debe guardar su resultado en la caché bajo ``clave`` (así lo
+    ven los otros procesos) y devolverlo; puede devolver None si no hay nada
+    que compartir (p. ej. una respuesta 404), y entonces cada seguidor recibe None.
+    """
+    with _candado:
+        vuelo = _vuelos.get(clave)
+        lider = vuelo is None
+        if lider:
+            vuelo = _vuelos[clave] = _Vuelo()
+
+    if not lider:
+        if vuelo.evento.wait(settings.CV_SINGLE_FLIGHT_ESPERA):
+            if vuelo.resultado is not None:
+                _contar("coalescidos")
+            return vuelo.resultado
+        _contar("esperas_vencidas")
+        return None
+
+    try:
+        vuelo.resultado = _entre_procesos(clave, calcular)
+        return vuelo.resultado
+    finally:
+        with _candado:
+            _vuelos.pop(clave, None)
+        vuelo.evento.set()
+
+
+def _entre_procesos(clave, calcular):
+    candado = f"{clave}:vuelo"
+    token = uuid.uuid4().hex
+    espera = settings.CV_SINGLE_FLIGHT_ESPERA
+
+    if cache.add(candado, token, timeout=espera):
+        try:
+            # Otro proceso pudo terminar entre nuestro cache.get() y el candado
+            resultado = cache.get(clave)
+            if resultado is not None:
+                return resultado
+            _contar("lideres")
+            return calcular()
+        finally:
+            if cache.get(candado) == token:
+                cache.delete(candado)
+
+    # Otro proceso ya está renderizando: esperar a que deje la entrada en caché
+    limite = time.monotonic() + espera
+    pausa = 0.02
+    while time.monotonic() < limite:
+        time.sleep(pausa)
+        pausa = min(pausa * 2, 0.25)
+
+        resultado = cache.get(clave)
+        if resultado is not None:
+            _contar("coalescidos")
+            return resultado
+        if cache.get(candado) is None:
+            # El líder terminó sin guardar nada (error o respuesta no cacheable)
+            return None
+
+    _contar("esperas_vencidas")
+    logger.warning("single-flight: se agotó la espera de %s", clave)
+    return None
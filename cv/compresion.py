@@ -0,0 +1,160 @@
+"""
+✅ Variantes precomprimidas (Brotli / gzip) de la página y los PDFs.
+
+Cada entrada de caché guarda el cuerpo original y sus versiones comprimidas,
+calculadas UNA vez por versión de contenido y con la máxima calidad. En cada
+request solo se negocia ``Accept-Encoding`` y se devuelve la variante lista.
+"""
+import gzip
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .coalescencia import una_sola_vez
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli está en requirements.txt
+    brotli = None
+
+try:
+    from zopfli.gzip import compress as zopfli_gzip
+except ImportError:  # pragma: no cover
+    zopfli_gzip = None
+
+
+# Zopfli comprime ~5% mejor que gzip -9 pero es lento: solo para cuerpos chicos
+LIMITE_ZOPFLI = 256 * 1024
+
+# Brotli 11 tarda ~1 s por MB: los cuerpos grandes (PDF con certificados
+# anexados, casi todo ya comprimido) van con calidad 5
+LIMITE_BROTLI_MAXIMO = 1024 * 1024
+
+# Cabeceras de la respuesta original que se guardan junto al cuerpo
+CABECERAS_GUARDADAS = ("Content-Disposition",)
+
+
+def comprimir_variantes(contenido):
+    """✅ {"identity": ..., "br": ..., "gzip": ...} (solo las que ahorran bytes)."""
+    variantes = {"identity": contenido}
+
+    if brotli is not None:
+        calidad = 11 if len(contenido) <= LIMITE_BROTLI_MAXIMO else 5
+        variantes["br"] = brotli.compress(contenido, quality=calidad)
+
+    if zopfli_gzip is not None and len(contenido) <= LIMITE_ZOPFLI:
+        variantes["gzip"] = zopfli_gzip(contenido)
+    else:
+        variantes["gzip"] = gzip.compress(contenido, compresslevel=9, mtime=0)
+
+    return {
+        cod: cuerpo for cod, cuerpo in variantes.items()
+        if cod == "identity" or len(cuerpo) < len(contenido)
+    }
+
+
+def elegir_codificacion(accept_encoding, disponibles):
+    """
+    ✅ Mejor codificación aceptada por el cliente entre las disponibles.
+    Respeta q-values (``q=0`` prohíbe); ante empate prefiere br sobre gzip.
+    """
+    preferencias = {}
+    for parte in (accept_encoding or "").split(","):
+        token, _, parametros = parte.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        preferencias[token] = q
+
+    mejor, mejor_q = "identity", 0.0
+    for cod in ("br", "gzip"):
+        if cod not in disponibles:
+            continue
+        q = preferencias.get(cod, preferencias.get("*", 0.0))
+        if q > mejor_q:
+            mejor, mejor_q = cod, q
+    return mejor
+
+
+def guardar_entrada(clave, contenido, content_type, cabeceras=None, etiquetas=()):
+    """✅ Comprime y guarda una entrada (usado por la vista y por los prerender en cola)."""
+    entrada = {
+        "content_type": content_type,
+        "cabeceras": cabeceras or {},
+        "variantes": comprimir_variantes(contenido),
+    }
+    set_con_etiquetas = getattr(cache, "set_con_etiquetas", None)
+    if etiquetas and set_con_etiquetas is not None:
+        set_con_etiquetas(clave, entrada, etiquetas, settings.CV_CACHE_PAGINAS)
+    else:
+        cache.set(clave, entrada, settings.CV_CACHE_PAGINAS)
+    return entrada
+
+
+def respuesta_desde_entrada(request, entrada):
+    cod = elegir_codificacion(request.META.get("HTTP_ACCEPT_ENCODING"), entrada["variantes"])
+
+    response = HttpResponse(entrada["variantes"][cod], content_type=entrada["content_type"])
+    for nombre, valor in entrada["cabeceras"].items():
+        response[nombre] = valor
+    if cod != "identity":
+        response["Content-Encoding"] = cod
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def con_variantes_comprimidas(clave_de, etiquetas_de=None):
+    """
+    ✅ Decorador de vista: cachea la respuesta 200 con sus variantes comprimidas
+    (con single-flight: un solo render por clave aunque lleguen muchos a la vez).
+
+    ``clave_de(request)`` devuelve la clave de caché (debe incluir la versión
+    de contenido) o None para no cachear ese request; ``etiquetas_de(request)``,
+    las etiquetas con que se guarda (ver cv/cache_mmap.py).
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return vista(request, *args, **kwargs)
+
+            clave = clave_de(request)
+            if clave is None:
+                return vista(request, *args, **kwargs)
+
+            # cv_sin_cache: perfilado "frio" (cv/perfilado.py), mide el render
+            entrada = None if getattr(request, "cv_sin_cache", False) else cache.get(clave)
+            if entrada is None:
+                propia = None
+
+                def renderizar():
+                    nonlocal propia
+                    propia = vista(request, *args, **kwargs)
+                    if propia.status_code != 200 or propia.streaming or propia.has_header("Content-Encoding"):
+                        return None
+                    return guardar_entrada(
+                        clave,
+                        propia.content,
+                        propia["Content-Type"],
+                        {h: propia[h] for h in CABECERAS_GUARDADAS if propia.has_header(h)},
+                        etiquetas_de(request) if etiquetas_de else (),
+                    )
+
+                # Requests idénticos simultáneos esperan el render del primero
+                entrada = una_sola_vez(clave, renderizar)
+                if entrada is None:
+                    return propia if propia is not None else vista(request, *args, **kwargs)
+
+            return respuesta_desde_entrada(request, entrada)
+        return envoltura
+    return decorador
@@ -0,0 +1,156 @@
+"""
+✅ Presupuesto de consultas SQL por vista y detector de N+1.
+
+``ConsultasMiddleware`` anota (con ``execute_wrapper``, sin DEBUG) las
+consultas de cada request en todas las conexiones y, al terminar:
+
+- agrupa por huella (el SQL con los literales y parámetros reemplazados por
+  ``?``): ``CV_CONSULTAS_REPETIDAS`` o más con la misma forma es un N+1;
+- compara el total con el presupuesto declarado de la vista
+  (``@presupuesto_consultas(n)``) o con ``CV_PRESUPUESTO_ADMIN`` en los
+  changelists del admin.
+
+Con ``CV_CONSULTAS_ESTRICTO`` (los tests de cv/tests.py) un exceso lanza
+``ConsultasExcedidas``; en producción solo se registra en el log "cv.consultas".
+Los presupuestos cubren el camino frío (caché vacía): con caché son menos.
+Un camino de respaldo raro (p. ej. armar el CV desde las tablas cuando aún no
+hay snapshot) va dentro de ``fuera_de_presupuesto()``: sus consultas no cuentan
+para el total, pero sí para el detector de N+1.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+# Registro del request en curso (lo fija ConsultasMiddleware)
+_registro_actual = ContextVar("cv_registro_consultas", default=None)
+
+
+class ConsultasExcedidas(AssertionError):
+    """Un request pasó su presupuesto de consultas o repitió una consulta (N+1)."""
+
+
+def huella(sql):
+    """✅ Forma de la consulta: literales y listas IN colapsados a ``?``."""
+    sql = _CADENAS.sub("?", sql)
+    sql = _NUMEROS.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _LISTAS.sub("(?)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def presupuesto_consultas(maximo):
+    """✅ Decorador de vista: máximo de consultas SQL por request (va por fuera de todo)."""
+    def decorador(vista):
+        vista.presupuesto_consultas = maximo
+        return vista
+    return decorador
+
+
+class Registro:
+    """Consultas de un bloque de código, en todas las conexiones."""
+
+    def __init__(self):
+        self.consultas = []
+        self.excluidas = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.consultas.append((context["connection"].alias, sql))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        for conexion in connections.all():
+            self._pila.enter_context(conexion.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._pila.close()
+
+    def repetidas(self, minimo=None):
+        """{huella: veces} de las consultas que se repiten ``minimo`` veces o más."""
+        minimo = minimo or settings.CV_CONSULTAS_REPETIDAS
+        conteo = Counter(huella(sql) for _, sql in self.consultas)
+        return {forma: veces for forma, veces in conteo.items() if veces >= minimo}
+
+    def problemas(self, maximo=None):
+        """✅ Textos de lo que está mal (vacío si nada)."""
+        encontrados = []
+        contadas = len(self.consultas) - self.excluidas
+        if maximo is not None and contadas > maximo:
+            encontrados.append(f"{contadas} consultas (presupuesto {maximo})")
+        for forma, veces in self.repetidas().items():
+            encontrados.append(f"N+1: {veces} veces {forma[:300]}")
+        return encontrados
+
+
+@contextmanager
+def fuera_de_presupuesto():
+    """✅ Las consultas del bloque no cuentan para el presupuesto del request."""
+    registro = _registro_actual.get()
+    antes = len(registro.consultas) if registro is not None else 0
+    try:
+        yield
+    finally:
+        if registro is not None:
+            registro.excluidas += len(registro.consultas) - antes
+
+
+def _presupuesto(request, vista):
+    maximo = getattr(vista, "presupuesto_consultas", None)
+    if maximo is not None:
+        return maximo
+    ruta = request.resolver_match
+    if ruta and ruta.namespace == "admin" and (ruta.url_name or "").endswith("_changelist"):
+        return settings.CV_PRESUPUESTO_ADMIN
+    return None
+
+
+def revisar(registro, maximo, descripcion):
+    """Lanza (modo estricto) o registra en el log los problemas encontrados."""
+    encontrados = registro.problemas(maximo)
+    if not encontrados:
+        return
+    mensaje = f"{descripcion}: " + "; ".join(encontrados)
+    if settings.CV_CONSULTAS_ESTRICTO:
+        raise ConsultasExcedidas(mensaje)
+    logger.warning(mensaje)
+
+
+class ConsultasMiddleware:
+    """✅ Registra las consultas de cada request y revisa su presupuesto."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with Registro() as registro:
+            request._cv_consultas = registro
+            token = _registro_actual.set(registro)
+            try:
+                response = self.get_response(request)
+            finally:
+                _registro_actual.reset(token)
+
+        revisar(
+            registro, getattr(request, "_cv_presupuesto", None),
+            f"{request.method} {request.path}",
+        )
+        if settings.DEBUG:
+            response["X-CV-Consultas"] = str(len(registro.consultas))
+        return response
+
+    def process_view(self, request, vista, args, kwargs):
+        request._cv_presupuesto = _presupuesto(request, vista)
@@ -0,0 +1,28 @@
+"""
+✅ Cursores keyset (opacos) para paginar sin OFFSET.
+
+El cursor es la tupla de la última fila entregada, serializada en JSON y
+codificada en base64 url-safe. Páginas profundas cuestan lo mismo que la primera.
+"""
+import base64
+import binascii
+import json
+
+
+def codificar_cursor(*valores):
+    crudo = json.dumps(list(valores), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor, longitud):
+    """✅ Devuelve la lista de valores o None si el cursor es inválido."""
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(valores, list) or len(valores) != longitud:
+        return None
+    return valores
@@ -0,0 +1,103 @@
+"""
+✅ Cifras resumen del CV calculadas por la base de datos:
+
+- horas de cursos:        SUM(totalhoras)
+- años de experiencia:    SUM de meses entre fechainiciogestion y COALESCE(fechafingestion, hoy)
+- reconocimientos:        COUNT por tiporeconocimiento
+- garage:                 SUM(valordelbien) y COUNT de lo no vendido
+
+Todo sale en UNA consulta (subconsultas escalares sobre datospersonales) y solo
+cuenta filas visibles, igual que cv.html y el PDF. El resultado se guarda en la
+caché bajo la versión de contenido del perfil (cv/snapshots.py): mientras el CV
+no cambie, pedirlo cuesta dos lecturas de caché, sin importar cuántas filas haya.
+Los periodos de experiencia se cuentan en meses (año*12 + mes): es portable y no
+desborda como SUM de intervalos, que SQLite guarda en microsegundos. Los periodos
+que se solapan se suman tal cual, y los abiertos cuentan hasta hoy (la entrada
+vive CV_CACHE_FRAGMENTOS, un día por defecto).
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+)
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .models import CursosRealizados, DatosPersonales, ExperienciaLaboral, Reconocimientos, VentaGarage
+from .proyecciones import visibles
+from .snapshots import version_contenido
+
+Estadisticas = namedtuple(
+    "Estadisticas", "horas_cursos anios_experiencia reconocimientos valor_garage productos_garage"
+)
+
+TIPOS_RECONOCIMIENTO = tuple(v for v, _ in Reconocimientos._meta.get_field("tiporeconocimiento").choices)
+
+
+
+def _meses(fecha):
+    """Meses desde el año 0 (año*12 + mes) de una expresión de fecha."""
+    return ExtractYear(fecha) * 12 + ExtractMonth(fecha)
+
+
+def _escalar(modelo, agregado, output_field):
+    """Subconsulta con el agregado de las filas visibles del perfil externo (0 si no hay)."""
+    filas = (
+        visibles(modelo, OuterRef("idperfil"))
+        .order_by()
+        .values("perfil")
+        .annotate(total=agregado)
+        .values("total")
+    )
+    return Coalesce(Subquery(filas, output_field=output_field), Value(0), output_field=output_field)
+
+
+def calcular(idperfil):
+    """✅ Estadisticas del perfil con una sola consulta (None si no existe)."""
+    hoy = timezone.localdate()
+    meses = Sum(_meses(Coalesce("fechafingestion", Value(hoy))) - _meses("fechainiciogestion"))
+    anotaciones = {
+        "horas": _escalar(CursosRealizados, Sum("totalhoras"), IntegerField()),
+        "meses_experiencia": _escalar(ExperienciaLaboral, meses, IntegerField()),
+        "valor_garage": _escalar(VentaGarage, Sum("valordelbien"), DecimalField(max_digits=14, decimal_places=2)),
+        "productos_garage": _escalar(VentaGarage, Count("pk"), IntegerField()),
+    }
+    for i, tipo in enumerate(TIPOS_RECONOCIMIENTO):
+        anotaciones[f"tipo_{i}"] = _escalar(
+            Reconocimientos, Count("pk", filter=Q(tiporeconocimiento=tipo)), IntegerField()
+        )
+
+    fila = DatosPersonales.objects.filter(idperfil=idperfil).values(**anotaciones).first()
+    if fila is None:
+        return None
+
+    return Estadisticas(
+        horas_cursos=fila["horas"],
+        anios_experiencia=round(fila["meses_experiencia"] / 12, 1),
+        reconocimientos={t: fila[f"tipo_{i}"] for i, t in enumerate(TIPOS_RECONOCIMIENTO)},
+        valor_garage=Decimal(fila["valor_garage"]).quantize(Decimal("0.01")),
+        productos_garage=fila["productos_garage"],
+    )
+
+
+def clave_estadisticas(idperfil, version):
+    return f"cv:estadisticas:{idperfil}:{version}"
+
+
+def obtener(idperfil):
+    """✅ Estadisticas cacheadas por versión de contenido (se recalculan solo si cambió el CV)."""
+    contenido = version_contenido(idperfil)
+    if contenido is None:
+        return calcular(idperfil)
+
+    clave = clave_estadisticas(idperfil, contenido.version)
+    estadisticas = cache.get(clave)
+    if estadisticas is None:
+        estadisticas = calcular(idperfil)
+        if estadisticas is not None:
+            cache.set(clave, tuple(estadisticas), settings.CV_CACHE_FRAGMENTOS)
+        return estadisticas
+    return Estadisticas(*estadisticas)
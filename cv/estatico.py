@@ -0,0 +1,166 @@
+"""
+✅ Export estático del CV (página + PDFs) para servir desde un CDN sin Python ni BD.
+
+Estructura generada::
+
+    destino/
+      index.html (+ .br, .gz)                 -> perfil activo
+      perfiles/<idperfil>/index.html (+ ...)  -> cada perfil
+      perfiles/<idperfil>/pdf/hoja_vida.<hash>.pdf (+ .br, .gz)
+      manifest.json                           -> versión/huella de contenido por salida
+
+Los PDFs llevan el hash de su contenido en el nombre (cacheables "para siempre");
+el modo incremental compara lo guardado en manifest.json con el snapshot del
+perfil (en la BD, no en la caché: un flush no fuerza a regenerar todo) y solo
+regenera lo que cambió: la página si cambió ``CVSnapshot.version``, cada PDF si
+cambiaron los datos o las secciones que incluye.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+from itertools import combinations
+from pathlib import Path
+
+from django.template.loader import render_to_string
+
+from .compresion import comprimir_variantes
+from .models import CVSnapshot, DatosPersonales
+from .snapshots import obtener, reconstruir
+from .views import SECCIONES_PDF, contexto_cv, renderizar_pdf
+
+EXTENSIONES = {"br": ".br", "gzip": ".gz"}
+
+OPCIONALES = sorted(SECCIONES_PDF - {"datos"})
+
+# Igual que generarPDF(): "datos" siempre + cualquier subconjunto de las demás
+COMBINACIONES = [
+    tuple(sorted(("datos",) + combo))
+    for n in range(len(OPCIONALES) + 1)
+    for combo in combinations(OPCIONALES, n)
+]
+
+
+def _escribir(ruta, contenido):
+    """Escribe el archivo y sus variantes .br/.gz de forma atómica."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    for cod, cuerpo in comprimir_variantes(contenido).items():
+        destino = Path(str(ruta) + EXTENSIONES.get(cod, ""))
+        temporal = destino.with_name(destino.name + ".tmp")
+        temporal.write_bytes(cuerpo)
+        os.replace(temporal, destino)
+
+
+def _nombre_hasheado(contenido):
+    return f"hoja_vida.{hashlib.sha256(contenido).hexdigest()[:16]}.pdf"
+
+
+def _snapshot(idperfil):
+    """(CVSnapshot.version, documento) del perfil; reconstruye el snapshot si falta."""
+    version = CVSnapshot.objects.filter(perfil_id=idperfil).values_list("version", flat=True).first()
+    if version is None:
+        reconstruir(idperfil)
+        version = CVSnapshot.objects.filter(perfil_id=idperfil).values_list("version", flat=True).get()
+    return version, obtener(idperfil).datos
+
+
+def _huella_pdf(datos, combo):
+    """Hash del contenido que dibuja el PDF de ``combo``: datos del perfil + sus secciones."""
+    partes = {"perfil": datos["perfil"], **{s: datos["secciones"][s] for s in combo if s != "datos"}}
+    crudo = json.dumps(partes, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(crudo.encode(), digest_size=8).hexdigest()
+
+
+def _pagina(idperfil, pdfs, prefijo):
+    mapa = {clave: prefijo + archivo for clave, archivo in pdfs.items()}
+    return render_to_string("cv/cv.html", {
+        **contexto_cv(idperfil, estatico=True),
+        "pdf_estaticos": mapa,
+    }).encode()
+
+
+def construir(destino, incremental=False, log=print):
+    """✅ Genera el sitio en ``destino``. Devuelve {"paginas": n, "pdfs": n}."""
+    destino = Path(destino)
+    ruta_manifest = destino / "manifest.json"
+
+    manifest = {}
+    if incremental and ruta_manifest.exists():
+        manifest = json.loads(ruta_manifest.read_text())
+
+    nuevo = {}
+    stats = {"paginas": 0, "pdfs": 0}
+    activo = DatosPersonales.objects.filter(perfilactivo=1).values_list("idperfil", flat=True).first()
+
+    for perfil in DatosPersonales.objects.order_by("idperfil"):
+        carpeta = destino / "perfiles" / str(perfil.idperfil)
+        previo = manifest.get(str(perfil.idperfil), {})
+        pdfs_previos = previo.get("pdfs", {})
+        entrada = {"pdfs": {}, "pagina": None}
+        cambio_pdf = False
+        version, datos = _snapshot(perfil.idperfil)
+
+        for combo in COMBINACIONES:
+            clave = ",".join(combo)
+            huella = _huella_pdf(datos, combo)
+            anterior = pdfs_previos.get(clave)
+
+            if anterior and anterior["huella"] == huella and (carpeta / anterior["archivo"]).exists():
+                entrada["pdfs"][clave] = anterior
+                continue
+
+            buffer = io.BytesIO()
+            renderizar_pdf(perfil.idperfil, list(combo), buffer, invariante=True)
+            contenido = buffer.getvalue()
+            archivo = f"pdf/{_nombre_hasheado(contenido)}"
+
+            if not (carpeta / archivo).exists():
+                _escribir(carpeta / archivo, contenido)
+            entrada["pdfs"][clave] = {"huella": huella, "archivo": archivo}
+            stats["pdfs"] += 1
+            cambio_pdf = cambio_pdf or anterior is None or anterior["archivo"] != archivo
+
+        pdfs = {clave: e["archivo"] for clave, e in entrada["pdfs"].items()}
+        fue_activo = manifest.get("_activo") == perfil.idperfil
+        es_activo = perfil.idperfil == activo
+
+        if (previo.get("pagina") != version or cambio_pdf
+                or not (carpeta / "index.html").exists()
+                or (es_activo and not fue_activo)):
+            _escribir(carpeta / "index.html", _pagina(perfil.idperfil, pdfs, ""))
+            if es_activo:
+                _escribir(destino / "index.html", _pagina(perfil.idperfil, pdfs, f"perfiles/{perfil.idperfil}/"))
+            stats["paginas"] += 1
+            log(f"  perfil {perfil.idperfil}: página regenerada")
+
+        entrada["pagina"] = version
+        nuevo[str(perfil.idperfil)] = entrada
+
+    nuevo["_activo"] = activo
+    _limpiar_huerfanos(destino, nuevo)
+
+    temporal = ruta_manifest.with_name("manifest.json.tmp")
+    destino.mkdir(parents=True, exist_ok=True)
+    temporal.write_text(json.dumps(nuevo, indent=2, sort_keys=True))
+    os.replace(temporal, ruta_manifest)
+    return stats
+
+
+def _limpiar_huerfanos(destino, manifest):
+    """Borra perfiles eliminados y PDFs (y variantes) que ya no referencia nadie."""
+    vivos = {
+        str(destino / "perfiles" / idperfil / e["archivo"])
+        for idperfil, entrada in manifest.items() if not idperfil.startswith("_")
+        for e in entrada["pdfs"].values()
+    }
+    for carpeta in (destino / "perfiles").glob("*"):
+        if carpeta.is_dir() and carpeta.name not in manifest:
+            shutil.rmtree(carpeta)
+
+    for ruta in (destino / "perfiles").glob("*/pdf/*"):
+        base = str(ruta)
+        for ext in EXTENSIONES.values():
+            base = base.removesuffix(ext)
+        if base not in vivos:
+            ruta.unlink()
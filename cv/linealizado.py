@@ -0,0 +1,56 @@
+"""
+✅ PDF linealizado ("fast web view") y compactado, reescribiendo con qpdf (pikepdf).
+
+ReportLab escribe la tabla de referencias al final del archivo, así que el
+visor del navegador necesita el PDF completo antes de dibujar la primera
+página. Linealizado, el diccionario de linealización, la primera página y sus
+recursos van al principio: con ``Accept-Ranges`` (ver cv/rangos.py) el visor
+muestra la página 1 apenas llegan los primeros KB.
+
+Compactado (calidad "minimo", cv/calidad_pdf.py): object streams y Flate nivel 9.
+Con anexos (cv/certificados.py): las páginas de los certificados van al final.
+
+La linealización se activa con ``CV_PDF_LINEALIZADO``; sin pikepdf instalado
+el PDF sale tal cual.
+"""
+import io
+import logging
+import threading
+
+from . import certificados
+
+try:
+    import pikepdf
+except ImportError:  # pragma: no cover - opcional, está en requirements.txt
+    pikepdf = None
+
+logger = logging.getLogger(__name__)
+
+NIVEL_FLATE_COMPACTO = 9
+
+# El nivel de Flate de pikepdf es global al proceso
+_candado = threading.Lock()
+
+
+def reescribir(contenido, linealizar=False, compactar=False, anexos=()):
+    """✅ Bytes del PDF reescrito (mismo contenido de entrada = mismos bytes)."""
+    if not (linealizar or compactar or anexos):
+        return contenido
+    if pikepdf is None:
+        logger.warning("linealizar/compactar/anexar al PDF requiere pikepdf, que no está instalado")
+        return contenido
+
+    salida = io.BytesIO()
+    with _candado, pikepdf.open(io.BytesIO(contenido)) as pdf:
+        if anexos:
+            certificados.anexar(pdf, anexos)
+        pikepdf.settings.set_flate_compression_level(NIVEL_FLATE_COMPACTO if compactar else -1)
+        # deterministic_id: el /ID sale del contenido (build_static hashea los bytes).
+        # Object streams: el PDF linealizado se sirve sin br (cv/rangos.py), así
+        # que se compactan también los diccionarios (~15% menos bytes)
+        pdf.save(
+            salida, linearize=linealizar, deterministic_id=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            recompress_flate=compactar,
+        )
+    return salida.getvalue()
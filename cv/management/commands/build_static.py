@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cv.estatico import COMBINACIONES, construir
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta la página y todos los PDFs (cada combinación de secciones) de cada "
+        "perfil a un directorio estático con nombres hasheados y variantes .br/.gz."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("destino", help="Directorio de salida, p. ej. ./sitio")
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Solo regenera perfiles/secciones cuya versión de contenido cambió."
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        self.stdout.write(f"Combinaciones de PDF por perfil: {len(COMBINACIONES)}")
+
+        stats = construir(options["destino"], incremental=options["incremental"], log=self.stdout.write)
+
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats['paginas']} páginas y {stats['pdfs']} PDFs generados en {segundos:.1f} s"
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cv.models import CVSnapshot
+from cv.snapshots import reconstruir, verificar
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara cada CVSnapshot con las tablas de origen. Sale con error si hay "
+        "diferencias (útil en CI o cron); con --reparar las corrige."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--perfil", type=int, help="Solo este perfil.")
+        parser.add_argument("--reparar", action="store_true", help="Reconstruye o borra los que fallen.")
+
+    def handle(self, *args, **options):
+        problemas = verificar(options["perfil"])
+
+        for idperfil, problema in problemas:
+            self.stdout.write(f"  perfil {idperfil}: {problema}")
+            if options["reparar"]:
+                if problema == "huerfano":
+                    CVSnapshot.objects.filter(perfil_id=idperfil).delete()
+                else:
+                    reconstruir(idperfil)
+
+        if not problemas:
+            self.stdout.write(self.style.SUCCESS("✅ Snapshots consistentes."))
+        elif options["reparar"]:
+            self.stdout.write(self.style.SUCCESS(f"✅ Reparados: {len(problemas)}."))
+        else:
+            raise CommandError(f"{len(problemas)} snapshot(s) inconsistentes (usa --reparar).")
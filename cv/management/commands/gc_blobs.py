@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from cv.blobs import recolectar
+
+
+class Command(BaseCommand):
+    help = "Recuenta las referencias de los blobs (subidas por contenido) y borra los que nadie usa."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--gracia", type=int, help="Segundos de gracia (por defecto CV_BLOBS_GRACIA).")
+        parser.add_argument("--simular", action="store_true", help="Solo informar, sin borrar.")
+
+    def handle(self, *args, **options):
+        borrados, liberados = recolectar(options["gracia"], simular=options["simular"])
+        accion = "se borrarían" if options["simular"] else "borrados"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Blobs sin referencias {accion}: {borrados} ({liberados / 1024 / 1024:.1f} MB)."
+        ))
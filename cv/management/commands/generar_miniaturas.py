@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from cv.miniaturas import MODELOS, generar
+from cv.trabajos import encolar
+
+
+class Command(BaseCommand):
+    help = (
+        "Encola la miniatura WebP de cada certificado que todavía no la tiene "
+        "(con --todas, de todos; con --ahora, la genera en este proceso)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--todas", action="store_true", help="También las que ya tienen miniatura.")
+        parser.add_argument("--ahora", action="store_true", help="Generar aquí en lugar de encolar.")
+
+    def handle(self, *args, **options):
+        total = 0
+        for seccion, modelo in MODELOS.items():
+            filas = modelo.objects.exclude(Q(rutacertificado="") | Q(rutacertificado__isnull=True))
+            if not options["todas"]:
+                filas = filas.filter(Q(miniaturacertificado="") | Q(miniaturacertificado__isnull=True))
+
+            for pk in filas.order_by("pk").values_list("pk", flat=True):
+                if options["ahora"]:
+                    generar(seccion, pk)
+                else:
+                    encolar(
+                        "miniatura_certificado", {"seccion": seccion, "pk": pk},
+                        clave=f"miniatura:{seccion}:{pk}", prioridad=-10,
+                    )
+                total += 1
+
+        accion = "generadas" if options["ahora"] else "encoladas"
+        self.stdout.write(self.style.SUCCESS(f"✅ Miniaturas {accion}: {total}."))
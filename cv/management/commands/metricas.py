@@ -0,0 +1,24 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from cv.coalescencia import metricas
+
+
+class Command(BaseCommand):
+    help = "Muestra los contadores de single-flight y, si el backend los tiene, los de la caché."
+
+    def handle(self, *args, **options):
+        self.stdout.write("single-flight:")
+        datos = metricas()
+        for nombre, valor in datos.items():
+            self.stdout.write(f"  {nombre:<18} {valor}")
+
+        total = datos["lideres"] + datos["coalescidos"]
+        if total:
+            self.stdout.write(f"  renders evitados   {datos['coalescidos'] / total:.0%}")
+
+        estadisticas = getattr(cache, "estadisticas", None)
+        if estadisticas is not None:
+            self.stdout.write("caché:")
+            for nombre, valor in estadisticas().items():
+                self.stdout.write(f"  {nombre:<18} {valor}")
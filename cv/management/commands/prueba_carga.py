@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cv.carga import APPS, ejecutar
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga local (sin servidor) de config.wsgi.application y config.asgi.application "
+        "sobre una BD de prueba con datos sintéticos: req/s, p50/p95/p99 y errores por ruta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", action="append", choices=sorted(APPS), help="Repetible. Por defecto: ambas.")
+        parser.add_argument("--concurrencia", type=int, default=8, help="Hilos (WSGI) o tareas (ASGI).")
+        parser.add_argument("--duracion", type=float, default=10, help="Segundos medidos por app.")
+        parser.add_argument("--calentamiento", type=float, default=1, help="Segundos iniciales que no se cuentan.")
+        parser.add_argument("--semilla", type=int, default=0, help="Semilla de los datos y de la elección de rutas.")
+        parser.add_argument("--filas", type=int, default=30, help="Filas sintéticas por sección.")
+        parser.add_argument("--certificados", type=int, default=5, help="Certificados PDF (con miniatura).")
+        parser.add_argument(
+            "--ruta", action="append",
+            help="Ruta a pedir, p. ej. '/pdf/?sec=datos' (repetible). Por defecto: /, varias /pdf/ y /media/.",
+        )
+        parser.add_argument("--json", help="Guardar el resultado en este archivo.")
+        parser.add_argument("--comparar", help="JSON de una corrida anterior: muestra la diferencia de req/s y p95.")
+
+    def handle(self, *args, **options):
+        anterior = None
+        if options["comparar"]:
+            try:
+                anterior = json.loads(Path(options["comparar"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as error:
+                raise CommandError(f"No se pudo leer {options['comparar']}: {error}")
+
+        resultado = ejecutar(
+            options["app"] or sorted(APPS, reverse=True),  # wsgi primero
+            options["concurrencia"], options["duracion"], options["calentamiento"],
+            semilla=options["semilla"], filas=options["filas"], certificados=options["certificados"],
+            rutas=options["ruta"], informar=self.stdout.write,
+        )
+
+        for app, rutas in resultado["apps"].items():
+            self.stdout.write(f"\n{app}")
+            self.stdout.write(
+                f"  {'ruta':<48} {'req':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6}"
+            )
+            for ruta, datos in rutas.items():
+                linea = (
+                    f"  {ruta[:48]:<48} {datos['requests']:>6} {datos['rps']:>8} {datos['p50']:>8} "
+                    f"{datos['p95']:>8} {datos['p99']:>8} {datos['errores']:>6}"
+                )
+                previo = (anterior or {}).get("apps", {}).get(app, {}).get(ruta)
+                if previo:
+                    linea += f"   (req/s {_cambio(previo['rps'], datos['rps'])}, p95 {_cambio(previo['p95'], datos['p95'])})"
+                self.stdout.write(linea)
+
+        if anterior and anterior.get("parametros") != resultado["parametros"]:
+            self.stdout.write(self.style.WARNING("⚠️ La corrida anterior usó otros parámetros: no es comparable."))
+
+        if options["json"]:
+            Path(options["json"]).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+            self.stdout.write(f"\nResultado guardado en {options['json']}")
+
+        self.stdout.write(self.style.SUCCESS("✅ Prueba de carga terminada."))
+
+
+def _cambio(antes, ahora):
+    if not antes:
+        return "n/d"
+    return f"{(ahora - antes) / antes:+.0%}"
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from cv.busqueda import reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice full-text (FTS5 / tsvector) de todas las secciones del CV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=2000, help="Filas por bulk_create.")
+
+    def handle(self, *args, **options):
+        total = reconstruir_indice(lote=options["lote"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Índice reconstruido: {total} filas."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from cv.models import DatosPersonales
+from cv.snapshots import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el CVSnapshot (documento desnormalizado) de todos los perfiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--perfil", type=int, action="append", help="Solo este perfil (repetible).")
+
+    def handle(self, *args, **options):
+        ids = options["perfil"] or DatosPersonales.objects.order_by("idperfil").values_list("idperfil", flat=True)
+
+        total = 0
+        for idperfil in ids:
+            if reconstruir(idperfil) is not None:
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ Snapshots reconstruidos: {total}."))
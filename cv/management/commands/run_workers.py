@@ -0,0 +1,54 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+
+
+def _proceso(numero, tipos, una_vez, espera):
+    # Proceso hijo (spawn): arranca Django antes de tocar modelos
+    import django
+    django.setup()
+
+    from cv.trabajos import bucle_worker
+    bucle_worker(numero, tipos=tipos, una_vez=una_vez, espera=espera)
+
+
+class Command(BaseCommand):
+    help = "Levanta N procesos worker que ejecutan la cola de trabajos en BD (cv/trabajos.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--procesos", type=int, default=2)
+        parser.add_argument("--tipo", action="append", help="Solo estos tipos de trabajo (repetible).")
+        parser.add_argument("--una-vez", action="store_true", help="Vaciar la cola y terminar.")
+        parser.add_argument("--espera", type=float, default=1.0, help="Segundos entre sondeos con la cola vacía.")
+
+    def handle(self, *args, **options):
+        contexto = multiprocessing.get_context("spawn")
+        procesos = [
+            contexto.Process(
+                target=_proceso,
+                args=(i, options["tipo"], options["una_vez"], options["espera"]),
+                name=f"cv-worker-{i}",
+            )
+            for i in range(options["procesos"])
+        ]
+
+        for proc in procesos:
+            proc.start()
+        self.stdout.write(f"✅ {len(procesos)} workers en marcha (Ctrl+C para detener).")
+
+        def _reenviar(signum, frame):
+            for proc in procesos:
+                if proc.is_alive():
+                    proc.terminate()
+
+        signal.signal(signal.SIGTERM, _reenviar)
+        try:
+            for proc in procesos:
+                proc.join()
+        except KeyboardInterrupt:
+            # Los hijos ya recibieron SIGINT del terminal; esperamos que terminen su trabajo
+            for proc in procesos:
+                proc.join()
+
+        self.stdout.write(self.style.SUCCESS("Workers detenidos."))
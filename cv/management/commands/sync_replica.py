@@ -0,0 +1,43 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from cv.models import DatosPersonales
+from cv.routers import ALIAS_REPLICA
+from cv.snapshots import clave_version_contenido
+from cv.versiones import SECCIONES, incrementar_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la BD SQLite primaria a la réplica local (API de backup de SQLite, "
+        "consistente aunque haya escrituras en curso)."
+    )
+
+    def handle(self, *args, **options):
+        primario = settings.DATABASES["default"]
+        replica = settings.DATABASES.get(ALIAS_REPLICA)
+
+        if not replica:
+            raise CommandError("No hay alias 'replica' configurado (SQLITE_REPLICA).")
+        if "sqlite3" not in primario["ENGINE"] or "sqlite3" not in replica["ENGINE"]:
+            raise CommandError("sync_replica solo aplica a SQLite; en Postgres la réplica es del proveedor.")
+
+        origen = sqlite3.connect(str(primario["NAME"]))
+        destino = sqlite3.connect(str(replica["NAME"]))
+        try:
+            with destino:
+                origen.backup(destino)
+        finally:
+            destino.close()
+            origen.close()
+
+        # Los fragmentos renderizados con la réplica atrasada quedan invalidados
+        for idperfil in DatosPersonales.objects.values_list("idperfil", flat=True):
+            for seccion in SECCIONES:
+                incrementar_version(idperfil, seccion)
+            cache.delete(clave_version_contenido(idperfil))
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Réplica actualizada: {replica['NAME']}"))
@@ -0,0 +1,38 @@
+import time
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand
+
+from cv.arranque import PASOS, calentar
+
+
+class Command(BaseCommand):
+    help = (
+        "Precarga plantillas, métricas de fuentes y conexiones a la BD. "
+        "Con --url además golpea un despliegue en marcha para calentar sus workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--paso", action="append", choices=sorted(PASOS),
+            help="Paso a ejecutar (repetible). Por defecto: todos."
+        )
+        parser.add_argument("--url", help="URL base del despliegue, p. ej. https://mi-cv.onrender.com")
+        parser.add_argument("--veces", type=int, default=4, help="Requests por ruta (≈ número de workers).")
+
+    def handle(self, *args, **options):
+        for paso, ms in calentar(options["paso"]).items():
+            self.stdout.write(f"  {paso:<12} {ms} ms")
+
+        if options["url"]:
+            base = options["url"].rstrip("/")
+            for ruta in ("/", "/pdf/?sec=datos"):
+                for _ in range(options["veces"]):
+                    inicio = time.perf_counter()
+                    with urlopen(base + ruta, timeout=60) as r:
+                        r.read()
+                        estado = r.status
+                    ms = round((time.perf_counter() - inicio) * 1000, 1)
+                    self.stdout.write(f"  GET {ruta:<18} {estado} {ms} ms")
+
+        self.stdout.write(self.style.SUCCESS("✅ Warmup terminado."))
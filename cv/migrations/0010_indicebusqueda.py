@@ -0,0 +1,104 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS indicebusqueda_fts USING fts5(
+        titulo, contenido,
+        content='indicebusqueda', content_rowid='idindice',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicebusqueda_ai AFTER INSERT ON indicebusqueda BEGIN
+        INSERT INTO indicebusqueda_fts(rowid, titulo, contenido)
+        VALUES (new.idindice, new.titulo, new.contenido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicebusqueda_ad AFTER DELETE ON indicebusqueda BEGIN
+        INSERT INTO indicebusqueda_fts(indicebusqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.idindice, old.titulo, old.contenido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicebusqueda_au AFTER UPDATE ON indicebusqueda BEGIN
+        INSERT INTO indicebusqueda_fts(indicebusqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.idindice, old.titulo, old.contenido);
+        INSERT INTO indicebusqueda_fts(rowid, titulo, contenido)
+        VALUES (new.idindice, new.titulo, new.contenido);
+    END
+    """,
+]
+
+SQLITE_ELIMINAR = [
+    "DROP TRIGGER IF EXISTS indicebusqueda_au",
+    "DROP TRIGGER IF EXISTS indicebusqueda_ad",
+    "DROP TRIGGER IF EXISTS indicebusqueda_ai",
+    "DROP TABLE IF EXISTS indicebusqueda_fts",
+]
+
+POSTGRES_CREAR = [
+    """
+    ALTER TABLE indicebusqueda ADD COLUMN vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(contenido, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX indicebusqueda_vector_gin ON indicebusqueda USING GIN (vector)",
+]
+
+POSTGRES_ELIMINAR = [
+    "DROP INDEX IF EXISTS indicebusqueda_vector_gin",
+    "ALTER TABLE indicebusqueda DROP COLUMN IF EXISTS vector",
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def crear_indice_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _ejecutar(schema_editor, SQLITE_CREAR)
+    elif vendor == "postgresql":
+        _ejecutar(schema_editor, POSTGRES_CREAR)
+
+
+def eliminar_indice_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _ejecutar(schema_editor, SQLITE_ELIMINAR)
+    elif vendor == "postgresql":
+        _ejecutar(schema_editor, POSTGRES_ELIMINAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0009_alter_cursosrealizados_fechafin_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndiceBusqueda',
+            fields=[
+                ('idindice', models.BigAutoField(primary_key=True, serialize=False)),
+                ('seccion', models.CharField(max_length=30)),
+                ('idobjeto', models.IntegerField()),
+                ('titulo', models.CharField(max_length=250)),
+                ('contenido', models.TextField(blank=True, default='')),
+                ('perfil', models.ForeignKey(db_column='idperfilconqueestaactivo', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cv.datospersonales')),
+            ],
+            options={
+                'db_table': 'indicebusqueda',
+                'constraints': [models.UniqueConstraint(fields=('seccion', 'idobjeto'), name='indice_seccion_objeto_unico')],
+            },
+        ),
+        migrations.RunPython(crear_indice_fulltext, eliminar_indice_fulltext),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0010_indicebusqueda'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(fields=['perfil', 'valordelbien', 'idventagarage'], name='garage_perfil_valor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(fields=['perfil', 'estadoproducto', 'valordelbien', 'idventagarage'], name='garage_perfil_estado_idx'),
+        ),
+    ]
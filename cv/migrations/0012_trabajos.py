@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0011_ventagarage_indices_catalogo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trabajo',
+            fields=[
+                ('idtrabajo', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(max_length=60)),
+                ('argumentos', models.JSONField(blank=True, default=dict)),
+                ('clave', models.CharField(blank=True, max_length=200, null=True)),
+                ('prioridad', models.IntegerField(default=0)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('hecho', 'Hecho'), ('fallido', 'Fallido')], default='pendiente', max_length=10)),
+                ('intentos', models.IntegerField(default=0)),
+                ('max_intentos', models.IntegerField(default=5)),
+                ('ejecutar_despues', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueado_por', models.CharField(blank=True, max_length=100, null=True)),
+                ('bloqueado_en', models.DateTimeField(blank=True, null=True)),
+                ('progreso', models.IntegerField(default=0)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'trabajos',
+                'indexes': [models.Index(fields=['estado', '-prioridad', 'ejecutar_despues'], name='trabajo_cola_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado__in', ['pendiente', 'en_curso'])), fields=('clave',), name='trabajo_clave_viva_unica')],
+            },
+        ),
+    ]
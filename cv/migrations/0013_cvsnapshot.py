@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0012_trabajos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVSnapshot',
+            fields=[
+                ('perfil', models.OneToOneField(db_column='idperfil', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='cv.datospersonales')),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('documento', models.BinaryField()),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'cvsnapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0014_marcas_de_tiempo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cursosrealizados',
+            name='miniaturacertificado',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='certificados/miniaturas/'),
+        ),
+        migrations.AddField(
+            model_name='reconocimientos',
+            name='miniaturacertificado',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='certificados/miniaturas/'),
+        ),
+    ]
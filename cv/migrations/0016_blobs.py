@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-19 22:30
+
+import cv.blobs
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0015_miniaturas_certificado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('nombre', models.CharField(max_length=255, unique=True)),
+                ('tamano', models.PositiveBigIntegerField()),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('ultimo_uso', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'blob',
+            },
+        ),
+        migrations.AlterField(
+            model_name='cursosrealizados',
+            name='rutacertificado',
+            field=models.FileField(blank=True, null=True, storage=cv.blobs.almacenamiento_por_contenido, upload_to='certificados/cursos/'),
+        ),
+        migrations.AlterField(
+            model_name='experiencialaboral',
+            name='rutacertificado',
+            field=models.FileField(blank=True, null=True, storage=cv.blobs.almacenamiento_por_contenido, upload_to='certificados/experiencia/'),
+        ),
+        migrations.AlterField(
+            model_name='reconocimientos',
+            name='rutacertificado',
+            field=models.FileField(blank=True, null=True, storage=cv.blobs.almacenamiento_por_contenido, upload_to='certificados/reconocimientos/'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-19 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0016_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Perfilado',
+            fields=[
+                ('idperfilado', models.AutoField(primary_key=True, serialize=False)),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('metodo', models.CharField(max_length=8)),
+                ('ruta', models.CharField(max_length=500)),
+                ('estado', models.PositiveSmallIntegerField()),
+                ('usuario', models.CharField(max_length=150)),
+                ('secciones', models.CharField(blank=True, max_length=200)),
+                ('version_contenido', models.PositiveIntegerField(blank=True, null=True)),
+                ('duracion_ms', models.FloatField()),
+                ('memoria_pico_kb', models.PositiveIntegerField(blank=True, null=True)),
+                ('pstats', models.BinaryField()),
+                ('colapsado', models.TextField()),
+                ('memoria', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'perfilado',
+                'ordering': ['-idperfilado'],
+            },
+        ),
+    ]
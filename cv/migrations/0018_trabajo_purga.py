@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0017_perfilado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trabajo',
+            index=models.Index(fields=['estado', 'actualizado'], name='trabajo_purga_idx'),
+        ),
+    ]
@@ -0,0 +1,124 @@
+"""
+✅ Miniaturas de los certificados (cursos y reconocimientos) para cv.html.
+
+Antes la página solo enlazaba al archivo: para saber qué era un certificado
+había que descargar el PDF completo. Ahora un worker rasteriza la primera
+página (PDF con pypdfium2, o la imagen subida) a un WebP chico y cv.html lo
+muestra con ``loading="lazy"``; el enlace al original queda para quien lo quiera.
+
+- Al guardar una fila con certificado, la señal encola ``miniatura_certificado``.
+- El nombre sale del hash del contenido (el del nombre del blob, cv/blobs.py,
+  o cv/certificados.huella para subidas anteriores): si el archivo no cambió,
+  la miniatura ya existe y no se vuelve a generar.
+- ``python manage.py generar_miniaturas`` encola (o genera) las que falten.
+"""
+import io
+import logging
+
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+
+from .blobs import hash_de_nombre
+from .certificados import huella, ruta_local
+from .models import CursosRealizados, Reconocimientos
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - opcional, está en requirements.txt
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+MODELOS = {"cursos": CursosRealizados, "reconocimientos": Reconocimientos}
+
+# px de ancho: 2x de los 120 px con que se muestra (pantallas retina)
+ANCHO = 240
+CALIDAD_WEBP = 70
+CARPETA = "certificados/miniaturas/"
+
+
+def nombre_miniatura(contenido):
+    return f"{CARPETA}{contenido[:24]}-{ANCHO}.webp"
+
+
+def rasterizar(ruta):
+    """✅ Imagen (Pillow) de ``ANCHO`` px de la primera página, o None si no se puede."""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with open(ruta, "rb") as archivo:
+            es_pdf = archivo.read(5) == b"%PDF-"
+    except OSError:
+        logger.warning("certificado no encontrado, sin miniatura: %s", ruta)
+        return None
+
+    if es_pdf:
+        if pdfium is None:
+            logger.warning("miniaturas de PDF requieren pypdfium2, que no está instalado")
+            return None
+        try:
+            documento = pdfium.PdfDocument(ruta)
+        except pdfium.PdfiumError as error:
+            logger.warning("certificado ilegible, sin miniatura: %s (%s)", ruta, error)
+            return None
+        try:
+            pagina = documento[0]
+            return pagina.render(scale=ANCHO / pagina.get_width()).to_pil()
+        finally:
+            documento.close()
+
+    try:
+        with Image.open(ruta) as original:
+            # JPEG: el decodificador ya reduce 1/2, 1/4 u 1/8 al leer (mucho más rápido)
+            original.draft("RGB", (ANCHO, ANCHO * 2))
+            imagen = original.convert("RGB")
+    except (UnidentifiedImageError, OSError) as error:
+        logger.warning("certificado sin formato conocido, sin miniatura: %s (%s)", ruta, error)
+        return None
+    imagen.thumbnail((ANCHO, ANCHO * 2), Image.LANCZOS)
+    return imagen
+
+
+def generar(seccion, pk):
+    """
+    ✅ Deja al día ``miniaturacertificado`` de la fila y devuelve su nombre (o
+    None). Solo rasteriza si no existe ya la miniatura de ese contenido.
+    """
+    modelo = MODELOS[seccion]
+    fila = modelo.objects.filter(pk=pk).values_list("rutacertificado", "miniaturacertificado").first()
+    if fila is None:
+        return None
+    certificado, actual = fila
+
+    nombre = None
+    if certificado:
+        archivo = FieldFile(None, modelo._meta.get_field("rutacertificado"), certificado)
+        try:
+            nombre = nombre_miniatura(hash_de_nombre(certificado) or huella(ruta_local(archivo))[0])
+        except OSError:
+            logger.warning("certificado no encontrado, sin miniatura: %s", certificado)
+
+    almacenamiento = modelo._meta.get_field("miniaturacertificado").storage
+    if nombre and not almacenamiento.exists(nombre):
+        imagen = rasterizar(ruta_local(archivo))
+        if imagen is None:
+            nombre = None
+        else:
+            buffer = io.BytesIO()
+            imagen.save(buffer, "WEBP", quality=CALIDAD_WEBP, method=6)
+            buffer.seek(0)
+            nombre = almacenamiento.save(nombre, buffer)
+
+    if (nombre or None) != (actual or None):
+        # update(): sin señales (no se re-encola) pero reconstruye el snapshot
+        modelo.objects.filter(pk=pk).update(miniaturacertificado=nombre)
+    return nombre
+
+
+def programar(seccion, pk):
+    """✅ Llamado por las señales: encola la miniatura al confirmar la transacción."""
+    from .trabajos import encolar
+    transaction.on_commit(lambda: encolar(
+        "miniatura_certificado", {"seccion": seccion, "pk": pk},
+        clave=f"miniatura:{seccion}:{pk}", prioridad=-10,
+    ))
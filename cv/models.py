@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator, RegexValidator
 from django.db.models import Q, F
 
+from .blobs import almacenamiento_por_contenido
+
 
 # ===============================
 # ✅ VALIDADORES REUSABLES
@@ -27,10 +29,63 @@ def fecha_no_futura(value):
         raise ValidationError("La fecha no puede ser futura.")
 
 
+# ===============================
+# ✅ MARCAS DE TIEMPO + VERSIÓN DE CONTENIDO
+# ===============================
+class ContenidoQuerySet(models.QuerySet):
+    """
+    ✅ ``update()`` y ``bulk_create()`` no disparan señales: aquí se marca
+    ``actualizado`` y se reconstruye el snapshot de los perfiles tocados
+    (lo que sube su versión de contenido, ver cv/snapshots.py).
+    ``bulk_update()`` pasa por ``update()``.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault("actualizado", timezone.now())
+        campo = self.model.campo_perfil
+
+        perfiles = set(self.values_list(campo, flat=True))
+        nuevo = kwargs.get("perfil", kwargs.get("perfil_id"))
+        if nuevo is not None:
+            perfiles.add(getattr(nuevo, "pk", nuevo))
+
+        filas = super().update(**kwargs)
+        if filas:
+            _programar_snapshots(perfiles)
+        return filas
+
+    def bulk_create(self, objs, *args, **kwargs):
+        creados = super().bulk_create(objs, *args, **kwargs)
+        _programar_snapshots({getattr(obj, self.model.campo_perfil) for obj in creados})
+        return creados
+
+
+def _programar_snapshots(perfiles):
+    from .snapshots import programar
+
+    for idperfil in perfiles:
+        if idperfil is not None:
+            programar(idperfil)
+
+
+class ConMarcasDeTiempo(models.Model):
+    """✅ creado / actualizado en todas las tablas del CV."""
+    creado = models.DateTimeField(auto_now_add=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    # Columna con el id del perfil dueño de la fila
+    campo_perfil = "perfil_id"
+
+    objects = ContenidoQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+
 # ===============================
 # ✅ MODELO BASE (OBLIGA VALIDACIÓN)
 # ===============================
-class ValidatedModel(models.Model):
+class ValidatedModel(ConMarcasDeTiempo):
     """
     ✅ Fuerza validaciones siempre que uses .save()
     """
@@ -45,6 +100,8 @@ class ValidatedModel(models.Model):
 # ✅ DATOS PERSONALES
 # ===============================
 class DatosPersonales(ValidatedModel):
+    campo_perfil = "idperfil"
+
     idperfil = models.AutoField(primary_key=True)
     descripcionperfil = models.CharField(max_length=50)
     perfilactivo = models.IntegerField(default=1)
@@ -132,6 +189,7 @@ class ExperienciaLaboral(ValidatedModel):
 
     rutacertificado = models.FileField(
         upload_to="certificados/experiencia/",
+        storage=almacenamiento_por_contenido,
         blank=True,
         null=True
     )
@@ -193,7 +251,13 @@ class Reconocimientos(ValidatedModel):
     )
 
     activarparaqueseveaenfront = models.BooleanField(default=True)
-    rutacertificado = models.FileField(upload_to="certificados/reconocimientos/", blank=True, null=True)
+    rutacertificado = models.FileField(
+        upload_to="certificados/reconocimientos/", storage=almacenamiento_por_contenido, blank=True, null=True,
+    )
+    # ✅ Vista previa WebP de la primera página (cv/miniaturas.py, la genera un worker)
+    miniaturacertificado = models.FileField(
+        upload_to="certificados/miniaturas/", blank=True, null=True, editable=False,
+    )
 
     class Meta:
         db_table = "reconocimientos"
@@ -235,7 +299,13 @@ class CursosRealizados(ValidatedModel):
     emailempresapatrocinadora = models.CharField(max_length=60, blank=True, null=True)
 
     activarparaqueseveaenfront = models.BooleanField(default=True)
-    rutacertificado = models.FileField(upload_to="certificados/cursos/", blank=True, null=True)
+    rutacertificado = models.FileField(
+        upload_to="certificados/cursos/", storage=almacenamiento_por_contenido, blank=True, null=True,
+    )
+    # ✅ Vista previa WebP de la primera página (cv/miniaturas.py, la genera un worker)
+    miniaturacertificado = models.FileField(
+        upload_to="certificados/miniaturas/", blank=True, null=True, editable=False,
+    )
 
     def clean(self):
         # ✅ fin >= inicio
@@ -342,3 +412,196 @@ class VentaGarage(ValidatedModel):
                 name="garage_valor_gte_0"
             )
         ]
+        # ✅ Soportan el keyset (valordelbien, idventagarage) del catálogo
+        indexes = [
+            models.Index(
+                fields=["perfil", "valordelbien", "idventagarage"],
+                name="garage_perfil_valor_idx"
+            ),
+            models.Index(
+                fields=["perfil", "estadoproducto", "valordelbien", "idventagarage"],
+                name="garage_perfil_estado_idx"
+            ),
+        ]
+
+
+# ===============================
+# ✅ ÍNDICE DE BÚSQUEDA (FTS5 / tsvector)
+# ===============================
+class IndiceBusqueda(models.Model):
+    """
+    ✅ Una fila por registro visible de cada sección del CV.
+    El índice full-text real (FTS5 en SQLite, tsvector + GIN en Postgres)
+    se crea en la migración 0010 y se mantiene con señales (cv/signals.py).
+    """
+    idindice = models.BigAutoField(primary_key=True)
+
+    perfil = models.ForeignKey(
+        DatosPersonales,
+        on_delete=models.CASCADE,
+        db_column="idperfilconqueestaactivo",
+        related_name="+"
+    )
+
+    seccion = models.CharField(max_length=30)
+    idobjeto = models.IntegerField()
+    titulo = models.CharField(max_length=250)
+    contenido = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "indicebusqueda"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seccion", "idobjeto"],
+                name="indice_seccion_objeto_unico"
+            ),
+        ]
+
+
+# ===============================
+# ✅ COLA DE TRABAJOS EN BD (ver cv/trabajos.py)
+# ===============================
+class Trabajo(models.Model):
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    HECHO = "hecho"
+    FALLIDO = "fallido"
+
+    idtrabajo = models.BigAutoField(primary_key=True)
+
+    tipo = models.CharField(max_length=60)
+    argumentos = models.JSONField(default=dict, blank=True)
+
+    # Deduplicación: solo un trabajo vivo (pendiente / en curso) por clave
+    clave = models.CharField(max_length=200, blank=True, null=True)
+
+    # Mayor número = se ejecuta antes
+    prioridad = models.IntegerField(default=0)
+
+    estado = models.CharField(
+        max_length=10,
+        default=PENDIENTE,
+        choices=[
+            (PENDIENTE, "Pendiente"),
+            (EN_CURSO, "En curso"),
+            (HECHO, "Hecho"),
+            (FALLIDO, "Fallido"),
+        ]
+    )
+
+    intentos = models.IntegerField(default=0)
+    max_intentos = models.IntegerField(default=5)
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+
+    bloqueado_por = models.CharField(max_length=100, blank=True, null=True)
+    bloqueado_en = models.DateTimeField(blank=True, null=True)
+
+    progreso = models.IntegerField(default=0)
+    resultado = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, default="")
+
+    creado = models.DateTimeField(auto_now_add=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "trabajos"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["clave"],
+                condition=Q(estado__in=["pendiente", "en_curso"]),
+                name="trabajo_clave_viva_unica"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["estado", "-prioridad", "ejecutar_despues"],
+                name="trabajo_cola_idx"
+            ),
+            # Purga de terminados (cv/trabajos.purgar_terminados)
+            models.Index(fields=["estado", "actualizado"], name="trabajo_purga_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.idtrabajo} ({self.estado})"
+
+
+# ===============================
+# ✅ MODELO DE LECTURA DESNORMALIZADO (ver cv/snapshots.py)
+# ===============================
+class CVSnapshot(models.Model):
+    """
+    ✅ Todo lo visible de un perfil (datos + las seis secciones) en un solo
+    documento JSON comprimido. Las vistas lo leen por clave primaria en vez de
+    consultar siete tablas; las señales lo reconstruyen cuando algo cambia.
+    """
+    perfil = models.OneToOneField(
+        DatosPersonales,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column="idperfil",
+        related_name="+"
+    )
+
+    # Sube en cada reconstrucción
+    version = models.PositiveIntegerField(default=1)
+    documento = models.BinaryField()
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "cvsnapshot"
+
+    def __str__(self):
+        return f"Snapshot perfil {self.perfil_id} (v{self.version})"
+
+
+# ===============================
+# ✅ ARCHIVOS SUBIDOS POR CONTENIDO (ver cv/blobs.py)
+# ===============================
+class Blob(models.Model):
+    """✅ Un archivo subido por sha256: lo comparten todas las filas que suben el mismo contenido."""
+    hash = models.CharField(max_length=64, primary_key=True)
+    nombre = models.CharField(max_length=255, unique=True)
+    tamano = models.PositiveBigIntegerField()
+
+    # Filas que lo usan (las señales lo mantienen; gc_blobs recuenta todo)
+    referencias = models.PositiveIntegerField(default=0)
+    # Última subida que lo creó o reutilizó (periodo de gracia del GC)
+    ultimo_uso = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = "blob"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias} ref.)"
+
+
+# ===============================
+# ✅ PERFILADO A PEDIDO (ver cv/perfilado.py)
+# ===============================
+class Perfilado(models.Model):
+    """✅ cProfile (y tracemalloc) de un request pedido por un admin con ?_perfil=."""
+    idperfilado = models.AutoField(primary_key=True)
+    creado = models.DateTimeField(auto_now_add=True)
+
+    metodo = models.CharField(max_length=8)
+    ruta = models.CharField(max_length=500)
+    estado = models.PositiveSmallIntegerField()
+    usuario = models.CharField(max_length=150)
+
+    # Lo que define el render: secciones pedidas y versión de contenido del perfil
+    secciones = models.CharField(max_length=200, blank=True)
+    version_contenido = models.PositiveIntegerField(blank=True, null=True)
+
+    duracion_ms = models.FloatField()
+    memoria_pico_kb = models.PositiveIntegerField(blank=True, null=True)
+
+    pstats = models.BinaryField()      # formato de dump_stats (snakeviz, pstats)
+    colapsado = models.TextField()     # pilas colapsadas (flamegraph.pl, speedscope)
+    memoria = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "perfilado"
+        ordering = ["-idperfilado"]
+
+    def __str__(self):
+        return f"{self.metodo} {self.ruta} ({self.duracion_ms:.0f} ms)"
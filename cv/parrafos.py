@@ -0,0 +1,167 @@
+"""
+✅ Cortes de línea para el PDF (texto alineado a la izquierda).
+
+Antes cada palabra se probaba midiendo de nuevo el prefijo completo de la
+línea (``stringWidth(linea + " " + palabra)``) y se cortaba en cuanto no
+cabía (voraz): líneas muy desparejas y mucha medición repetida.
+
+Aquí:
+
+1. Cada palabra se divide en sílabas con Pyphen (diccionario "es" cargado una
+   vez por proceso, resultado memorizado por palabra).
+2. El ancho de cada fragmento se mide una sola vez (memorizado por fuente y tamaño);
+   las fuentes estándar de ReportLab no tienen kerning, así que los anchos se suman.
+3. Un corte óptimo estilo Knuth–Plass elige dónde terminar cada línea
+   minimizando la suma de (espacio sobrante)² más una penalización por guion
+   (y otra si dos líneas seguidas terminan en guion). La última línea no paga.
+   Como los anchos solo crecen hacia atrás, cada corte mira únicamente los
+   inicios que caben en una línea: tiempo lineal en la práctica.
+"""
+from functools import lru_cache
+
+import pyphen
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Palabras más cortas no se dividen
+MINIMO_PARA_DIVIDIR = 6
+
+# Penalizaciones en unidades de (sobrante / ancho)²: cortar una palabra cuesta
+# como dejar ~40% de la línea vacía; dos guiones seguidos, ~25% más
+PENALIZACION_GUION = 0.16
+PENALIZACION_GUIONES_SEGUIDOS = 0.06
+
+# Líneas con más sobrante que esto solo se usan si no hay otra opción
+TOLERANCIA = 0.25
+
+INFINITO = float("inf")
+FORZADO = 1e6
+
+
+@lru_cache(maxsize=1)
+def diccionario():
+    """✅ Diccionario de guionado español (se carga una vez por proceso)."""
+    return pyphen.Pyphen(lang="es")
+
+
+@lru_cache(maxsize=20000)
+def silabas(palabra):
+    """
+    Fragmentos en los que se puede cortar ``palabra`` (con su puntuación pegada):
+    "funciones," -> ("fun", "cio", "nes,").
+    """
+    inicio = 0
+    while inicio < len(palabra) and not palabra[inicio].isalpha():
+        inicio += 1
+    fin = len(palabra)
+    while fin > inicio and not palabra[fin - 1].isalpha():
+        fin -= 1
+
+    nucleo = palabra[inicio:fin]
+    if len(nucleo) < MINIMO_PARA_DIVIDIR or not nucleo.isalpha():
+        return (palabra,)
+
+    cortes = [inicio + p for p in diccionario().positions(nucleo)]
+    limites = [0, *cortes, len(palabra)]
+    return tuple(palabra[a:b] for a, b in zip(limites, limites[1:]))
+
+
+@lru_cache(maxsize=256)
+def ancho(texto, fuente, tamano):
+    return stringWidth(texto, fuente, tamano)
+
+
+@lru_cache(maxsize=50000)
+def medidas(palabra, fuente, tamano):
+    """(sílabas, anchos) de la palabra: se mide una vez por fuente y tamaño."""
+    partes = silabas(palabra)
+    return partes, tuple(stringWidth(parte, fuente, tamano) for parte in partes)
+
+
+@lru_cache(maxsize=1024)
+def cortar_lineas(texto, fuente, tamano, ancho_maximo):
+    """
+    ✅ Líneas (con "-" al final si se cortó una palabra) que mejor llenan
+    ``ancho_maximo``. Memorizado: las tarjetas del PDF cuentan las líneas y
+    después las dibujan con la misma llamada.
+    """
+    palabras = str(texto or "").split()
+    if not palabras:
+        return ()
+
+    espacio = ancho(" ", fuente, tamano)
+    guion = ancho("-", fuente, tamano)
+
+    # fragmentos, empieza[i] (el fragmento i abre una palabra) y
+    # acumulado[i]: ancho de los fragmentos 0..i-1 con los espacios entre palabras
+    fragmentos, empieza, acumulado = [], [], [0.0]
+    total = -espacio
+    for palabra in palabras:
+        partes, anchos = medidas(palabra, fuente, tamano)
+        total += espacio
+        for j, (parte, w) in enumerate(zip(partes, anchos)):
+            fragmentos.append(parte)
+            empieza.append(j == 0)
+            total += w
+            acumulado.append(total)
+    n = len(fragmentos)
+    empieza.append(True)
+
+    if total <= ancho_maximo:
+        return (" ".join(palabras),)
+
+    costo = [INFINITO] * (n + 1)
+    previo = [0] * (n + 1)
+    costo[0] = 0.0
+    escala = ancho_maximo * ancho_maximo
+    tolerancia = TOLERANCIA * ancho_maximo
+    primero = 0  # primer inicio que todavía puede caber
+
+    for fin in range(1, n + 1):
+        con_guion = not empieza[fin]
+        extra = guion if con_guion else 0.0
+        tope = acumulado[fin] + extra
+
+        # Inicios cuya línea cabe: [primero, fin), y solo crecen con fin
+        while primero < fin - 1:
+            sangria = espacio if empieza[primero] and primero else 0.0
+            if tope - acumulado[primero] - sangria <= ancho_maximo:
+                break
+            primero += 1
+
+        mejor, desde = INFINITO, primero
+        for inicio in range(primero, fin):
+            ancho_linea = tope - acumulado[inicio]
+            if empieza[inicio] and inicio:
+                ancho_linea -= espacio
+            sobrante = ancho_maximo - ancho_linea
+
+            if sobrante < 0:
+                # Un fragmento más ancho que la línea va solo (como antes)
+                demerito = FORZADO
+            elif fin == n:
+                demerito = 0.0
+            elif sobrante > tolerancia and mejor < INFINITO:
+                break  # de aquí en adelante las líneas solo quedan más vacías
+            else:
+                demerito = sobrante * sobrante / escala
+                if con_guion:
+                    demerito += PENALIZACION_GUION + (PENALIZACION_GUIONES_SEGUIDOS if not empieza[inicio] else 0.0)
+
+            total = costo[inicio] + demerito
+            if total < mejor:
+                mejor, desde = total, inicio
+
+        costo[fin], previo[fin] = mejor, desde
+
+    lineas = []
+    fin = n
+    while fin > 0:
+        inicio = previo[fin]
+        linea = ""
+        for i in range(inicio, fin):
+            linea += (" " if empieza[i] and linea else "") + fragmentos[i]
+        if not empieza[fin]:
+            linea += "-"
+        lineas.append(linea)
+        fin = inicio
+    return tuple(reversed(lineas))
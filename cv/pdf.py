@@ -0,0 +1,346 @@
+"""
+✅ Dibujo del CV en PDF con ReportLab.
+
+Se importa de forma perezosa desde cv_pdf: los workers que solo sirven la
+página HTML nunca pagan el costo de importar ReportLab.
+"""
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+from .calidad_pdf import CALIDADES, nombre_calidad
+from .parrafos import cortar_lineas
+
+
+ORDEN_SECCIONES = (
+    "datos", "experiencia", "cursos", "reconocimientos",
+    "prod_academicos", "prod_laborales", "garage",
+)
+
+
+def resumen_estadisticas(estadisticas, secciones):
+    """Una línea con las cifras de las secciones pedidas ("" si no hay ninguna)."""
+    if not estadisticas:
+        return ""
+    partes = []
+    if "experiencia" in secciones and estadisticas.anios_experiencia:
+        partes.append(f"{estadisticas.anios_experiencia:g} años de experiencia")
+    if "cursos" in secciones and estadisticas.horas_cursos:
+        partes.append(f"{estadisticas.horas_cursos} horas de cursos")
+    if "reconocimientos" in secciones:
+        tipos = ", ".join(f"{t} {n}" for t, n in estadisticas.reconocimientos.items() if n)
+        if tipos:
+            partes.append(f"Reconocimientos: {tipos}")
+    if "garage" in secciones and estadisticas.productos_garage:
+        partes.append(
+            f"Garage: {estadisticas.productos_garage} productos (${estadisticas.valor_garage})"
+        )
+    return "  ·  ".join(partes)
+
+
+def dibujar_cv(salida, perfil, secciones, experiencia, cursos, reconocimientos,
+               productos_academicos, productos_laborales, garage, estadisticas=None,
+               calidad=None, invariante=False, progreso=None):
+    """
+    ✅ Escribe el PDF en ``salida`` (HttpResponse o cualquier archivo binario).
+    ``estadisticas`` (cv/estadisticas.py) va al encabezado, solo las cifras de
+    las secciones pedidas (la clave de caché del PDF depende solo de esas).
+    ``invariante`` fija fecha e ID del documento: mismo contenido, mismos bytes.
+    ``progreso(fraccion)`` se llama al terminar cada sección pedida (0..1).
+    ``calidad`` (cv/calidad_pdf.py): compresión de páginas.
+    """
+    calidad = calidad or CALIDADES[nombre_calidad()]
+    p = canvas.Canvas(
+        salida, pagesize=letter, invariant=int(invariante), pageCompression=calidad.compresion_paginas,
+    )
+    width, height = letter
+
+    # Márgenes
+    x_left = 2 * cm
+    x_right = width - 2 * cm
+    y = height - 2 * cm
+
+    pedidas = [s for s in ORDEN_SECCIONES if s in secciones]
+    hechas = 0
+
+    
+    # Funciones de apoyo
+
+    def avanzar(seccion):
+        nonlocal hechas
+        if progreso and seccion in pedidas:
+            hechas += 1
+            progreso(hechas / len(pedidas))
+
+    def nueva_pagina_si_es_necesario():
+        nonlocal y
+        if y < 3 * cm:
+            p.showPage()
+            y = height - 2 * cm
+
+    def draw_section_title(text):
+        """
+        ✅ Título de sección y línea separada correctamente (NO roza el texto)
+        """
+        nonlocal y
+        nueva_pagina_si_es_necesario()
+
+        # Aire arriba (para que no se pegue a la tarjeta anterior)
+        y -= 0.15 * cm
+
+        #  Título
+        p.setFillColor(colors.HexColor("#1f2937"))
+        p.setFont("Helvetica-Bold", 12)
+        p.drawString(x_left, y, text.upper())
+
+        # bajar un poquito para que NO roce
+        y -= 0.55 * cm
+
+        #  Línea abajo (NO en datos personales si no quieres)
+        if text.lower() != "datos personales":
+            p.setStrokeColor(colors.HexColor("#1f2937"))
+            p.setLineWidth(1)
+            p.line(x_left, y, x_right, y)
+
+        # bajar un poquito para empezar tarjetas/texto
+        y -= 0.45 * cm
+
+    def draw_wrapped_text(text, font="Helvetica", size=10, leading=16, max_width=None):
+        """
+        ✅ Texto con salto de línea automático
+        """
+        nonlocal y
+        if not text:
+            return
+
+        if max_width is None:
+            max_width = x_right - x_left
+
+        p.setFont(font, size)
+        p.setFillColor(colors.black)
+
+        #  Cortes óptimos con guionado (cv/parrafos.py)
+        for line in cortar_lineas(str(text), font, size, max_width):
+            nueva_pagina_si_es_necesario()
+            p.drawString(x_left, y, line)
+            y -= leading
+
+        y -= 4  # aire
+
+    def draw_card(title, subtitle=None, body=None):
+        """
+        ✅ Tarjeta gris que cubre TODO el texto
+        """
+        nonlocal y
+        nueva_pagina_si_es_necesario()
+
+        padding = 12
+        leading = 12
+        text_width = (x_right - x_left - 2 * padding)
+
+        def contar_lineas(texto, font="Helvetica", size=9, max_width=text_width):
+            # Misma llamada (memorizada) que al dibujar el cuerpo
+            return len(cortar_lineas(str(texto), font, size, max_width)) if texto else 0
+
+        # altura real
+        card_height = 10
+        card_height += 16  # título
+
+        if subtitle:
+            card_height += 13
+
+        if body:
+            lineas_body = contar_lineas(body, font="Helvetica", size=9)
+            card_height += (lineas_body * leading)
+
+        card_height += 14
+
+        #  dibujar tarjeta
+        p.setFillColor(colors.HexColor("#F3F4F6"))
+        p.setStrokeColor(colors.HexColor("#D1D5DB"))
+        p.roundRect(
+            x_left, y - card_height,
+            x_right - x_left, card_height,
+            10, fill=1, stroke=1
+        )
+
+        text_y = y - 20
+
+        p.setFillColor(colors.HexColor("#111827"))
+        p.setFont("Helvetica-Bold", 11)
+        p.drawString(x_left + padding, text_y, str(title))
+        text_y -= 14
+
+        if subtitle:
+            p.setFillColor(colors.HexColor("#374151"))
+            p.setFont("Helvetica", 9)
+            p.drawString(x_left + padding, text_y, str(subtitle))
+            text_y -= 12
+
+        if body:
+            p.setFillColor(colors.black)
+            p.setFont("Helvetica", 9)
+
+            for linea in cortar_lineas(str(body), "Helvetica", 9, text_width):
+                p.drawString(x_left + padding, text_y, linea)
+                text_y -= leading
+
+        y -= (card_height + 14)
+
+    
+    # Encabezado con foto
+    
+    if not perfil:
+        p.setFont("Helvetica-Bold", 14)
+        p.drawString(x_left, y, "No existe un perfil activo.")
+        p.showPage()
+        p.save()
+        return
+
+    #  Foto más grande + buena posición
+    foto_size = 3.6 * cm
+    foto_x = x_right - foto_size - 0.6 * cm
+    foto_y = height - 5.0 * cm
+
+    if hasattr(perfil, "fotoperfil") and perfil.fotoperfil:
+        try:
+            p.drawImage(perfil.fotoperfil.path, foto_x, foto_y,
+                        width=foto_size, height=foto_size, mask="auto")
+        except:
+            pass
+
+    # Nombre
+    p.setFillColor(colors.HexColor("#111827"))
+    p.setFont("Helvetica-Bold", 18)
+    p.drawString(x_left, y, f"{perfil.nombres} {perfil.apellidos}")
+    y -= 22
+
+    #  Descripción
+    p.setFillColor(colors.HexColor("#4b5563"))
+    p.setFont("Helvetica", 11)
+    p.drawString(x_left, y, perfil.descripcionperfil)
+    y -= 25
+
+    #  Resumen en cifras
+    resumen = resumen_estadisticas(estadisticas, secciones)
+    if resumen:
+        p.setFillColor(colors.HexColor("#374151"))
+        p.setFont("Helvetica", 9)
+        p.drawString(x_left, y + 8, resumen)
+        y -= 10
+
+    
+    # Datos personales
+    
+    if "datos" in secciones:
+        draw_section_title("Datos personales")
+        draw_wrapped_text(f"Cédula: {perfil.numerocedula}", size=10)
+        draw_wrapped_text(f"Nacionalidad: {perfil.nacionalidad}", size=10)
+        draw_wrapped_text(f"Dirección: {perfil.direcciondomiciliaria}", size=10)
+
+    avanzar("datos")
+
+    
+    # Experiencia
+    
+    if "experiencia" in secciones:
+        draw_section_title("Experiencia laboral")
+        if experiencia:
+            for e in experiencia:
+                draw_card(
+                    title=f"{e.cargodesempenado} - {e.nombrempresa}",
+                    subtitle=e.lugarempresa,
+                    body=e.descripcionfunciones
+                )
+        else:
+            draw_card("No hay experiencia registrada.")
+
+    avanzar("experiencia")
+
+    
+    # Cursos
+    
+    if "cursos" in secciones:
+        draw_section_title("Cursos realizados")
+        if cursos:
+            for c in cursos:
+                draw_card(
+                    title=f"{c.nombrecurso} ({c.totalhoras} horas)",
+                    subtitle=f"{c.fechainicio} - {c.fechafin}",
+                    body=c.descripcioncurso
+                )
+        else:
+            draw_card("No hay cursos registrados.")
+
+    avanzar("cursos")
+
+    
+    # Reconocimientos
+    
+    if "reconocimientos" in secciones:
+        draw_section_title("Reconocimientos")
+        if reconocimientos:
+            for r in reconocimientos:
+                draw_card(
+                    title=f"{r.tiporeconocimiento}: {r.descripcionreconocimiento}",
+                    subtitle=r.entidadpatrocinadora,
+                    body=""
+                )
+        else:
+            draw_card("No hay reconocimientos registrados.")
+
+    avanzar("reconocimientos")
+
+    
+    # Productos académicos
+
+    if "prod_academicos" in secciones:
+        draw_section_title("Productos académicos")
+        if productos_academicos:
+            for pa in productos_academicos:
+                draw_card(
+                    title=pa.nombrerecurso,
+                    subtitle=pa.clasificador,
+                    body=pa.descripcion
+                )
+        else:
+            draw_card("No hay productos académicos registrados.")
+
+    avanzar("prod_academicos")
+
+    
+    # Productos laborales
+    
+    if "prod_laborales" in secciones:
+        draw_section_title("Productos laborales")
+        if productos_laborales:
+            for pl in productos_laborales:
+                draw_card(
+                    title=pl.nombreproducto,
+                    subtitle=str(pl.fechaproducto),
+                    body=pl.descripcion
+                )
+        else:
+            draw_card("No hay productos laborales registrados.")
+
+    avanzar("prod_laborales")
+
+    
+    # Venta de garage
+    
+    if "garage" in secciones:
+        draw_section_title("Venta de garage")
+        if garage:
+            for g in garage:
+                draw_card(
+                    title=f"{g.nombreproducto} - ${g.valordelbien}",
+                    subtitle=f"Estado: {g.estadoproducto}",
+                    body=g.descripcion
+                )
+        else:
+            draw_card("No hay productos disponibles en garage.")
+    avanzar("garage")
+
+    p.showPage()
+    p.save()
@@ -0,0 +1,192 @@
+"""
+✅ Perfilado a pedido de un request puntual (cProfile y, opcional, tracemalloc).
+
+Un admin con sesión (``is_staff``) agrega ``?_perfil=cpu`` o la cabecera
+``X-CV-Perfil: cpu`` a cualquier URL del sitio (p. ej. el /pdf/ lento de un
+perfil). Opciones, separadas por coma:
+
+- ``cpu``:      solo cProfile
+- ``memoria``:  además tracemalloc (pico y las líneas que más asignan)
+- ``frio``:     ignora la caché de página/PDF y los If-None-Match, para medir el render
+
+El resultado queda en ``Perfilado`` (admin: /admin/cv/perfilado/) con las
+secciones pedidas y la versión de contenido: el .pstats (snakeviz, pstats) y
+las pilas colapsadas por muestreo (.folded, para flamegraph.pl o speedscope).
+La respuesta lleva ``X-CV-Perfil: <id>``. Para cualquier otro usuario el
+parámetro se ignora.
+"""
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PARAMETRO = "_perfil"
+CABECERA = "HTTP_X_CV_PERFIL"
+OPCIONES = {"cpu", "memoria", "frio"}
+
+# Muestreo de pilas: cada 1 ms (con el switch interval de la GIL bajado a la
+# par mientras dura el perfilado); las más profundas se cortan
+INTERVALO = 0.001
+PROFUNDIDAD_MAXIMA = 120
+LINEAS_MEMORIA = 30
+
+# cProfile y tracemalloc son globales al proceso: un perfilado a la vez
+_candado = threading.Lock()
+
+
+def opciones_pedidas(request):
+    crudo = request.GET.get(PARAMETRO) or request.META.get(CABECERA) or ""
+    return {o.strip() for o in crudo.lower().split(",")} & OPCIONES
+
+
+def _etiqueta(codigo):
+    return f"{codigo.co_name} ({codigo.co_filename.rsplit('/', 1)[-1]}:{codigo.co_firstlineno})"
+
+
+class Muestreador(threading.Thread):
+    """
+    ✅ Pilas colapsadas ("a;b;c microsegundos" por línea) del hilo del request,
+    muestreando su pila cada ``INTERVALO`` s. cProfile solo guarda aristas
+    llamador -> llamado (y los wrappers de middleware de Django comparten
+    código, así que el grafo es recursivo): las pilas reales salen de aquí.
+    """
+
+    def __init__(self, hilo, desde):
+        super().__init__(daemon=True)
+        self.hilo = hilo
+        self.desde = desde  # código del frame donde empieza el request (se omite lo de arriba)
+        self.pilas = Counter()
+        self.detener = threading.Event()
+
+    def run(self):
+        while not self.detener.wait(INTERVALO):
+            marco = sys._current_frames().get(self.hilo)
+            pila = []
+            while marco is not None and marco.f_code is not self.desde:
+                pila.append(_etiqueta(marco.f_code))
+                marco = marco.f_back
+            if pila and marco is not None:
+                self.pilas[";".join(reversed(pila[:PROFUNDIDAD_MAXIMA]))] += 1
+
+    def colapsado(self):
+        microsegundos = round(INTERVALO * 1e6)
+        return "".join(f"{pila} {n * microsegundos}\n" for pila, n in sorted(self.pilas.items()))
+
+
+class _Guardado:
+    # pstats.Stats acepta cualquier objeto con create_stats() y .stats
+    def __init__(self, estadisticas):
+        self.stats = estadisticas
+
+    def create_stats(self):
+        pass
+
+
+def resumen(blob, orden="cumulative", lineas=40):
+    """Texto de pstats (las ``lineas`` funciones más caras) de un .pstats guardado."""
+    salida = io.StringIO()
+    pstats.Stats(_Guardado(marshal.loads(blob)), stream=salida).sort_stats(orden).print_stats(lineas)
+    return salida.getvalue()
+
+
+def _resumen_memoria(instantanea):
+    lineas = []
+    for estadistica in instantanea.statistics("lineno")[:LINEAS_MEMORIA]:
+        marco = estadistica.traceback[0]
+        lineas.append(
+            f"{estadistica.size / 1024:>10.1f} KiB {estadistica.count:>8} bloques  {marco.filename}:{marco.lineno}"
+        )
+    return "\n".join(lineas)
+
+
+def _guardar(request, response, perfil, muestreador, duracion, memoria):
+    from .models import Perfilado
+
+    perfil.create_stats()
+    contenido = getattr(request, "_cv_contenido", None)  # memorizado por las vistas del CV
+    registro = Perfilado.objects.create(
+        metodo=request.method,
+        ruta=request.get_full_path()[:500],
+        estado=response.status_code,
+        usuario=request.user.get_username(),
+        secciones=",".join(sorted(request.GET.getlist("sec")))[:200],
+        version_contenido=contenido.version if contenido else None,
+        duracion_ms=round(duracion * 1000, 2),
+        memoria_pico_kb=memoria[0] if memoria else None,
+        memoria=memoria[1] if memoria else "",
+        pstats=marshal.dumps(perfil.stats),
+        colapsado=muestreador.colapsado(),
+    )
+    viejos = Perfilado.objects.order_by("-idperfilado").values_list("idperfilado", flat=True)[
+        settings.CV_PERFILADOS_MAXIMO:
+    ]
+    Perfilado.objects.filter(idperfilado__in=list(viejos)).delete()
+    return registro
+
+
+class PerfiladoMiddleware:
+    """✅ Va después de AuthenticationMiddleware (necesita ``request.user``)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Sin el parámetro no se toca request.user (evita leer la sesión)
+        opciones = opciones_pedidas(request) if (PARAMETRO in request.GET or CABECERA in request.META) else set()
+        if not opciones or not (request.user.is_active and request.user.is_staff):
+            return self.get_response(request)
+
+        if not _candado.acquire(blocking=False):
+            response = self.get_response(request)
+            response["X-CV-Perfil"] = "ocupado"
+            return response
+
+        try:
+            if "frio" in opciones:
+                request.cv_sin_cache = True  # cv/compresion.con_variantes_comprimidas
+                request.META.pop("HTTP_IF_NONE_MATCH", None)
+                request.META.pop("HTTP_IF_MODIFIED_SINCE", None)
+
+            memoria = None
+            trazando = "memoria" in opciones and not tracemalloc.is_tracing()
+            if trazando:
+                tracemalloc.start(25)
+
+            muestreador = Muestreador(threading.get_ident(), PerfiladoMiddleware.__call__.__code__)
+            cambio_de_hilo = sys.getswitchinterval()
+            sys.setswitchinterval(INTERVALO)
+            muestreador.start()
+
+            perfil = cProfile.Profile()
+            inicio = time.perf_counter()
+            perfil.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                perfil.disable()
+                duracion = time.perf_counter() - inicio
+                muestreador.detener.set()
+                muestreador.join()
+                sys.setswitchinterval(cambio_de_hilo)
+                if trazando:
+                    pico = tracemalloc.get_traced_memory()[1]
+                    memoria = (pico // 1024, _resumen_memoria(tracemalloc.take_snapshot()))
+                    tracemalloc.stop()
+
+            registro = _guardar(request, response, perfil, muestreador, duracion, memoria)
+        finally:
+            _candado.release()
+
+        response["X-CV-Perfil"] = str(registro.pk)
+        logger.info("perfilado %s: %s %.1f ms", registro.pk, registro.ruta, registro.duracion_ms)
+        return response
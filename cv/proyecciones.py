@@ -0,0 +1,108 @@
+"""
+✅ Proyección de columnas: de cada sección solo salen de la BD los campos que
+la salida (HTML o PDF) realmente dibuja.
+
+Cada fila es una namedtuple (tupla en C, sin ``__dict__`` ni estado de modelo)
+en lugar de una instancia completa: ExperienciaLaboral, por ejemplo, trae
+contactos, teléfonos, emails y rutas de certificado que nunca se muestran.
+Si una plantilla o ``dibujar_cv`` empieza a usar otro campo, hay que agregarlo
+aquí (si no, la plantilla lo verá vacío y el PDF fallará con AttributeError).
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from django.utils.functional import cached_property
+
+from .models import (
+    ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage
+)
+
+
+CAMPOS = {
+    # cv.html / garage_items.html
+    "html": {
+        ExperienciaLaboral: ("cargodesempenado", "nombrempresa", "descripcionfunciones"),
+        CursosRealizados: (
+            "nombrecurso", "totalhoras", "descripcioncurso", "rutacertificado", "miniaturacertificado",
+        ),
+        Reconocimientos: (
+            "tiporeconocimiento", "descripcionreconocimiento", "entidadpatrocinadora",
+            "rutacertificado", "miniaturacertificado",
+        ),
+        ProductosAcademicos: ("nombrerecurso", "clasificador", "descripcion"),
+        ProductosLaborales: ("nombreproducto", "fechaproducto", "descripcion"),
+        VentaGarage: ("nombreproducto", "valordelbien", "estadoproducto", "descripcion"),
+    },
+    # cv/pdf.py (dibujar_cv)
+    "pdf": {
+        ExperienciaLaboral: ("cargodesempenado", "nombrempresa", "lugarempresa", "descripcionfunciones"),
+        CursosRealizados: ("nombrecurso", "totalhoras", "fechainicio", "fechafin", "descripcioncurso"),
+        Reconocimientos: ("tiporeconocimiento", "descripcionreconocimiento", "entidadpatrocinadora"),
+        ProductosAcademicos: ("nombrerecurso", "clasificador", "descripcion"),
+        ProductosLaborales: ("nombreproducto", "fechaproducto", "descripcion"),
+        VentaGarage: ("nombreproducto", "valordelbien", "estadoproducto", "descripcion"),
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def tipo_fila(modelo, formato):
+    """(clase de fila, columnas, [(posición, campo)] de los FileField)."""
+    pk = modelo._meta.pk.name
+    columnas = (pk,) + tuple(c for c in CAMPOS[formato][modelo] if c != pk)
+    archivos = [
+        (i, modelo._meta.get_field(c)) for i, c in enumerate(columnas)
+        if isinstance(modelo._meta.get_field(c), FileField)
+    ]
+    return namedtuple(f"{modelo.__name__}{formato.title()}", columnas), columnas, archivos
+
+
+def filas(qs, formato):
+    """✅ Evalúa el queryset con solo las columnas del formato y devuelve filas livianas."""
+    clase, columnas, archivos = tipo_fila(qs.model, formato)
+    crudas = qs.values_list(*columnas)
+    if not archivos:
+        return list(map(clase._make, crudas))
+
+    resultado = []
+    for cruda in crudas:
+        cruda = list(cruda)
+        for i, campo in archivos:
+            # FieldFile sin instancia: alcanza para {% if %} y .url
+            cruda[i] = FieldFile(None, campo, cruda[i]) if cruda[i] else None
+        resultado.append(clase._make(cruda))
+    return resultado
+
+
+class Seccion:
+    """
+    ✅ Filas de una sección, perezosas como un queryset: si el fragmento de la
+    plantilla viene de caché, nunca se construyen.
+    """
+
+    def __init__(self, cargar):
+        self.cargar = cargar
+
+    @cached_property
+    def _filas(self):
+        return self.cargar()
+
+    def __iter__(self):
+        return iter(self._filas)
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __bool__(self):
+        return bool(self._filas)
+
+
+def visibles(modelo, perfil):
+    """Filas del perfil marcadas para verse en el front (el garage sin lo vendido)."""
+    qs = modelo.objects.filter(perfil=perfil, activarparaqueseveaenfront=True)
+    if modelo is VentaGarage:
+        qs = qs.exclude(estadoproducto="Vendido")
+    return qs
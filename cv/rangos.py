@@ -0,0 +1,101 @@
+"""
+✅ Respuestas parciales (``Range`` / ``206``) para los PDFs.
+
+Los visores de PDF del navegador piden el archivo por trozos cuando el
+servidor anuncia ``Accept-Ranges: bytes``; con el PDF linealizado
+(cv/linealizado.py) muestran la primera página con el primer trozo.
+
+Solo se atiende UN rango por request (para varios se responde el archivo
+completo, como permite el RFC 9110) y siempre sobre la variante sin comprimir:
+los rangos se cuentan sobre los bytes de la representación enviada. Con
+``CV_PDF_LINEALIZADO`` (cuyos streams ya van comprimidos) se sirve siempre sin
+Content-Encoding, para que el visor vea ``Accept-Ranges`` desde el primer request.
+"""
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe
+
+_RANGO = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parsear_rango(cabecera, largo):
+    """
+    ✅ (inicio, fin) inclusivos del rango pedido, None si la cabecera no aplica
+    (ausente, inválida o con varios rangos) y ValueError si no se puede satisfacer.
+    """
+    coincidencia = _RANGO.match((cabecera or "").strip())
+    if not coincidencia:
+        return None
+    inicio, fin = coincidencia.groups()
+    if largo == 0:
+        raise ValueError("cuerpo vacío: ningún rango se puede satisfacer")
+
+    if not inicio:
+        # bytes=-N: los últimos N bytes
+        if not fin:
+            return None
+        sufijo = int(fin)
+        if sufijo == 0:
+            raise ValueError("rango vacío")
+        return max(largo - sufijo, 0), largo - 1
+
+    inicio = int(inicio)
+    if fin and int(fin) < inicio:
+        return None
+    if inicio >= largo:
+        raise ValueError("rango fuera del archivo")
+    return inicio, min(int(fin), largo - 1) if fin else largo - 1
+
+
+def _if_range_vigente(request, response):
+    """If-Range: solo una fecha igual a Last-Modified (nuestros ETag son débiles)."""
+    valor = request.META.get("HTTP_IF_RANGE")
+    if not valor:
+        return True
+    if valor.startswith(("W/", '"')):
+        return False  # If-Range exige comparación fuerte de ETag
+    fecha = parse_http_date_safe(valor)
+    ultima = parse_http_date_safe(response.get("Last-Modified", ""))
+    return fecha is not None and fecha == ultima
+
+
+def con_rangos(vista):
+    """
+    ✅ Decorador de vista: anuncia ``Accept-Ranges`` en las respuestas 200 y
+    contesta ``Range`` con 206 (o 416). Va por fuera de ``condition`` para ver
+    el Last-Modified ya puesto.
+    """
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        pide_rango = request.method in ("GET", "HEAD") and "HTTP_RANGE" in request.META
+        if pide_rango or settings.CV_PDF_LINEALIZADO:
+            # Los rangos se cuentan sobre bytes sin comprimir: se negocia identity
+            request.META["HTTP_ACCEPT_ENCODING"] = "identity"
+
+        response = vista(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming or response.has_header("Content-Encoding"):
+            return response
+
+        response["Accept-Ranges"] = "bytes"
+        if not pide_rango or not _if_range_vigente(request, response):
+            return response
+
+        contenido = response.content
+        try:
+            rango = parsear_rango(request.META["HTTP_RANGE"], len(contenido))
+        except ValueError:
+            invalido = HttpResponse(status=416)
+            invalido["Content-Range"] = f"bytes */{len(contenido)}"
+            return invalido
+        if rango is None:
+            return response
+
+        inicio, fin = rango
+        response.content = contenido[inicio:fin + 1]
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {inicio}-{fin}/{len(contenido)}"
+        return response
+    return envoltura
@@ -0,0 +1,44 @@
+"""
+✅ Router de BD: las lecturas públicas (cv_view, cv_pdf) van a la réplica;
+todo lo demás (admin, escrituras, señales) va al primario.
+
+Solo se activa si settings define el alias "replica" (ver config/settings.py).
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+ALIAS_REPLICA = "replica"
+
+_lectura_publica = ContextVar("cv_lectura_publica", default=False)
+
+
+def lectura_en_replica(vista):
+    """✅ Marca una vista como de solo lectura pública: sus consultas van a la réplica."""
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        token = _lectura_publica.set(True)
+        try:
+            return vista(request, *args, **kwargs)
+        finally:
+            _lectura_publica.reset(token)
+    return envoltura
+
+
+class ReplicaLecturaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _lectura_publica.get() and ALIAS_REPLICA in settings.DATABASES:
+            return ALIAS_REPLICA
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
@@ -0,0 +1,80 @@
+"""
+✅ Señales del CV: mantienen al día los índices derivados, el snapshot
+de cada perfil cuando cambia cualquier sección visible y las miniaturas de
+los certificados (y el conteo de referencias de los blobs).
+"""
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .blobs import campos as campos_blob, nombres_en, recontar
+
+from .busqueda import SECCIONES_INDEXADAS, indexar_objeto, eliminar_objeto
+from .miniaturas import MODELOS as MODELOS_CON_MINIATURA, programar as programar_miniatura
+from .models import DatosPersonales
+from .snapshots import programar
+from .versiones import SECCION_POR_MODELO
+
+
+def _actualizar_indice(sender, instance, **kwargs):
+    indexar_objeto(instance)
+
+
+def _quitar_del_indice(sender, instance, **kwargs):
+    eliminar_objeto(instance)
+
+
+def _borrando_perfil(origen):
+    modelo = origen.model if isinstance(origen, QuerySet) else type(origen)
+    return issubclass(modelo, DatosPersonales)
+
+
+def _reconstruir_snapshot(sender, instance, origin=None, **kwargs):
+    # Borrado en cascada desde el perfil: de eso se encarga su propia señal
+    if origin is not None and _borrando_perfil(origin):
+        return
+    # El snapshot sube la versión de las secciones que cambiaron (cv/snapshots.py)
+    programar(instance.perfil_id)
+
+
+def _reconstruir_snapshot_datos(sender, instance, **kwargs):
+    programar(instance.idperfil)
+
+
+def _actualizar_miniatura(sender, instance, **kwargs):
+    # El worker no hace nada si el contenido del certificado no cambió
+    if instance.rutacertificado or instance.miniaturacertificado:
+        programar_miniatura(SECCION_POR_MODELO[sender], instance.pk)
+
+
+def _recordar_blobs(sender, instance, **kwargs):
+    # Los que tenía antes del cambio también cambian de conteo
+    anterior = sender._base_manager.filter(pk=instance.pk).first() if instance.pk else None
+    instance._blobs_anteriores = nombres_en(anterior) if anterior else set()
+
+
+def _recontar_blobs(sender, instance, **kwargs):
+    nombres = nombres_en(instance) | getattr(instance, "_blobs_anteriores", set())
+    if nombres:
+        transaction.on_commit(lambda: recontar(nombres))
+
+
+def conectar():
+    for modelo in SECCIONES_INDEXADAS:
+        post_save.connect(_actualizar_indice, sender=modelo, dispatch_uid=f"indice_{modelo.__name__}")
+        post_delete.connect(_quitar_del_indice, sender=modelo, dispatch_uid=f"desindexar_{modelo.__name__}")
+
+    for modelo in SECCION_POR_MODELO:
+        post_save.connect(_reconstruir_snapshot, sender=modelo, dispatch_uid=f"version_save_{modelo.__name__}")
+        post_delete.connect(_reconstruir_snapshot, sender=modelo, dispatch_uid=f"version_delete_{modelo.__name__}")
+
+    post_save.connect(_reconstruir_snapshot_datos, sender=DatosPersonales, dispatch_uid="version_save_datos")
+    post_delete.connect(_reconstruir_snapshot_datos, sender=DatosPersonales, dispatch_uid="version_delete_datos")
+
+    for modelo in {m for m, _ in campos_blob()}:
+        pre_save.connect(_recordar_blobs, sender=modelo, dispatch_uid=f"blobs_antes_{modelo.__name__}")
+        post_save.connect(_recontar_blobs, sender=modelo, dispatch_uid=f"blobs_save_{modelo.__name__}")
+        post_delete.connect(_recontar_blobs, sender=modelo, dispatch_uid=f"blobs_delete_{modelo.__name__}")
+
+    for modelo in MODELOS_CON_MINIATURA.values():
+        post_save.connect(_actualizar_miniatura, sender=modelo, dispatch_uid=f"miniatura_{modelo.__name__}")
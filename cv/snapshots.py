@@ -0,0 +1,338 @@
+"""
+✅ Modelo de lectura desnormalizado: un ``CVSnapshot`` por perfil.
+
+El documento guarda, en JSON comprimido con zlib, los datos del perfil y las
+filas visibles de cada sección con las columnas que usan cv.html y el PDF
+(cv/proyecciones.py). ``cv_view`` y ``cv_pdf`` lo leen por clave primaria.
+
+Cuándo se reconstruye: las señales llaman a ``programar(idperfil)``, que junta
+los perfiles tocados en la transacción y, al confirmarla, reconstruye cada uno
+una sola vez (un borrado en cascada o masivo de N filas no hace N rebuilds). Por
+defecto se reconstruye en línea; con ``CV_SNAPSHOT_EN_COLA`` lo hace un worker.
+En ambos casos se sube la versión (cv/versiones.py) SOLO de las secciones cuyo
+contenido cambió, así la caché de página/PDF nunca queda por delante del snapshot.
+Si un rebuild falla tras confirmar, queda en el log y lo repara ``check_snapshots --reparar``.
+
+``CVSnapshot.version`` es la versión de contenido del perfil: solo sube cuando
+el documento cambia, y de ella salen el ETag y el Last-Modified de las vistas
+(``version_contenido``).
+"""
+import json
+import logging
+import threading
+import zlib
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import DateField, DecimalField, F, FileField
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from .catalogo import LIMITE_POR_DEFECTO
+from .consultas import fuera_de_presupuesto
+from .cursores import codificar_cursor
+from .models import CVSnapshot, DatosPersonales
+from .proyecciones import CAMPOS, Seccion, tipo_fila, visibles
+from .versiones import SECCION_DATOS, SECCION_POR_MODELO, incrementar_version, invalidar_seccion
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_PERFIL = (
+    "idperfil", "nombres", "apellidos", "descripcionperfil",
+    "numerocedula", "nacionalidad", "direcciondomiciliaria", "fotoperfil",
+)
+
+Perfil = namedtuple("Perfil", CAMPOS_PERFIL)
+PaginaInicial = namedtuple("PaginaInicial", "productos siguiente")
+VersionContenido = namedtuple("VersionContenido", "version actualizado")
+
+# La entrada se reescribe al publicar cada cambio; el TTL solo cubre otros
+# caminos (p. ej. sync_replica)
+TTL_VERSION_CONTENIDO = 60
+
+MODELO_POR_SECCION = {seccion: modelo for modelo, seccion in SECCION_POR_MODELO.items()}
+
+
+def _columnas(modelo):
+    """pk + columnas de HTML + las que solo usa el PDF (orden estable)."""
+    _, columnas, _ = tipo_fila(modelo, "html")
+    return columnas + tuple(c for c in CAMPOS["pdf"][modelo] if c not in columnas)
+
+
+def _campo(modelo, nombre):
+    try:
+        return modelo._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        return None
+
+
+def _conversor(campo):
+    """JSON -> tipo de Python que esperan la plantilla y el PDF."""
+    if isinstance(campo, FileField):
+        return lambda v: FieldFile(None, campo, v) if v else None
+    if isinstance(campo, DecimalField):
+        return lambda v: None if v is None else Decimal(v)
+    if isinstance(campo, DateField):
+        return lambda v: None if v is None else date.fromisoformat(v)
+    return None
+
+
+# ===============================
+# ✅ CONSTRUCCIÓN
+# ===============================
+
+def construir_documento(perfil):
+    """✅ Documento (dict serializable) con todo lo visible del perfil."""
+    datos = {c: getattr(perfil, c, None) for c in CAMPOS_PERFIL}
+    datos["fotoperfil"] = datos["fotoperfil"].name if datos["fotoperfil"] else None
+
+    documento = {"perfil": datos, "secciones": {}}
+    for modelo, seccion in SECCION_POR_MODELO.items():
+        columnas = _columnas(modelo)
+        filas = visibles(modelo, perfil).order_by(modelo._meta.pk.name).values_list(*columnas)
+        documento["secciones"][seccion] = {"columnas": columnas, "filas": [list(f) for f in filas]}
+
+    # Ida y vuelta por JSON: fechas/decimales como texto, igual que lo guardado
+    return json.loads(json.dumps(documento, cls=DjangoJSONEncoder))
+
+
+def _comprimir(documento):
+    crudo = json.dumps(documento, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    return zlib.compress(crudo.encode(), 6)
+
+
+def _descomprimir(blob):
+    return json.loads(zlib.decompress(blob))
+
+
+def _secciones_cambiadas(anterior, nuevo):
+    if anterior is None:
+        return [SECCION_DATOS, *SECCION_POR_MODELO.values()]
+    cambiadas = [SECCION_DATOS] if anterior["perfil"] != nuevo["perfil"] else []
+    cambiadas += [
+        s for s in SECCION_POR_MODELO.values()
+        if anterior["secciones"].get(s) != nuevo["secciones"][s]
+    ]
+    return cambiadas
+
+
+def reconstruir(idperfil):
+    """
+    ✅ Reconstruye el snapshot del perfil en una transacción y devuelve el
+    ``Documento`` (o None si el perfil ya no existe).
+    """
+    with transaction.atomic():
+        perfil = DatosPersonales.objects.filter(idperfil=idperfil).first()
+        if perfil is None:
+            CVSnapshot.objects.filter(perfil_id=idperfil).delete()
+            transaction.on_commit(lambda: _publicar(idperfil, _secciones_cambiadas(None, None)))
+            return None
+
+        nuevo = construir_documento(perfil)
+        blob = _comprimir(nuevo)
+
+        previo = (
+            CVSnapshot.objects.select_for_update()
+            .filter(perfil_id=idperfil).values_list("documento", flat=True).first()
+        )
+        anterior = _descomprimir(previo) if previo is not None else None
+        cambiadas = _secciones_cambiadas(anterior, nuevo)
+        if not cambiadas:
+            # Nada visible cambió: la versión de contenido (y el ETag) se mantienen
+            return Documento(nuevo)
+
+        if not _actualizar(idperfil, blob):
+            try:
+                with transaction.atomic():
+                    CVSnapshot.objects.create(perfil_id=idperfil, documento=blob)
+            except IntegrityError:
+                # Otro proceso lo creó entre el UPDATE y el INSERT
+                _actualizar(idperfil, blob)
+
+        transaction.on_commit(lambda: _publicar(idperfil, cambiadas))
+
+    return Documento(nuevo)
+
+
+def _actualizar(idperfil, blob):
+    return CVSnapshot.objects.filter(perfil_id=idperfil).update(
+        version=F("version") + 1, documento=blob, actualizado=timezone.now()
+    )
+
+
+def _publicar(idperfil, secciones):
+    """Tras confirmar: nuevas versiones de caché, invalidación y prerender."""
+    # Se escribe (no se borra): si no, el próximo GET la rellenaría desde una réplica atrasada
+    _cachear_version_contenido(idperfil)
+    for seccion in secciones:
+        incrementar_version(idperfil, seccion)
+        invalidar_seccion(idperfil, seccion)
+
+    if settings.CV_PRERENDER_EN_COLA:
+        from .trabajos import encolar
+        # retraso: agrupa ráfagas de cambios del admin en un solo prerender
+        encolar("prerender_perfil", {"idperfil": idperfil}, clave=f"prerender:{idperfil}", retraso=2)
+
+
+# Perfiles por reconstruir en la transacción en curso de este hilo (las
+# conexiones de Django también son por hilo)
+_pendientes = threading.local()
+
+
+def _reconstruir_pendientes():
+    perfiles = getattr(_pendientes, "perfiles", None)
+    if not perfiles:
+        return
+    _pendientes.perfiles = set()
+    for idperfil in sorted(perfiles):
+        # Un perfil que falla no deja sin reconstruir a los demás
+        try:
+            if settings.CV_SNAPSHOT_EN_COLA:
+                from .trabajos import encolar
+                encolar("reconstruir_snapshot", {"idperfil": idperfil}, clave=f"snapshot:{idperfil}", prioridad=20)
+            else:
+                reconstruir(idperfil)
+        except Exception:
+            logger.exception("no se pudo reconstruir el snapshot del perfil %s", idperfil)
+
+
+def programar(idperfil):
+    """✅ Llamado por las señales: una reconstrucción por perfil al confirmar (inmediata o en cola)."""
+    if getattr(_pendientes, "perfiles", None) is None:
+        _pendientes.perfiles = set()
+    _pendientes.perfiles.add(idperfil)
+    # Un callback por llamada (Django descarta los de un savepoint deshecho): el
+    # primero que corre reconstruye todo el conjunto y los demás no hacen nada.
+    # Lo que quede de una transacción deshecha se reconstruye con la siguiente
+    # (sin cambios no sube ninguna versión). Fuera de una transacción corre ya.
+    transaction.on_commit(_reconstruir_pendientes)
+
+
+# ===============================
+# ✅ LECTURA
+# ===============================
+
+class Documento:
+    """Vista de solo lectura de un snapshot: perfil y filas por sección/formato."""
+
+    def __init__(self, datos):
+        self.datos = datos
+
+    @property
+    def perfil(self):
+        datos = self.datos["perfil"]
+        foto = _campo(DatosPersonales, "fotoperfil")
+        valores = dict(datos)
+        valores["fotoperfil"] = _conversor(foto)(datos["fotoperfil"]) if foto is not None else None
+        return Perfil(**valores)
+
+    def filas(self, seccion, formato):
+        """✅ Filas de la sección como las namedtuples de cv/proyecciones.py."""
+        modelo = MODELO_POR_SECCION[seccion]
+        clase, columnas, _ = tipo_fila(modelo, formato)
+        guardado = self.datos["secciones"][seccion]
+
+        # Una columna nueva (p. ej. tras una migración) falta en los snapshots
+        # guardados antes: se lee como None hasta el próximo rebuild_snapshots
+        guardadas = {c: i for i, c in enumerate(guardado["columnas"])}
+        posiciones = [guardadas.get(c) for c in columnas]
+        conversores = [_conversor(_campo(modelo, c)) for c in columnas]
+        resultado = []
+        for fila in guardado["filas"]:
+            valores = [None if i is None else fila[i] for i in posiciones]
+            for j, convertir in enumerate(conversores):
+                if convertir is not None:
+                    valores[j] = convertir(valores[j])
+            resultado.append(clase._make(valores))
+        return resultado
+
+    def seccion(self, seccion, formato):
+        """Como ``filas`` pero perezosa (para los fragmentos cacheados de cv.html)."""
+        return Seccion(lambda: self.filas(seccion, formato))
+
+    def pagina_garage(self, limite=LIMITE_POR_DEFECTO):
+        """Primera página del catálogo, igual que pagina_garage(perfil) por "precio"."""
+        productos = sorted(self.filas("garage", "html"), key=lambda g: (g.valordelbien, g.idventagarage))
+        siguiente = None
+        if len(productos) > limite:
+            productos = productos[:limite]
+            siguiente = codificar_cursor(productos[-1].valordelbien, productos[-1].idventagarage)
+        return PaginaInicial(productos, siguiente)
+
+
+def obtener(idperfil):
+    """
+    ✅ Documento del perfil con una lectura por PK. Si el snapshot falta (aún no
+    se confirmó su rebuild) se arma desde las tablas sin guardarlo: la vista
+    puede estar leyendo de la réplica y un GET no escribe.
+    """
+    blob = CVSnapshot.objects.filter(perfil_id=idperfil).values_list("documento", flat=True).first()
+    if blob is not None:
+        return Documento(_descomprimir(blob))
+    # Camino raro: una consulta por sección, fuera del presupuesto de cv_view/cv_pdf
+    with fuera_de_presupuesto():
+        perfil = DatosPersonales.objects.filter(idperfil=idperfil).first()
+        return Documento(construir_documento(perfil)) if perfil is not None else None
+
+
+def clave_version_contenido(idperfil):
+    return f"cv:contenido:{idperfil}"
+
+
+def version_contenido(idperfil):
+    """
+    ✅ ¿Cambió algo del perfil? ``VersionContenido(version, actualizado)`` con
+    una lectura de caché o, si falta, una consulta por PK. None sin snapshot.
+    """
+    valor = cache.get(clave_version_contenido(idperfil))
+    if valor is None:
+        valor = _cachear_version_contenido(idperfil)
+    return VersionContenido(*valor) if valor is not None else None
+
+
+def _cachear_version_contenido(idperfil):
+    """
+    Lee la versión del primario (aunque la vista lea de la réplica: una réplica
+    atrasada dejaría en caché el ETag viejo durante todo el TTL) y la guarda.
+    """
+    clave = clave_version_contenido(idperfil)
+    fila = (
+        CVSnapshot.objects.using("default").filter(perfil_id=idperfil)
+        .values_list("version", "actualizado").first()
+    )
+    if fila is None:
+        cache.delete(clave)
+        return None
+    valor = tuple(fila)
+    cache.set(clave, valor, TTL_VERSION_CONTENIDO)
+    return valor
+
+
+def verificar(idperfil=None):
+    """
+    ✅ Compara cada snapshot con lo que hay hoy en las tablas.
+    Devuelve [(idperfil, problema)] con problema en: "falta", "desactualizado", "huerfano".
+    """
+    perfiles = DatosPersonales.objects.order_by("idperfil")
+    snapshots = CVSnapshot.objects.all()
+    if idperfil is not None:
+        perfiles = perfiles.filter(idperfil=idperfil)
+        snapshots = snapshots.filter(perfil_id=idperfil)
+
+    guardados = dict(snapshots.values_list("perfil_id", "documento"))
+    problemas = []
+    for perfil in perfiles:
+        blob = guardados.pop(perfil.idperfil, None)
+        if blob is None:
+            problemas.append((perfil.idperfil, "falta"))
+        elif _descomprimir(blob) != construir_documento(perfil):
+            problemas.append((perfil.idperfil, "desactualizado"))
+
+    problemas += [(idp, "huerfano") for idp in guardados]
+    return problemas
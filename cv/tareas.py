@@ -0,0 +1,106 @@
+"""
+✅ Tipos de trabajo de la cola (cv/trabajos.py).
+
+Cada tarea recibe el ``Trabajo`` y sus argumentos; lo que devuelve queda en
+``Trabajo.resultado`` (debe ser serializable a JSON).
+"""
+import io
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from .busqueda import reconstruir_indice
+from .coalescencia import una_sola_vez
+from .compresion import guardar_entrada
+from .miniaturas import generar as generar_miniatura
+from .snapshots import reconstruir
+from .trabajos import reportar_progreso, tarea
+from .versiones import etiquetas_perfil
+from .views import clave_pagina, clave_pdf, contexto_cv, renderizar_pdf
+
+# Lo que generarPDF() pide con todas las casillas marcadas
+SECCIONES_POR_DEFECTO = [
+    "datos", "experiencia", "cursos", "reconocimientos", "prod_academicos", "prod_laborales",
+]
+
+
+def _guardar_pdf(clave, idperfil, secciones, progreso=None, calidad=None):
+    """Renderiza y cachea el PDF; si un request ya lo está generando, espera ese."""
+    def renderizar():
+        buffer = io.BytesIO()
+        renderizar_pdf(idperfil, secciones, buffer, progreso=progreso, calidad=calidad)
+        return guardar_entrada(
+            clave, buffer.getvalue(), "application/pdf",
+            {"Content-Disposition": 'inline; filename="hoja_vida.pdf"'},
+            etiquetas_perfil(idperfil, secciones),
+        )
+
+    entrada = una_sola_vez(clave, renderizar)
+    if entrada is None:
+        raise RuntimeError(f"No se pudo generar el PDF {clave}")
+    return entrada
+
+
+@tarea("prerender_pagina")
+def prerender_pagina(trabajo, idperfil):
+    clave = clave_pagina(idperfil)
+    if cache.get(clave) is not None:
+        return {"clave": clave, "cacheado": True}
+
+    html = render_to_string("cv/cv.html", contexto_cv(idperfil)).encode()
+    guardar_entrada(clave, html, "text/html; charset=utf-8", etiquetas=etiquetas_perfil(idperfil))
+    return {"clave": clave, "bytes": len(html)}
+
+
+@tarea("prerender_pdf")
+def prerender_pdf(trabajo, idperfil, secciones=None):
+    secciones = secciones or SECCIONES_POR_DEFECTO
+    clave = clave_pdf(idperfil, secciones)
+    if cache.get(clave) is not None:
+        return {"clave": clave, "cacheado": True}
+
+    entrada = _guardar_pdf(clave, idperfil, secciones)
+    return {"clave": clave, "bytes": len(entrada["variantes"]["identity"])}
+
+
+@tarea("pdf_cv")
+def pdf_cv(trabajo, idperfil, secciones, calidad=None):
+    """PDF pedido por POST /pdf/jobs/: lo descarga GET /pdf/jobs/<id>/."""
+    clave = clave_pdf(idperfil, secciones, calidad)
+    if cache.get(clave) is not None:
+        return {"clave": clave, "cacheado": True}
+
+    entrada = _guardar_pdf(
+        clave, idperfil, secciones,
+        # El último 5% queda para comprimir y guardar
+        progreso=lambda fraccion: reportar_progreso(trabajo, fraccion * 95),
+        calidad=calidad,
+    )
+    return {"clave": clave, "bytes": len(entrada["variantes"]["identity"])}
+
+
+@tarea("prerender_perfil")
+def prerender_perfil(trabajo, idperfil):
+    """Página + PDF por defecto: lo primero que pide un visitante tras un cambio."""
+    return {
+        "pagina": prerender_pagina(trabajo, idperfil),
+        "pdf": prerender_pdf(trabajo, idperfil),
+    }
+
+
+@tarea("reindexar_busqueda")
+def reindexar_busqueda(trabajo):
+    return {"filas": reconstruir_indice()}
+
+
+@tarea("miniatura_certificado")
+def miniatura_certificado(trabajo, seccion, pk):
+    """WebP de la primera página del certificado (cv/miniaturas.py)."""
+    return {"miniatura": generar_miniatura(seccion, pk)}
+
+
+@tarea("reconstruir_snapshot")
+def reconstruir_snapshot(trabajo, idperfil):
+    """Con CV_SNAPSHOT_EN_COLA: las señales encolan esto en vez de reconstruir en línea."""
+    documento = reconstruir(idperfil)
+    return {"idperfil": idperfil, "existe": documento is not None}
@@ -1,3 +1,828 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, models
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+try:
+    import pikepdf
+except ImportError:  # pragma: no cover - opcional, está en requirements.txt
+    pikepdf = None
+
+from . import certificados, snapshots
+from .admision import turno_pdf
+from .blobs import almacenamiento_por_contenido, hash_de_nombre, recolectar
+from .busqueda import buscar, reconstruir_indice
+from .cache_mmap import CacheMmap
+from .catalogo import ORDENES, pagina_garage
+from .consultas import ConsultasExcedidas, Registro, huella, revisar
+from .cursores import codificar_cursor
+from .estatico import construir
+from .models import (
+    Blob, CursosRealizados, CVSnapshot, DatosPersonales, ExperienciaLaboral, IndiceBusqueda, Trabajo, VentaGarage,
+)
+from .rangos import con_rangos, parsear_rango
+from .trabajos import (
+    BACKOFF_BASE, TAREAS, _latir, ejecutar, encolar, liberar_abandonados, purgar_terminados, tomar_trabajo,
+)
+
+
+# ===============================
+# ✅ PRESUPUESTO DE CONSULTAS (cv/consultas.py)
+# ===============================
+@override_settings(CV_CONSULTAS_ESTRICTO=True)
+class PresupuestoConsultasTests(TestCase):
+    """Las vistas con presupuesto y los changelists del admin, con caché fría y muchas filas."""
+
+    FILAS = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: ValidatedModel.save() no se usa; el snapshot se reconstruye
+        # al confirmar (on_commit), que aquí se ejecuta a mano
+        with cls.captureOnCommitCallbacks(execute=True):
+            DatosPersonales.objects.bulk_create([DatosPersonales(
+                descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+                lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+                sexo="M", estadocivil="Soltera",
+            )])
+            perfil = DatosPersonales.objects.get()
+            ExperienciaLaboral.objects.bulk_create([ExperienciaLaboral(
+                perfil=perfil, cargodesempenado=f"Cargo {i}", nombrempresa="Empresa", lugarempresa="Manta",
+                emailempresa="a@b.ec", fechainiciogestion=date(2020, 1, 1), descripcionfunciones="Funciones",
+            ) for i in range(cls.FILAS)])
+            CursosRealizados.objects.bulk_create([CursosRealizados(
+                perfil=perfil, nombrecurso=f"Curso {i}", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+                totalhoras=10, descripcioncurso="Curso", entidadpatrocinadora="Entidad",
+            ) for i in range(cls.FILAS)])
+            VentaGarage.objects.bulk_create([VentaGarage(
+                perfil=perfil, nombreproducto=f"Producto {i}", estadoproducto="Bueno",
+                descripcion="Producto", valordelbien=i + 1,
+            ) for i in range(cls.FILAS)])
+        User.objects.create_superuser("admin", "admin@example.com", "clave")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cv_view(self):
+        self.assertEqual(self.client.get(reverse("cv")).status_code, 200)
+
+    def test_cv_pdf(self):
+        self.assertEqual(self.client.get(reverse("cv_pdf"), {"sec": ["experiencia", "cursos"]}).status_code, 200)
+
+    def test_sin_snapshot(self):
+        # Se arma desde las tablas (snapshots.obtener): ese respaldo no rompe el presupuesto
+        CVSnapshot.objects.all().delete()
+        self.assertEqual(self.client.get(reverse("cv")).status_code, 200)
+        self.assertEqual(self.client.get(reverse("cv_pdf"), {"sec": ["experiencia", "cursos"]}).status_code, 200)
+        self.assertFalse(CVSnapshot.objects.exists())
+
+    def test_changelists_admin(self):
+        self.client.force_login(User.objects.get(username="admin"))
+        for modelo in admin.site._registry:
+            url = reverse(f"admin:{modelo._meta.app_label}_{modelo._meta.model_name}_changelist")
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_detecta_n_mas_1(self):
+        ids = list(CursosRealizados.objects.values_list("pk", flat=True)[:10])
+        with Registro() as registro:
+            for pk in ids:
+                CursosRealizados.objects.filter(pk=pk).first()
+        self.assertEqual(list(registro.repetidas().values()), [10])
+        with self.assertRaises(ConsultasExcedidas):
+            revisar(registro, None, "prueba")
+
+    def test_huella(self):
+        self.assertEqual(
+            huella("SELECT * FROM t WHERE id IN (1, 2, 3) AND nombre = 'x'"),
+            huella("SELECT *  FROM t WHERE id IN (%s, %s) AND nombre = %s"),
+        )
+
+
+# ===============================
+# ✅ CONTROL DE ADMISIÓN DEL PDF (cv/admision.py)
+# ===============================
+@override_settings(CV_PDF_RENDERS_PROCESO=1, CV_PDF_COLA=0, CV_PDF_REINTENTO=7)
+class AdmisionPdfTests(TestCase):
+    """Sin turno libre el render responde 503; lo cacheado se sirve igual."""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatosPersonales.objects.bulk_create([DatosPersonales(
+            descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+            lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+            sexo="M", estadocivil="Soltera",
+        )])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_saturado_responde_503(self):
+        with turno_pdf():
+            response = self.client.get(reverse("cv_pdf"), {"sec": "datos"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "7")
+
+    def test_acierto_de_cache_no_pide_turno(self):
+        self.assertEqual(self.client.get(reverse("cv_pdf"), {"sec": "datos"}).status_code, 200)
+        with turno_pdf():
+            self.assertEqual(self.client.get(reverse("cv_pdf"), {"sec": "datos"}).status_code, 200)
+
+
+# ===============================
+# ✅ RANGOS (cv/rangos.py)
+# ===============================
+class RangosTests(SimpleTestCase):
+    CUERPO = b"0123456789"
+    MODIFICADO = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def pedir(self, **cabeceras):
+        @con_rangos
+        def vista(request):
+            response = HttpResponse(self.CUERPO, content_type="application/pdf")
+            response["Last-Modified"] = self.MODIFICADO
+            return response
+
+        return vista(RequestFactory().get("/pdf/", **cabeceras))
+
+    def test_parsear_rango(self):
+        self.assertEqual(parsear_rango("bytes=2-4", 10), (2, 4))
+        self.assertEqual(parsear_rango("bytes=7-", 10), (7, 9))
+        self.assertEqual(parsear_rango("bytes=-3", 10), (7, 9))
+        self.assertEqual(parsear_rango("bytes=-30", 10), (0, 9))
+        self.assertIsNone(parsear_rango("bytes=0-1,3-4", 10))
+        self.assertIsNone(parsear_rango("items=0-1", 10))
+        with self.assertRaises(ValueError):
+            parsear_rango("bytes=10-", 10)
+        with self.assertRaises(ValueError):
+            parsear_rango("bytes=-5", 0)
+
+    def test_206(self):
+        response = self.pedir(HTTP_RANGE="bytes=2-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"234")
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+
+    def test_rango_sufijo(self):
+        response = self.pedir(HTTP_RANGE="bytes=-3")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"789")
+        self.assertEqual(response["Content-Range"], "bytes 7-9/10")
+
+    def test_416(self):
+        response = self.pedir(HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_varios_rangos_devuelve_todo(self):
+        response = self.pedir(HTTP_RANGE="bytes=0-1,3-4")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.CUERPO)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_if_range_vencido_devuelve_todo(self):
+        response = self.pedir(HTTP_RANGE="bytes=2-4", HTTP_IF_RANGE="Tue, 31 Dec 2024 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.CUERPO)
+
+    def test_if_range_vigente(self):
+        response = self.pedir(HTTP_RANGE="bytes=2-4", HTTP_IF_RANGE=self.MODIFICADO)
+        self.assertEqual(response.status_code, 206)
+
+
+# ===============================
+# ✅ CATÁLOGO DE GARAGE (cv/catalogo.py)
+# ===============================
+class CatalogoTests(TestCase):
+    """Paginación keyset; un cursor manipulado se ignora (primera página)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatosPersonales.objects.bulk_create([DatosPersonales(
+            descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+            lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+            sexo="M", estadocivil="Soltera",
+        )])
+        cls.perfil = DatosPersonales.objects.get()
+        VentaGarage.objects.bulk_create([VentaGarage(
+            perfil=cls.perfil, nombreproducto=f"Producto {i}", estadoproducto="Bueno",
+            descripcion="Producto", valordelbien=Decimal(i % 3),
+        ) for i in range(7)])
+
+    def ids(self, productos):
+        return [p.idventagarage for p in productos]
+
+    def test_recorre_todas_las_paginas(self):
+        for orden in ORDENES:
+            vistos, cursor = [], None
+            while True:
+                productos, cursor = pagina_garage(self.perfil, orden=orden, cursor=cursor, limite=3)
+                vistos += self.ids(productos)
+                if cursor is None:
+                    break
+            self.assertCountEqual(vistos, VentaGarage.objects.values_list("pk", flat=True))
+
+    def test_cursor_manipulado(self):
+        primera = {orden: self.ids(pagina_garage(self.perfil, orden=orden, limite=3)[0]) for orden in ORDENES}
+        manipulados = [
+            ("recientes", codificar_cursor("abc")),
+            ("recientes", codificar_cursor(True)),
+            ("recientes", codificar_cursor(2 ** 80)),
+            ("precio", codificar_cursor("NaN", 1)),
+            ("precio", codificar_cursor("1", "abc")),
+            ("-precio", codificar_cursor("Infinity", 1)),
+            ("-precio", codificar_cursor(["1"], {"a": 1})),
+            ("precio", "%%%no-es-base64"),
+        ]
+        for orden, cursor in manipulados:
+            with self.subTest(orden=orden, cursor=cursor):
+                productos, _ = pagina_garage(self.perfil, orden=orden, cursor=cursor, limite=3)
+                self.assertEqual(self.ids(productos), primera[orden])
+
+    def test_vista_no_falla_con_cursor_manipulado(self):
+        response = self.client.get(reverse("cv_garage"), {"orden": "recientes", "cursor": codificar_cursor("abc")})
+        self.assertEqual(response.status_code, 200)
+
+
+# ===============================
+# ✅ BÚSQUEDA FULL-TEXT (cv/busqueda.py)
+# ===============================
+class BusquedaTests(TestCase):
+    """Índice FTS, orden por ranking y paginación por cursor (también manipulado)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatosPersonales.objects.bulk_create([DatosPersonales(
+            descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+            lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+            sexo="M", estadocivil="Soltera",
+        )])
+        cls.perfil = DatosPersonales.objects.get()
+        CursosRealizados.objects.bulk_create([CursosRealizados(
+            perfil=cls.perfil, nombrecurso=f"Curso {i}", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=10, descripcioncurso="Programación web", entidadpatrocinadora="Entidad",
+        ) for i in range(5)] + [CursosRealizados(
+            perfil=cls.perfil, nombrecurso="Django avanzado", fechainicio=date(2021, 1, 1),
+            fechafin=date(2021, 2, 1), totalhoras=10, descripcioncurso="Django y PostgreSQL",
+            entidadpatrocinadora="Entidad",
+        ), CursosRealizados(
+            perfil=cls.perfil, nombrecurso="Oculto", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=10, descripcioncurso="Django", entidadpatrocinadora="Entidad",
+            activarparaqueseveaenfront=False,
+        )])
+        # bulk_create no dispara las señales que mantienen el índice
+        reconstruir_indice()
+
+    def test_indice_solo_visibles(self):
+        self.assertEqual(IndiceBusqueda.objects.count(), 6)
+
+    def test_ranking_titulo_primero(self):
+        resultados, siguiente = buscar(self.perfil.idperfil, "django")
+        self.assertEqual([r["titulo"] for r in resultados], ["Django avanzado"])
+        self.assertIsNone(siguiente)
+
+    def test_prefijo(self):
+        resultados, _ = buscar(self.perfil.idperfil, "progra")
+        self.assertEqual(len(resultados), 5)
+
+    def test_paginas_con_cursor(self):
+        vistos, cursor = [], None
+        while True:
+            resultados, cursor = buscar(self.perfil.idperfil, "curso", cursor=cursor, limite=2)
+            vistos += [r["id"] for r in resultados]
+            if cursor is None:
+                break
+        self.assertEqual(len(vistos), 5)
+        self.assertEqual(len(set(vistos)), 5)
+
+    def test_empates_de_rango(self):
+        # Los cinco "Curso N" empatan: una página por fila, sin saltos ni repetidos
+        todos, _ = buscar(self.perfil.idperfil, "curso")
+        self.assertEqual(len({r["rango"] for r in todos}), 1)
+        vistos, cursor = [], None
+        while True:
+            resultados, cursor = buscar(self.perfil.idperfil, "curso", cursor=cursor, limite=1)
+            vistos += [r["id"] for r in resultados]
+            if cursor is None:
+                break
+        self.assertEqual(vistos, [r["id"] for r in todos])
+
+    @skipUnless(connection.vendor == "postgresql", "ranking ts_rank_cd de Postgres")
+    def test_cursor_postgres_es_el_rango_exacto(self):
+        # El rango del cursor (float8) tiene que ser igual al de la fila: rango = %s
+        primera, _ = buscar(self.perfil.idperfil, "curso", limite=1)
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT COUNT(*) FROM (SELECT -ts_rank_cd(i.vector, q)::float8 AS rango "
+                "FROM indicebusqueda i, to_tsquery('spanish', 'curso:*') q WHERE i.vector @@ q) AS r "
+                "WHERE rango = %s", [primera[0]["rango"]],
+            )
+            self.assertEqual(cur.fetchone()[0], 5)
+
+    def test_cursor_manipulado(self):
+        primera, _ = buscar(self.perfil.idperfil, "curso", limite=2)
+        for cursor in (
+            codificar_cursor(["x"], {"a": 1}), codificar_cursor("abc", 1), codificar_cursor(1.0, "2"),
+            codificar_cursor(True, 1), codificar_cursor(10 ** 400, 1), codificar_cursor(1.0, 2 ** 80),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(buscar(self.perfil.idperfil, "curso", cursor=cursor, limite=2)[0], primera)
+
+    def test_vista(self):
+        response = self.client.get(reverse("cv_buscar"), {"q": "django", "cursor": codificar_cursor(["x"], 1)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["resultados"]), 1)
+
+
+# ===============================
+# ✅ COLA DE TRABAJOS
+# ===============================
+class TrabajosTests(TestCase):
+    """Reclamo, reintento con backoff, deduplicación por clave y abandonados."""
+
+    def setUp(self):
+        def fallar(trabajo):
+            raise RuntimeError("falló")
+
+        TAREAS["prueba_ok"] = lambda trabajo, valor=0: {"valor": valor}
+        TAREAS["prueba_falla"] = fallar
+        self.addCleanup(TAREAS.pop, "prueba_ok")
+        self.addCleanup(TAREAS.pop, "prueba_falla")
+
+    def test_deduplica_por_clave(self):
+        primero = encolar("prueba_ok", clave="k")
+        self.assertEqual(encolar("prueba_ok", clave="k").idtrabajo, primero.idtrabajo)
+        Trabajo.objects.filter(idtrabajo=primero.idtrabajo).update(estado=Trabajo.HECHO)
+        self.assertNotEqual(encolar("prueba_ok", clave="k").idtrabajo, primero.idtrabajo)
+
+    def test_reclama_por_prioridad(self):
+        encolar("prueba_ok", prioridad=1)
+        urgente = encolar("prueba_ok", prioridad=10)
+        encolar("prueba_ok", retraso=60)  # aún no está listo
+
+        trabajo = tomar_trabajo("w1")
+        self.assertEqual(trabajo.idtrabajo, urgente.idtrabajo)
+        self.assertEqual((trabajo.estado, trabajo.bloqueado_por, trabajo.intentos), (Trabajo.EN_CURSO, "w1", 1))
+        self.assertIsNotNone(tomar_trabajo("w2"))
+        self.assertIsNone(tomar_trabajo("w3"))
+
+    def test_ejecuta_y_guarda_resultado(self):
+        encolar("prueba_ok", {"valor": 3})
+        self.assertTrue(ejecutar(tomar_trabajo("w1")))
+        trabajo = Trabajo.objects.get()
+        self.assertEqual((trabajo.estado, trabajo.resultado), (Trabajo.HECHO, {"valor": 3}))
+
+    def test_reintento_con_backoff_y_fallo_final(self):
+        encolar("prueba_falla", max_intentos=2)
+        antes = timezone.now()
+        self.assertFalse(ejecutar(tomar_trabajo("w1")))
+
+        trabajo = Trabajo.objects.get()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.PENDIENTE, 1))
+        self.assertIn("falló", trabajo.error)
+        espera = (trabajo.ejecutar_despues - antes).total_seconds()
+        self.assertGreaterEqual(espera, BACKOFF_BASE * 0.8)
+        self.assertIsNone(tomar_trabajo("w1"))  # todavía en backoff
+
+        Trabajo.objects.update(ejecutar_despues=timezone.now())
+        self.assertFalse(ejecutar(tomar_trabajo("w1")))
+        self.assertEqual(Trabajo.objects.get().estado, Trabajo.FALLIDO)
+
+    def test_abandonados_vuelven_o_fallan(self):
+        vivo = encolar("prueba_ok", max_intentos=2)
+        agotado = encolar("prueba_ok", max_intentos=1)
+        reciente = encolar("prueba_ok", max_intentos=2)
+        for _ in range(3):
+            tomar_trabajo("muerto")
+        viejo = timezone.now() - timedelta(seconds=settings.CV_TRABAJOS_TIMEOUT + 1)
+        Trabajo.objects.exclude(idtrabajo=reciente.idtrabajo).update(bloqueado_en=viejo)
+
+        self.assertEqual(liberar_abandonados(), 2)
+        estados = dict(Trabajo.objects.values_list("idtrabajo", "estado"))
+        self.assertEqual(estados[vivo.idtrabajo], Trabajo.PENDIENTE)
+        self.assertEqual(estados[agotado.idtrabajo], Trabajo.FALLIDO)
+        self.assertEqual(estados[reciente.idtrabajo], Trabajo.EN_CURSO)
+        self.assertIsNone(Trabajo.objects.get(idtrabajo=agotado.idtrabajo).bloqueado_por)
+
+    @mock.patch("cv.trabajos.PURGA_LOTE", 2)
+    def test_purga_terminados_viejos(self):
+        for _ in range(5):
+            encolar("prueba_ok")
+        Trabajo.objects.update(estado=Trabajo.HECHO)
+        fallido = encolar("prueba_ok")
+        Trabajo.objects.filter(idtrabajo=fallido.idtrabajo).update(estado=Trabajo.FALLIDO)
+        pendiente = encolar("prueba_ok")
+        reciente = encolar("prueba_ok")
+        viejo = timezone.now() - timedelta(days=settings.CV_TRABAJOS_RETENCION + 1)
+        Trabajo.objects.exclude(idtrabajo=reciente.idtrabajo).update(actualizado=viejo)
+        Trabajo.objects.filter(idtrabajo=reciente.idtrabajo).update(estado=Trabajo.HECHO)
+
+        self.assertEqual(purgar_terminados(), 6)
+        self.assertEqual(
+            set(Trabajo.objects.values_list("idtrabajo", flat=True)), {pendiente.idtrabajo, reciente.idtrabajo}
+        )
+
+    def test_latido_renueva_solo_el_propio(self):
+        encolar("prueba_ok")
+        trabajo = tomar_trabajo("w1")
+        viejo = timezone.now() - timedelta(seconds=settings.CV_TRABAJOS_TIMEOUT + 1)
+        Trabajo.objects.update(bloqueado_en=viejo)
+
+        self.assertEqual(_latir(trabajo), 1)
+        self.assertEqual(liberar_abandonados(), 0)
+
+        Trabajo.objects.update(bloqueado_por="w2")  # otro worker ya lo tomó
+        self.assertEqual(_latir(trabajo), 0)
+
+
+# ===============================
+# ✅ SNAPSHOTS (cv/snapshots.py)
+# ===============================
+class SnapshotsTests(TestCase):
+    """Un rebuild por perfil y transacción, al confirmar; los GET no escriben."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            DatosPersonales.objects.bulk_create([DatosPersonales(
+                descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+                lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+                sexo="M", estadocivil="Soltera",
+            )])
+        self.perfil = DatosPersonales.objects.get()
+
+    def _cursos(self, cantidad):
+        CursosRealizados.objects.bulk_create([CursosRealizados(
+            perfil=self.perfil, nombrecurso=f"Curso {i}", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=10, descripcioncurso="Curso", entidadpatrocinadora="Entidad",
+        ) for i in range(cantidad)])
+
+    def test_un_rebuild_por_transaccion(self):
+        with mock.patch("cv.snapshots.reconstruir", wraps=snapshots.reconstruir) as reconstruir:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._cursos(5)
+                CursosRealizados.objects.update(totalhoras=20)
+                for curso in CursosRealizados.objects.all()[:3]:
+                    curso.delete()
+                self.assertEqual(reconstruir.call_count, 0)  # nada antes de confirmar
+        reconstruir.assert_called_once_with(self.perfil.idperfil)
+        self.assertEqual(len(snapshots.obtener(self.perfil.idperfil).filas("cursos", "html")), 2)
+
+    def test_un_perfil_que_falla_no_frena_a_los_demas(self):
+        DatosPersonales.objects.bulk_create([DatosPersonales(
+            descripcionperfil="Otro", apellidos="Pérez", nombres="Ana", nacionalidad="Ecuatoriana",
+            lugarnacimiento="Quito", fechanacimiento=date(1991, 1, 1), numerocedula="1700000000",
+            sexo="M", estadocivil="Soltera",
+        )])
+        otro = DatosPersonales.objects.exclude(idperfil=self.perfil.idperfil).get()
+        reconstruir = snapshots.reconstruir
+
+        def fallar_el_primero(idperfil):
+            if idperfil == self.perfil.idperfil:
+                raise RuntimeError("falló")
+            return reconstruir(idperfil)
+
+        with mock.patch("cv.snapshots.reconstruir", side_effect=fallar_el_primero):
+            with self.assertLogs("cv.snapshots", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+                snapshots.programar(self.perfil.idperfil)
+                snapshots.programar(otro.idperfil)
+        self.assertTrue(CVSnapshot.objects.filter(perfil=otro).exists())
+
+    def test_borrar_perfil_no_reconstruye_por_fila(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._cursos(20)
+        idperfil = self.perfil.idperfil
+        with mock.patch("cv.snapshots.programar", wraps=snapshots.programar) as programar:
+            with mock.patch("cv.signals.programar", programar):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.perfil.delete()
+        programar.assert_called_once_with(idperfil)
+        self.assertFalse(CVSnapshot.objects.exists())
+
+    def test_publicar_escribe_la_version(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._cursos(1)
+        snapshot = CVSnapshot.objects.get()
+        # Ya en caché tras confirmar: ningún GET la lee de una réplica atrasada
+        self.assertEqual(
+            cache.get(snapshots.clave_version_contenido(self.perfil.idperfil)), (snapshot.version, snapshot.actualizado)
+        )
+        self.assertEqual(snapshots.version_contenido(self.perfil.idperfil).version, snapshot.version)
+
+    def test_obtener_sin_snapshot_no_escribe(self):
+        CVSnapshot.objects.all().delete()
+        self._cursos(2)  # su rebuild queda pendiente hasta confirmar
+        documento = snapshots.obtener(self.perfil.idperfil)
+        self.assertEqual(documento.perfil.nombres, "María")
+        self.assertEqual(len(documento.filas("cursos", "html")), 2)
+        self.assertFalse(CVSnapshot.objects.exists())
+
+
+# ===============================
+# ✅ CACHÉ MMAP (cv/cache_mmap.py)
+# ===============================
+class CacheMmapTests(SimpleTestCase):
+    """API de Django, vencimiento, LRU, segmentos, etiquetas y entradas dañadas, en un LOCATION temporal."""
+
+    def setUp(self):
+        self.cache = self._cache(MAX_BYTES=3500, UMBRAL_SEGMENTO=1024)
+
+    def _cache(self, **opciones):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, ignore_errors=True)
+        cache_mmap = CacheMmap(carpeta, {"OPTIONS": opciones})
+        self.addCleanup(lambda: cache_mmap._conexion().close())
+        return cache_mmap
+
+    def _segmentos(self):
+        return sorted(p.name for p in self.cache._segmentos.iterdir())
+
+    def _sql(self, consulta, *parametros):
+        return self.cache._conexion().execute(consulta, parametros).fetchall()
+
+    def test_get_set_add_incr(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", {"x": 1})
+        self.assertEqual(self.cache.get("a"), {"x": 1})
+        self.assertFalse(self.cache.add("a", "otro"))
+        self.assertTrue(self.cache.add("b", 1))
+        self.assertEqual(self.cache.incr("b", 4), 5)
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": {"x": 1}, "b": 5})
+        with self.assertRaises(ValueError):
+            self.cache.incr("c")
+
+    def test_vencimiento(self):
+        self.cache.set("a", 1, timeout=30)
+        self.cache.set("b", 2, timeout=None)
+        with mock.patch("cv.cache_mmap.time.time", return_value=time.time() + 60):
+            self.assertIsNone(self.cache.get("a"))
+            self.assertEqual(self.cache.get("b"), 2)
+            self.assertTrue(self.cache.add("a", 3))
+
+    @mock.patch("cv.cache_mmap.REFRESCO_LRU", 0)
+    def test_expulsion_lru(self):
+        valor = b"x" * 900  # ~920 bytes inline: entran 3 de 3500
+        for clave in ("a", "b", "c"):
+            self.cache.set(clave, valor)
+        self.cache.get("a")  # b queda como la menos usada
+        self.cache.set("d", valor)
+        self.assertEqual(set(self.cache.get_many(["a", "b", "c", "d"])), {"a", "c", "d"})
+        self.assertEqual(self.cache.estadisticas()["expulsiones"], 1)
+
+    def test_segmentos_se_borran(self):
+        grande = bytes(range(256)) * 8
+        self.cache.set("a", {"pdf": grande})
+        self.assertEqual(bytes(self.cache.get("a")["pdf"]), grande)
+        primero = self._segmentos()
+        self.assertEqual(len(primero), 1)
+
+        self.cache.set("a", {"pdf": grande})  # reescribir deja solo el segmento nuevo
+        self.assertEqual(len(self._segmentos()), 1)
+        self.assertNotEqual(self._segmentos(), primero)
+
+        self.cache.delete("a")
+        self.assertEqual(self._segmentos(), [])
+        self.cache.set("b", grande)
+        self.cache.clear()
+        self.assertEqual(self._segmentos(), [])
+
+    def test_totales_siguen_a_la_tabla(self):
+        self.cache.set("a", b"x" * 500)
+        self.cache.set("a", b"x" * 800)  # INSERT OR REPLACE
+        self.cache.set("b", 1)
+        self.cache.incr("b", 10 ** 30)
+        self.cache.set("c", bytes(range(256)) * 8)  # segmento
+        self.cache.delete("c")
+        for _ in range(2):
+            self.assertEqual(
+                self._sql("SELECT bytes, cantidad FROM totales"),
+                self._sql("SELECT COALESCE(SUM(tamano), 0), COUNT(*) FROM entradas"),
+            )
+            self.cache.clear()
+
+    @mock.patch("cv.cache_mmap.REFRESCO_LRU", 0)
+    def test_lectura_con_indice_bloqueado(self):
+        self.cache.set("a", 1)
+        otra = sqlite3.connect(self.cache._dir / "indice.sqlite3", isolation_level=None)
+        self.addCleanup(otra.close)
+        otra.execute("BEGIN IMMEDIATE")
+        self.cache._conexion().execute("PRAGMA busy_timeout=0")
+        self.assertEqual(self.cache.get("a"), 1)  # sin el refresco del LRU, pero sin error
+        otra.execute("ROLLBACK")
+
+    def test_invalidar_etiqueta(self):
+        self.cache.set_con_etiquetas("a", 1, ["perfil:1"])
+        self.cache.set_con_etiquetas("b", 2, ["perfil:1", "seccion:cursos"])
+        self.cache.set_con_etiquetas("c", 3, ["perfil:2"])
+        self.assertEqual(self.cache.invalidar_etiqueta("perfil:1"), 2)
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"c": 3})
+        self.assertEqual(self._sql("SELECT etiqueta FROM etiquetas"), [("perfil:2",)])
+
+    def test_pickle_danado_es_un_fallo(self):
+        self.cache.set("a", {"x": 1})
+        self.cache.set("b", 2)
+        self._sql("UPDATE entradas SET valor = ? WHERE clave = ?", b"\x80\x05basura", self.cache.make_key("a"))
+        self.assertEqual(self.cache.get("a", "defecto"), "defecto")
+        self.assertEqual(self._sql("SELECT COUNT(*) FROM entradas"), [(1,)])
+
+        self._sql("UPDATE entradas SET valor = ? WHERE clave = ?", b"", self.cache.make_key("b"))
+        self.assertEqual(self.cache.get_many(["b"]), {})
+        self.assertEqual(self._sql("SELECT COUNT(*) FROM entradas"), [(0,)])
+
+    def test_segmento_truncado_es_un_fallo(self):
+        self.cache.set("a", b"y" * 2048)
+        (segmento,) = self._segmentos()
+        with open(self.cache._segmentos / segmento, "r+b") as f:
+            f.truncate(20)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self._segmentos(), [])
+        self.cache.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+
+
+# ===============================
+# ✅ BLOBS POR CONTENIDO (cv/blobs.py)
+# ===============================
+class BlobsTests(TestCase):
+    """Deduplicación por sha256, conteo de referencias y recolección con gracia."""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatosPersonales.objects.bulk_create([DatosPersonales(
+            descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+            lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+            sexo="M", estadocivil="Soltera",
+        )])
+        cls.perfil = DatosPersonales.objects.get()
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, ignore_errors=True)
+        # Disco local: el almacenamiento por defecto es Cloudinary y recolectar() borra de verdad
+        ajustes = override_settings(
+            MEDIA_ROOT=carpeta,
+            STORAGES=dict(settings.STORAGES, default={"BACKEND": "django.core.files.storage.FileSystemStorage"}),
+        )
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def _subir(self, contenido, nombre="certificado.pdf"):
+        return almacenamiento_por_contenido().save(f"certificados/cursos/{nombre}", ContentFile(contenido))
+
+    def _curso(self, certificado):
+        curso = CursosRealizados(
+            perfil=self.perfil, nombrecurso="Curso", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=10, descripcioncurso="Curso", entidadpatrocinadora="Entidad", rutacertificado=certificado,
+        )
+        # ValidatedModel.save() está bloqueado: se guarda con Model.save para pasar por las señales
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Model.save(curso)
+        return curso
+
+    def _referencias(self, nombre):
+        return Blob.objects.get(nombre=nombre).referencias
+
+    def test_mismo_contenido_un_solo_blob(self):
+        nombre = self._subir(b"%PDF-1.4 certificado", "uno.pdf")
+        self.assertEqual(self._subir(b"%PDF-1.4 certificado", "otro.pdf"), nombre)
+        self.assertNotEqual(self._subir(b"%PDF-1.4 distinto"), nombre)
+
+        self.assertEqual(hash_de_nombre(nombre), hashlib.sha256(b"%PDF-1.4 certificado").hexdigest())
+        self.assertEqual(Blob.objects.count(), 2)
+        self.assertEqual(len(os.listdir(Path(settings.MEDIA_ROOT) / Path(nombre).parent)), 1)
+
+    def test_referencias_al_guardar_y_borrar(self):
+        nombre = self._subir(b"%PDF-1.4 compartido")
+        primero, segundo = self._curso(nombre), self._curso(nombre)
+        self.assertEqual(self._referencias(nombre), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            primero.delete()
+        self.assertEqual(self._referencias(nombre), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            segundo.delete()
+        self.assertEqual(self._referencias(nombre), 0)
+        self.assertTrue(almacenamiento_por_contenido().exists(nombre))  # lo borra solo el GC
+
+    def test_recoleccion_respeta_gracia_y_referencias(self):
+        usado = self._subir(b"%PDF-1.4 usado")
+        huerfano = self._subir(b"%PDF-1.4 huerfano")
+        # bulk_create no dispara señales: recolectar() recuenta antes de borrar
+        CursosRealizados.objects.bulk_create([CursosRealizados(
+            perfil=self.perfil, nombrecurso="Curso", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=10, descripcioncurso="Curso", entidadpatrocinadora="Entidad", rutacertificado=usado,
+        )])
+
+        self.assertEqual(recolectar(gracia=3600), (0, 0))  # recién subido: dentro de la gracia
+        Blob.objects.update(ultimo_uso=timezone.now() - timedelta(hours=2))
+        self.assertEqual(recolectar(gracia=3600, simular=True), (1, len(b"%PDF-1.4 huerfano")))
+        self.assertTrue(almacenamiento_por_contenido().exists(huerfano))
+
+        self.assertEqual(recolectar(gracia=3600), (1, len(b"%PDF-1.4 huerfano")))
+        self.assertEqual(list(Blob.objects.values_list("nombre", flat=True)), [usado])
+        self.assertFalse(almacenamiento_por_contenido().exists(huerfano))
+        self.assertTrue(almacenamiento_por_contenido().exists(usado))
+
+
+# ===============================
+# ✅ ANEXO DE CERTIFICADOS (cv/certificados.py)
+# ===============================
+@skipUnless(pikepdf, "pikepdf no está instalado")
+class AnexoCertificadosTests(SimpleTestCase):
+    """El anexo se corta al llegar a CV_ANEXO_MAX_MB y salta lo que no puede abrir."""
+
+    def setUp(self):
+        self.carpeta = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.carpeta, ignore_errors=True)
+        self.addCleanup(self._cerrar_abiertos)
+
+    def _cerrar_abiertos(self):
+        for pdf in certificados._abiertos.values():
+            if pdf is not None:
+                pdf.close()
+        certificados._abiertos.clear()
+
+    def _certificado(self, nombre, paginas):
+        pdf = pikepdf.new()
+        for _ in range(paginas):
+            pdf.add_blank_page()
+        ruta = self.carpeta / nombre
+        pdf.save(ruta)
+        return str(ruta)
+
+    def _anexar(self, rutas, presupuesto):
+        with override_settings(CV_ANEXO_MAX_MB=presupuesto / (1024 * 1024)), pikepdf.new() as pdf:
+            pdf.add_blank_page()
+            return certificados.anexar(pdf, rutas), len(pdf.pages)
+
+    def test_anexa_todo_dentro_del_presupuesto(self):
+        rutas = [self._certificado("a.pdf", 2), self._certificado("b.pdf", 3)]
+        self.assertEqual(self._anexar(rutas, 10 ** 6), (5, 6))
+
+    def test_corta_al_agotar_el_presupuesto(self):
+        rutas = [self._certificado(f"{n}.pdf", n) for n in (1, 2, 3)]
+        tamanos = [os.path.getsize(r) for r in rutas]
+        # Entran los dos primeros; el tercero ya no (ni los que vinieran detrás)
+        with self.assertLogs("cv.certificados", "WARNING"):
+            self.assertEqual(self._anexar(rutas, tamanos[0] + tamanos[1] + tamanos[2] // 2), (3, 4))
+
+    def test_salta_faltantes_e_ilegibles(self):
+        ilegible = self.carpeta / "roto.pdf"
+        ilegible.write_bytes(b"no es un pdf")
+        rutas = [str(self.carpeta / "falta.pdf"), str(ilegible), self._certificado("a.pdf", 2)]
+        with self.assertLogs("cv.certificados", "WARNING"):
+            self.assertEqual(self._anexar(rutas, 10 ** 6), (2, 3))
+
+
+# ===============================
+# ✅ EXPORT ESTÁTICO (cv/estatico.py)
+# ===============================
+@mock.patch("cv.estatico.COMBINACIONES", [("datos",), ("cursos", "datos")])
+class EstaticoTests(TestCase):
+    """El modo incremental decide con el snapshot de la BD, no con la caché."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            DatosPersonales.objects.bulk_create([DatosPersonales(
+                descripcionperfil="Perfil", apellidos="Lobatón", nombres="María", nacionalidad="Ecuatoriana",
+                lugarnacimiento="Manta", fechanacimiento=date(1990, 1, 1), numerocedula="1300000000",
+                sexo="M", estadocivil="Soltera",
+            )])
+        self.perfil = DatosPersonales.objects.get()
+        self.destino = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.destino, ignore_errors=True)
+
+    def _construir(self, incremental=True):
+        return construir(self.destino, incremental=incremental, log=lambda texto: None)
+
+    def test_cache_vacia_no_regenera(self):
+        self.assertEqual(self._construir(incremental=False), {"paginas": 1, "pdfs": 2})
+        cache.clear()
+        self.assertEqual(self._construir(), {"paginas": 0, "pdfs": 0})
+
+    def test_solo_lo_que_cambio(self):
+        self._construir(incremental=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            CursosRealizados.objects.bulk_create([CursosRealizados(
+                perfil=self.perfil, nombrecurso="Curso", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+                totalhoras=10, descripcioncurso="Curso", entidadpatrocinadora="Entidad",
+            )])
+        # El PDF de solo "datos" no incluye cursos: se reutiliza
+        self.assertEqual(self._construir(), {"paginas": 1, "pdfs": 1})
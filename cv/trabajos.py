@@ -0,0 +1,263 @@
+"""
+✅ Cola de trabajos en segundo plano sobre la misma BD (SQLite local, Postgres en producción).
+
+- ``encolar()`` desde cualquier request: devuelve enseguida.
+- ``python manage.py run_workers -n 4`` levanta N procesos que toman trabajos.
+- Prioridad (mayor primero), deduplicación por ``clave`` y reintentos con
+  backoff exponencial. Un trabajo "en curso" cuyo worker murió se libera
+  pasado ``CV_TRABAJOS_TIMEOUT`` segundos (mientras el worker vive, un latido
+  renueva ``bloqueado_en``); si ya agotó sus intentos queda fallido.
+- Los trabajos hechos o fallidos se borran pasados ``CV_TRABAJOS_RETENCION``
+  días (``purgar_terminados``, que los workers corren cada tanto).
+
+Los tipos de trabajo se registran con ``@tarea("nombre")`` en cv/tareas.py.
+"""
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Trabajo
+
+logger = logging.getLogger(__name__)
+
+TAREAS = {}
+
+BACKOFF_BASE = 5        # segundos
+BACKOFF_MAXIMO = 3600   # segundos
+PURGA_LOTE = 1000       # filas por DELETE: no bloquear la cola mucho rato
+
+
+def tarea(nombre):
+    """✅ Registra una función como tipo de trabajo: ``fn(trabajo, **argumentos)``."""
+    def registrar(fn):
+        TAREAS[nombre] = fn
+        return fn
+    return registrar
+
+
+def encolar(tipo, argumentos=None, clave=None, prioridad=0, max_intentos=5, retraso=0):
+    """
+    ✅ Crea un trabajo pendiente. Si ya hay uno vivo con la misma ``clave``,
+    devuelve ese en lugar de duplicarlo.
+    """
+    if clave:
+        existente = Trabajo.objects.filter(
+            clave=clave, estado__in=[Trabajo.PENDIENTE, Trabajo.EN_CURSO]
+        ).first()
+        if existente:
+            return existente
+
+    try:
+        with transaction.atomic():
+            return Trabajo.objects.create(
+                tipo=tipo,
+                argumentos=argumentos or {},
+                clave=clave,
+                prioridad=prioridad,
+                max_intentos=max_intentos,
+                ejecutar_despues=timezone.now() + timedelta(seconds=retraso),
+            )
+    except IntegrityError:
+        # Otro proceso lo encoló entre el SELECT y el INSERT
+        return Trabajo.objects.get(clave=clave, estado__in=[Trabajo.PENDIENTE, Trabajo.EN_CURSO])
+
+
+def _backoff(intentos):
+    espera = min(BACKOFF_BASE * (2 ** (intentos - 1)), BACKOFF_MAXIMO)
+    return espera * random.uniform(0.8, 1.2)
+
+
+def tomar_trabajo(worker, tipos=None):
+    """
+    ✅ Reclama el siguiente trabajo listo de forma atómica (o None).
+
+    Postgres: SELECT ... FOR UPDATE SKIP LOCKED. SQLite serializa escrituras,
+    así que basta el UPDATE condicional (compare-and-set sobre el estado).
+    """
+    for _ in range(5):
+        with transaction.atomic():
+            qs = Trabajo.objects.filter(
+                estado=Trabajo.PENDIENTE,
+                ejecutar_despues__lte=timezone.now(),
+            )
+            if tipos:
+                qs = qs.filter(tipo__in=tipos)
+            qs = qs.order_by("-prioridad", "ejecutar_despues", "idtrabajo")
+            if connection.features.has_select_for_update_skip_locked:
+                qs = qs.select_for_update(skip_locked=True)
+
+            idtrabajo = qs.values_list("idtrabajo", flat=True).first()
+            if idtrabajo is None:
+                return None
+
+            tomados = Trabajo.objects.filter(idtrabajo=idtrabajo, estado=Trabajo.PENDIENTE).update(
+                estado=Trabajo.EN_CURSO,
+                bloqueado_por=worker,
+                bloqueado_en=timezone.now(),
+                intentos=F("intentos") + 1,
+                actualizado=timezone.now(),
+            )
+        if tomados:
+            return Trabajo.objects.get(idtrabajo=idtrabajo)
+    return None
+
+
+def _latir(trabajo):
+    """Renueva ``bloqueado_en`` si el trabajo sigue en manos de este worker."""
+    return Trabajo.objects.filter(
+        idtrabajo=trabajo.idtrabajo, estado=Trabajo.EN_CURSO, bloqueado_por=trabajo.bloqueado_por,
+    ).update(bloqueado_en=timezone.now())
+
+
+class _Latido(threading.Thread):
+    """
+    Late cada ``CV_TRABAJOS_TIMEOUT / 3`` s mientras corre el trabajo: un render
+    largo no parece abandonado y ``liberar_abandonados`` no se lo da a otro worker.
+    """
+
+    def __init__(self, trabajo):
+        super().__init__(daemon=True)
+        self.trabajo = trabajo
+        self.detener = threading.Event()
+
+    def run(self):
+        intervalo = max(1.0, settings.CV_TRABAJOS_TIMEOUT / 3)
+        try:
+            while not self.detener.wait(intervalo):
+                try:
+                    _latir(self.trabajo)
+                except Exception:
+                    logger.warning("Latido del trabajo %s falló", self.trabajo, exc_info=True)
+        finally:
+            connection.close()  # la conexión de este hilo
+
+
+def ejecutar(trabajo):
+    """✅ Corre el trabajo y deja registrado el resultado o el error (con reintento)."""
+    fn = TAREAS.get(trabajo.tipo)
+    latido = _Latido(trabajo)
+    latido.start()
+    try:
+        if fn is None:
+            raise LookupError(f"Tipo de trabajo desconocido: {trabajo.tipo}")
+        resultado = fn(trabajo, **trabajo.argumentos)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Trabajo %s falló (intento %s)", trabajo, trabajo.intentos)
+
+        cambios = {"error": error[-5000:], "bloqueado_por": None, "bloqueado_en": None}
+        if trabajo.intentos >= trabajo.max_intentos or fn is None:
+            cambios["estado"] = Trabajo.FALLIDO
+        else:
+            cambios["estado"] = Trabajo.PENDIENTE
+            cambios["ejecutar_despues"] = timezone.now() + timedelta(seconds=_backoff(trabajo.intentos))
+        _guardar(trabajo, **cambios)
+        return False
+    finally:
+        latido.detener.set()
+        latido.join()
+
+    _guardar(
+        trabajo,
+        estado=Trabajo.HECHO, resultado=resultado, progreso=100,
+        error="", bloqueado_por=None, bloqueado_en=None,
+    )
+    return True
+
+
+def _guardar(trabajo, **cambios):
+    cambios["actualizado"] = timezone.now()
+    Trabajo.objects.filter(idtrabajo=trabajo.idtrabajo).update(**cambios)
+    for campo, valor in cambios.items():
+        setattr(trabajo, campo, valor)
+
+
+def reportar_progreso(trabajo, porcentaje):
+    _guardar(trabajo, progreso=max(0, min(100, int(porcentaje))))
+
+
+def liberar_abandonados():
+    """
+    Trabajos "en curso" de workers que murieron (sin latido) vuelven a la cola,
+    salvo los que ya agotaron sus intentos: esos quedan fallidos (un trabajo que
+    tumba a su worker, p. ej. por memoria, no se reintenta para siempre).
+    """
+    ahora = timezone.now()
+    abandonados = Trabajo.objects.filter(
+        estado=Trabajo.EN_CURSO, bloqueado_en__lt=ahora - timedelta(seconds=settings.CV_TRABAJOS_TIMEOUT),
+    )
+    fallidos = abandonados.filter(intentos__gte=F("max_intentos")).update(
+        estado=Trabajo.FALLIDO, bloqueado_por=None, bloqueado_en=None, actualizado=ahora,
+        error="El worker murió o dejó de responder en el último intento.",
+    )
+    liberados = abandonados.filter(intentos__lt=F("max_intentos")).update(
+        estado=Trabajo.PENDIENTE, bloqueado_por=None, bloqueado_en=None, actualizado=ahora,
+    )
+    return liberados + fallidos
+
+
+def purgar_terminados():
+    """✅ Borra (por lotes) los trabajos hechos o fallidos más viejos que la retención."""
+    limite = timezone.now() - timedelta(days=settings.CV_TRABAJOS_RETENCION)
+    viejos = Trabajo.objects.filter(estado__in=[Trabajo.HECHO, Trabajo.FALLIDO], actualizado__lt=limite)
+    borrados = 0
+    while True:
+        ids = list(viejos.values_list("idtrabajo", flat=True)[:PURGA_LOTE])
+        if not ids:
+            return borrados
+        borrados += Trabajo.objects.filter(idtrabajo__in=ids).delete()[0]
+        if len(ids) < PURGA_LOTE:
+            return borrados
+
+
+# ===============================
+# ✅ BUCLE DEL WORKER
+# ===============================
+
+def bucle_worker(numero, tipos=None, una_vez=False, espera=1.0):
+    """
+    Bucle de cada proceso de ``run_workers``: toma, ejecuta y repite
+    hasta recibir SIGTERM/SIGINT (o vaciar la cola con ``una_vez``).
+    """
+    from . import tareas  # noqa: F401  (registra los tipos de trabajo)
+
+    worker = f"{socket.gethostname()}:{os.getpid()}:{numero}"
+    detener = False
+
+    def _al_terminar(signum, frame):
+        nonlocal detener
+        detener = True
+
+    signal.signal(signal.SIGTERM, _al_terminar)
+    signal.signal(signal.SIGINT, _al_terminar)
+
+    ultima_limpieza = 0.0
+    while not detener:
+        close_old_connections()
+
+        if time.monotonic() - ultima_limpieza > 60:
+            liberar_abandonados()
+            purgar_terminados()
+            ultima_limpieza = time.monotonic()
+
+        trabajo = tomar_trabajo(worker, tipos)
+        if trabajo is None:
+            if una_vez:
+                break
+            time.sleep(espera)
+            continue
+
+        ejecutar(trabajo)
+
+    connection.close()
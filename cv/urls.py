@@ -4,4 +4,8 @@ from . import views
 urlpatterns = [
     path("", views.cv_view, name="cv"),
     path("pdf/", views.cv_pdf, name="cv_pdf"),
+    path("pdf/jobs/", views.cv_pdf_trabajos, name="cv_pdf_trabajos"),
+    path("pdf/jobs/<int:idtrabajo>/", views.cv_pdf_trabajo, name="cv_pdf_trabajo"),
+    path("buscar/", views.cv_buscar, name="cv_buscar"),
+    path("garage/", views.cv_garage, name="cv_garage"),
 ]
@@ -0,0 +1,91 @@
+"""
+✅ Versión por (perfil, sección) guardada en la caché compartida.
+
+Las señales la incrementan cuando cambia una fila de la sección; la plantilla
+usa la versión como parte de la clave de cada fragmento en caché, así que
+guardar un curso solo invalida el fragmento de cursos.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from .models import (
+    ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage
+)
+
+
+SECCION_POR_MODELO = {
+    ExperienciaLaboral: "experiencia",
+    CursosRealizados: "cursos",
+    Reconocimientos: "reconocimientos",
+    ProductosAcademicos: "prod_academicos",
+    ProductosLaborales: "prod_laborales",
+    VentaGarage: "garage",
+}
+
+# "datos" = encabezado y datos personales (cambia con DatosPersonales)
+SECCION_DATOS = "datos"
+
+SECCIONES = (SECCION_DATOS,) + tuple(SECCION_POR_MODELO.values())
+
+
+def _clave(idperfil, seccion):
+    return f"cv:version:{idperfil}:{seccion}"
+
+
+def _semilla():
+    # Si la caché perdió la versión, arrancamos en un valor nuevo (ms actuales)
+    # para no reutilizar por accidente fragmentos de una versión anterior.
+    return int(time.time() * 1000)
+
+
+def versiones_perfil(idperfil):
+    """✅ {seccion: version} del perfil en una sola lectura de caché."""
+    claves = {_clave(idperfil, s): s for s in SECCIONES}
+    encontradas = cache.get_many(claves)
+
+    faltantes = {k: _semilla() for k in claves if k not in encontradas}
+    if faltantes:
+        for k, v in faltantes.items():
+            cache.add(k, v, timeout=None)
+        encontradas.update(cache.get_many(faltantes))
+
+    return {s: encontradas.get(k, faltantes.get(k)) for k, s in claves.items()}
+
+
+def incrementar_version(idperfil, seccion):
+    clave = _clave(idperfil, seccion)
+    try:
+        return cache.incr(clave)
+    except ValueError:
+        cache.add(clave, _semilla(), timeout=None)
+        return cache.incr(clave)
+
+
+def huella_versiones(idperfil, secciones=None):
+    """
+    ✅ Hash corto de las versiones de las secciones pedidas (+ datos).
+    Sirve como parte de las claves de caché de página/PDF completos.
+    """
+    versiones = versiones_perfil(idperfil)
+    incluidas = sorted({SECCION_DATOS, *(secciones if secciones is not None else SECCIONES)} & set(SECCIONES))
+    crudo = "|".join(f"{s}={versiones[s]}" for s in incluidas)
+    return hashlib.blake2b(crudo.encode(), digest_size=8).hexdigest()
+
+
+def etiquetas_perfil(idperfil, secciones=None):
+    """
+    ✅ Etiquetas de caché de una página/PDF: el perfil y cada sección incluida.
+    Las señales invalidan "perfil:<id>:<seccion>" cuando cambia esa sección.
+    """
+    incluidas = sorted({SECCION_DATOS, *(secciones if secciones is not None else SECCIONES)} & set(SECCIONES))
+    return [f"perfil:{idperfil}"] + [f"perfil:{idperfil}:{s}" for s in incluidas]
+
+
+def invalidar_seccion(idperfil, seccion):
+    """Borra ya las páginas/PDFs que incluían la sección (si el backend tiene etiquetas)."""
+    invalidar = getattr(cache, "invalidar_etiqueta", None)
+    if invalidar is not None:
+        invalidar(f"perfil:{idperfil}:{seccion}")
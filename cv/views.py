@@ -1,64 +1,160 @@
-from django.shortcuts import render
-from django.http import HttpResponse
+import io
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render, get_object_or_404
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_POST
+
+from .models import DatosPersonales, Trabajo
+from .busqueda import buscar
+from .snapshots import obtener as obtener_snapshot, version_contenido
+from .estadisticas import obtener as obtener_estadisticas
+from .catalogo import pagina_garage, LIMITE_POR_DEFECTO
+from .versiones import versiones_perfil, huella_versiones, etiquetas_perfil
+from .routers import lectura_en_replica
+from .compresion import con_variantes_comprimidas, respuesta_desde_entrada
+from .linealizado import reescribir
+from .calidad_pdf import CALIDADES, nombre_calidad
+from .certificados import ANEXO as ANEXO_CERTIFICADOS, rutas as rutas_certificados
+from .rangos import con_rangos
+from .trabajos import encolar
+from .consultas import presupuesto_consultas
+from .admision import con_admision
+
+
+
+#  CLAVES DE CACHÉ (página y PDF completos, por versión de contenido)
+
+SECCIONES_PDF = {
+    "datos", "experiencia", "cursos", "reconocimientos",
+    "prod_academicos", "prod_laborales", "garage",
+}
+
+
+def secciones_pdf(secciones):
+    """Secciones válidas pedidas, ordenadas (+ "certificados" si se pide el anexo)."""
+    return sorted(set(secciones) & (SECCIONES_PDF | {ANEXO_CERTIFICADOS}))
+
+
+def _id_perfil_activo(request):
+    # Se memoriza en el request: la clave de caché, las etiquetas y la vista lo piden
+    if not hasattr(request, "_cv_idperfil"):
+        request._cv_idperfil = (
+            DatosPersonales.objects.filter(perfilactivo=1).values_list("idperfil", flat=True).first()
+        )
+    return request._cv_idperfil
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.pdfbase.pdfmetrics import stringWidth
 
-from .models import (
-    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
-    ProductosAcademicos, ProductosLaborales, VentaGarage
-)
+def clave_pagina(idperfil):
+    return f"cv:pagina:{idperfil}:{huella_versiones(idperfil)}"
 
 
+def clave_pdf(idperfil, secciones, calidad=None):
+    secciones = secciones_pdf(secciones)
+    formato = "lin" if settings.CV_PDF_LINEALIZADO else "pdf"
+    return (
+        f"cv:{formato}:{nombre_calidad(calidad)}:{idperfil}:{','.join(secciones)}:"
+        f"{huella_versiones(idperfil, secciones)}"
+    )
 
-#  VISTA NORMAL HTML
 
-def cv_view(request):
-    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+def _clave_pagina(request):
+    idperfil = _id_perfil_activo(request)
+    if idperfil is None:
+        return None
+    return clave_pagina(idperfil)
 
-    experiencia = []
-    cursos = []
-    reconocimientos = []
-    productos_academicos = []
-    productos_laborales = []
-    garage = []
 
-    if perfil:
-        experiencia = ExperienciaLaboral.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
+def _clave_pdf(request):
+    idperfil = _id_perfil_activo(request)
+    if idperfil is None:
+        return None
+    return clave_pdf(idperfil, request.GET.getlist("sec"), request.GET.get("calidad"))
 
-        cursos = CursosRealizados.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
 
-        reconocimientos = Reconocimientos.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
+def _etiquetas_pagina(request):
+    return etiquetas_perfil(_id_perfil_activo(request))
 
-        productos_academicos = ProductosAcademicos.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
 
-        productos_laborales = ProductosLaborales.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
+def _etiquetas_pdf(request):
+    return etiquetas_perfil(_id_perfil_activo(request), set(request.GET.getlist("sec")) & SECCIONES_PDF)
+
+
+#  ETag / Last-Modified (versión de contenido del snapshot)
+
+def _contenido(request):
+    if not hasattr(request, "_cv_contenido"):
+        idperfil = _id_perfil_activo(request)
+        request._cv_contenido = version_contenido(idperfil) if idperfil is not None else None
+    return request._cv_contenido
 
-        #  Solo mostrar lo que NO esté vendido (si existe ese estado)
-        garage = VentaGarage.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        ).exclude(estadoproducto="Vendido")
 
-    return render(request, "cv/cv.html", {
+def _etag(request, *partes):
+    # Débil: br, gzip e identity son la misma representación
+    contenido = _contenido(request)
+    if contenido is None:
+        return None
+    partes = (_id_perfil_activo(request), contenido.version, settings.CV_VERSION_DESPLIEGUE, *partes)
+    return 'W/"' + ".".join(map(str, partes)) + '"'
+
+
+def _etag_pagina(request):
+    return _etag(request)
+
+
+def _etag_pdf(request):
+    return _etag(
+        request,
+        "-".join(secciones_pdf(request.GET.getlist("sec"))),
+        nombre_calidad(request.GET.get("calidad")),
+    )
+
+
+def _ultima_modificacion(request):
+    contenido = _contenido(request)
+    return contenido.actualizado if contenido is not None else None
+
+
+
+#  VISTA NORMAL HTML
+
+def contexto_cv(idperfil, estatico=False):
+    """
+    ✅ Contexto de cv.html para un perfil (None = sin perfil activo), leído del
+    snapshot desnormalizado (cv/snapshots.py) con una consulta por clave primaria.
+    ``estatico`` lo usa build_static: sin filtros ni "ver más" del garage.
+    """
+    perfil = None
+    experiencia = []
+    cursos = []
+    reconocimientos = []
+    productos_academicos = []
+    productos_laborales = []
+    garage = None
+    versiones = {}
+    estadisticas = None
+
+    documento = obtener_snapshot(idperfil) if idperfil is not None else None
+    if documento:
+        perfil = documento.perfil
+
+        #  Solo las columnas que dibuja cv.html (cv/proyecciones.py)
+        experiencia = documento.seccion("experiencia", "html")
+        cursos = documento.seccion("cursos", "html")
+        reconocimientos = documento.seccion("reconocimientos", "html")
+        productos_academicos = documento.seccion("prod_academicos", "html")
+        productos_laborales = documento.seccion("prod_laborales", "html")
+
+        #  Solo la primera página del catálogo (lo demás vía cv_garage)
+        garage = documento.pagina_garage()
+        versiones = versiones_perfil(perfil.idperfil)
+        estadisticas = obtener_estadisticas(perfil.idperfil)
+
+    return {
         "perfil": perfil,
         "experiencia": experiencia,
         "cursos": cursos,
@@ -66,350 +162,206 @@ def cv_view(request):
         "productos_academicos": productos_academicos,
         "productos_laborales": productos_laborales,
         "garage": garage,
-    })
+        "versiones": versiones,
+        "estadisticas": estadisticas,
+        "fragmentos_timeout": settings.CV_CACHE_FRAGMENTOS,
+        "estatico": estatico,
+    }
+
+
+# ✅ Caché fría con snapshot: perfil activo, versión, snapshot y estadísticas
+@presupuesto_consultas(6)
+@lectura_en_replica
+@condition(etag_func=_etag_pagina, last_modified_func=_ultima_modificacion)
+@con_variantes_comprimidas(_clave_pagina, _etiquetas_pagina)
+def cv_view(request):
+    return render(request, "cv/cv.html", contexto_cv(_id_perfil_activo(request)))
 
 
 
-#  PDF
+#  CATÁLOGO DE GARAGE (partial HTML)
 
-def cv_pdf(request):
-    secciones = request.GET.getlist("sec")
+@lectura_en_replica
+def cv_garage(request):
     perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+    cursor = request.GET.get("cursor")
 
-    experiencia = []
-    cursos = []
-    reconocimientos = []
-    productos_academicos = []
-    productos_laborales = []
     garage = []
+    garage_siguiente = None
 
     if perfil:
-        experiencia = ExperienciaLaboral.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
+        try:
+            limite = int(request.GET.get("limite", LIMITE_POR_DEFECTO))
+        except ValueError:
+            limite = LIMITE_POR_DEFECTO
+
+        garage, garage_siguiente = pagina_garage(
+            perfil,
+            estado=request.GET.get("estado"),
+            minimo=request.GET.get("min"),
+            maximo=request.GET.get("max"),
+            orden=request.GET.get("orden", "precio"),
+            cursor=cursor,
+            limite=limite,
         )
 
-        cursos = CursosRealizados.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
+    return render(request, "cv/garage_items.html", {
+        "garage": garage,
+        "garage_siguiente": garage_siguiente,
+        "cursor": cursor,
+    })
 
-        reconocimientos = Reconocimientos.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
 
-        productos_academicos = ProductosAcademicos.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
 
-        productos_laborales = ProductosLaborales.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
+#  PDF
 
-        garage = VentaGarage.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        ).exclude(estadoproducto="Vendido")
+def renderizar_pdf(idperfil, secciones, salida, invariante=False, progreso=None, calidad=None):
+    """
+    ✅ Dibuja el PDF del perfil (desde su snapshot) con las secciones pedidas en
+    ``salida``, con la ``calidad`` pedida (cv/calidad_pdf.py), linealizado si
+    ``CV_PDF_LINEALIZADO`` (cv/linealizado.py) y con los certificados al final
+    si se pide "certificados" (cv/certificados.py).
+    """
+    calidad = CALIDADES[nombre_calidad(calidad)]
+    documento = obtener_snapshot(idperfil) if idperfil is not None else None
+    perfil = documento.perfil if documento else None
+
+    #  Solo las columnas que dibuja dibujar_cv, y solo de las secciones pedidas
+    def cargar(nombre):
+        return documento.filas(nombre, "pdf") if documento and nombre in secciones else []
+
+    # ReportLab se importa solo aquí (carga perezosa)
+    from .pdf import dibujar_cv
+
+    anexos = []
+    if documento and ANEXO_CERTIFICADOS in secciones:
+        anexos = rutas_certificados(documento, secciones)
+    reescribir_con_qpdf = settings.CV_PDF_LINEALIZADO or calidad.compactar or anexos
+    destino = io.BytesIO() if reescribir_con_qpdf else salida
+    dibujar_cv(
+        destino, perfil, secciones,
+        cargar("experiencia"), cargar("cursos"), cargar("reconocimientos"),
+        cargar("prod_academicos"), cargar("prod_laborales"), cargar("garage"),
+        estadisticas=obtener_estadisticas(idperfil) if documento else None,
+        calidad=calidad,
+        invariante=invariante,
+        progreso=progreso,
+    )
+    if destino is not salida:
+        salida.write(reescribir(
+            destino.getvalue(), linealizar=settings.CV_PDF_LINEALIZADO, compactar=calidad.compactar,
+            anexos=anexos,
+        ))
+
+
+@presupuesto_consultas(6)
+@lectura_en_replica
+@con_rangos
+@condition(etag_func=_etag_pdf, last_modified_func=_ultima_modificacion)
+@con_variantes_comprimidas(_clave_pdf, _etiquetas_pdf)
+@con_admision  # solo los renders (sin caché) piden turno
+def cv_pdf(request):
+    secciones = request.GET.getlist("sec")
 
     response = HttpResponse(content_type="application/pdf")
     response["Content-Disposition"] = 'inline; filename="hoja_vida.pdf"'
 
-    p = canvas.Canvas(response, pagesize=letter)
-    width, height = letter
-
-    # Márgenes
-    x_left = 2 * cm
-    x_right = width - 2 * cm
-    y = height - 2 * cm
-
-    
-    # Funciones de apoyo
-
-    def nueva_pagina_si_es_necesario():
-        nonlocal y
-        if y < 3 * cm:
-            p.showPage()
-            y = height - 2 * cm
-
-    def draw_section_title(text):
-        """
-        ✅ Título de sección y línea separada correctamente (NO roza el texto)
-        """
-        nonlocal y
-        nueva_pagina_si_es_necesario()
-
-        # Aire arriba (para que no se pegue a la tarjeta anterior)
-        y -= 0.15 * cm
-
-        #  Título
-        p.setFillColor(colors.HexColor("#1f2937"))
-        p.setFont("Helvetica-Bold", 12)
-        p.drawString(x_left, y, text.upper())
-
-        # bajar un poquito para que NO roce
-        y -= 0.55 * cm
-
-        #  Línea abajo (NO en datos personales si no quieres)
-        if text.lower() != "datos personales":
-            p.setStrokeColor(colors.HexColor("#1f2937"))
-            p.setLineWidth(1)
-            p.line(x_left, y, x_right, y)
-
-        # bajar un poquito para empezar tarjetas/texto
-        y -= 0.45 * cm
-
-    def draw_wrapped_text(text, font="Helvetica", size=10, leading=16, max_width=None):
-        """
-        ✅ Texto con salto de línea automático
-        """
-        nonlocal y
-        if not text:
-            return
-
-        if max_width is None:
-            max_width = x_right - x_left
-
-        p.setFont(font, size)
-        p.setFillColor(colors.black)
-
-        words = str(text).split()
-        line = ""
-
-        for w in words:
-            test = (line + " " + w).strip()
-            if stringWidth(test, font, size) <= max_width:
-                line = test
-            else:
-                nueva_pagina_si_es_necesario()
-                p.drawString(x_left, y, line)
-                y -= leading
-                line = w
-
-        if line:
-            nueva_pagina_si_es_necesario()
-            p.drawString(x_left, y, line)
-            y -= leading
-
-        y -= 4  # aire
-
-    def draw_card(title, subtitle=None, body=None):
-        """
-        ✅ Tarjeta gris que cubre TODO el texto
-        """
-        nonlocal y
-        nueva_pagina_si_es_necesario()
-
-        padding = 12
-        leading = 12
-        text_width = (x_right - x_left - 2 * padding)
-
-        def contar_lineas(texto, font="Helvetica", size=9, max_width=text_width):
-            if not texto:
-                return 0
-            palabras = str(texto).split()
-            linea = ""
-            lineas = 1
-            for w in palabras:
-                prueba = (linea + " " + w).strip()
-                if stringWidth(prueba, font, size) <= max_width:
-                    linea = prueba
-                else:
-                    lineas += 1
-                    linea = w
-            return lineas
-
-        # altura real
-        card_height = 10
-        card_height += 16  # título
-
-        if subtitle:
-            card_height += 13
-
-        if body:
-            lineas_body = contar_lineas(body, font="Helvetica", size=9)
-            card_height += (lineas_body * leading)
-
-        card_height += 14
-
-        #  dibujar tarjeta
-        p.setFillColor(colors.HexColor("#F3F4F6"))
-        p.setStrokeColor(colors.HexColor("#D1D5DB"))
-        p.roundRect(
-            x_left, y - card_height,
-            x_right - x_left, card_height,
-            10, fill=1, stroke=1
-        )
+    renderizar_pdf(_id_perfil_activo(request), secciones, response, calidad=request.GET.get("calidad"))
+    return response
 
-        text_y = y - 20
 
-        p.setFillColor(colors.HexColor("#111827"))
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(x_left + padding, text_y, str(title))
-        text_y -= 14
 
-        if subtitle:
-            p.setFillColor(colors.HexColor("#374151"))
-            p.setFont("Helvetica", 9)
-            p.drawString(x_left + padding, text_y, str(subtitle))
-            text_y -= 12
+#  PDF ASÍNCRONO (cola de trabajos)
 
-        if body:
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica", 9)
+def _estado_trabajo(trabajo):
+    datos = {
+        "id": trabajo.idtrabajo,
+        "estado": trabajo.estado,
+        "progreso": trabajo.progreso,
+        "estado_url": reverse("cv_pdf_trabajo", args=[trabajo.idtrabajo]) + "?estado=1",
+    }
+    if trabajo.estado == Trabajo.HECHO:
+        datos["descarga"] = reverse("cv_pdf_trabajo", args=[trabajo.idtrabajo])
+    return datos
 
-            palabras = str(body).split()
-            linea = ""
 
-            for w in palabras:
-                prueba = (linea + " " + w).strip()
-                if stringWidth(prueba, "Helvetica", 9) <= text_width:
-                    linea = prueba
-                else:
-                    p.drawString(x_left + padding, text_y, linea)
-                    text_y -= leading
-                    linea = w
+@csrf_exempt  # acción pública sin sesión: la página cacheada no lleva token CSRF
+@require_POST
+def cv_pdf_trabajos(request):
+    """
+    ✅ POST /pdf/jobs/ con sec=...: devuelve el PDF ya cacheado o un trabajo en cola.
+    La concurrencia de render la fija el pool: run_workers -n K --tipo pdf_cv
+    """
+    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+    if not perfil:
+        return JsonResponse({"error": "No existe un perfil activo."}, status=404)
 
-            if linea:
-                p.drawString(x_left + padding, text_y, linea)
+    secciones = secciones_pdf(request.POST.getlist("sec"))
+    calidad = nombre_calidad(request.POST.get("calidad"))
+    clave = clave_pdf(perfil.idperfil, secciones, calidad)
 
-        y -= (card_height + 14)
+    if cache.get(clave) is not None:
+        parametros = [("sec", s) for s in secciones] + [("calidad", calidad)]
+        return JsonResponse({
+            "estado": Trabajo.HECHO,
+            "progreso": 100,
+            "descarga": reverse("cv_pdf") + "?" + urlencode(parametros),
+        })
 
-    
-    # Encabezado con foto
-    
-    if not perfil:
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(x_left, y, "No existe un perfil activo.")
-        p.showPage()
-        p.save()
-        return response
-
-    #  Foto más grande + buena posición
-    foto_size = 3.6 * cm
-    foto_x = x_right - foto_size - 0.6 * cm
-    foto_y = height - 5.0 * cm
-
-    if hasattr(perfil, "fotoperfil") and perfil.fotoperfil:
-        try:
-            p.drawImage(perfil.fotoperfil.path, foto_x, foto_y,
-                        width=foto_size, height=foto_size, mask="auto")
-        except:
-            pass
-
-    # Nombre
-    p.setFillColor(colors.HexColor("#111827"))
-    p.setFont("Helvetica-Bold", 18)
-    p.drawString(x_left, y, f"{perfil.nombres} {perfil.apellidos}")
-    y -= 22
-
-    #  Descripción
-    p.setFillColor(colors.HexColor("#4b5563"))
-    p.setFont("Helvetica", 11)
-    p.drawString(x_left, y, perfil.descripcionperfil)
-    y -= 25
-
-    
-    # Datos personales
-    
-    if "datos" in secciones:
-        draw_section_title("Datos personales")
-        draw_wrapped_text(f"Cédula: {perfil.numerocedula}", size=10)
-        draw_wrapped_text(f"Nacionalidad: {perfil.nacionalidad}", size=10)
-        draw_wrapped_text(f"Dirección: {perfil.direcciondomiciliaria}", size=10)
-
-    
-    # Experiencia
-    
-    if "experiencia" in secciones:
-        draw_section_title("Experiencia laboral")
-        if experiencia:
-            for e in experiencia:
-                draw_card(
-                    title=f"{e.cargodesempenado} - {e.nombrempresa}",
-                    subtitle=e.lugarempresa,
-                    body=e.descripcionfunciones
-                )
-        else:
-            draw_card("No hay experiencia registrada.")
-
-    
-    # Cursos
-    
-    if "cursos" in secciones:
-        draw_section_title("Cursos realizados")
-        if cursos:
-            for c in cursos:
-                draw_card(
-                    title=f"{c.nombrecurso} ({c.totalhoras} horas)",
-                    subtitle=f"{c.fechainicio} - {c.fechafin}",
-                    body=c.descripcioncurso
-                )
-        else:
-            draw_card("No hay cursos registrados.")
-
-    
-    # Reconocimientos
-    
-    if "reconocimientos" in secciones:
-        draw_section_title("Reconocimientos")
-        if reconocimientos:
-            for r in reconocimientos:
-                draw_card(
-                    title=f"{r.tiporeconocimiento}: {r.descripcionreconocimiento}",
-                    subtitle=r.entidadpatrocinadora,
-                    body=""
-                )
-        else:
-            draw_card("No hay reconocimientos registrados.")
-
-    
-    # Productos académicos
-
-    if "prod_academicos" in secciones:
-        draw_section_title("Productos académicos")
-        if productos_academicos:
-            for pa in productos_academicos:
-                draw_card(
-                    title=pa.nombrerecurso,
-                    subtitle=pa.clasificador,
-                    body=pa.descripcion
-                )
-        else:
-            draw_card("No hay productos académicos registrados.")
-
-    
-    # Productos laborales
-    
-    if "prod_laborales" in secciones:
-        draw_section_title("Productos laborales")
-        if productos_laborales:
-            for pl in productos_laborales:
-                draw_card(
-                    title=pl.nombreproducto,
-                    subtitle=str(pl.fechaproducto),
-                    body=pl.descripcion
-                )
-        else:
-            draw_card("No hay productos laborales registrados.")
-
-    
-    # Venta de garage
-    
-    if "garage" in secciones:
-        draw_section_title("Venta de garage")
-        if garage:
-            for g in garage:
-                draw_card(
-                    title=f"{g.nombreproducto} - ${g.valordelbien}",
-                    subtitle=f"Estado: {g.estadoproducto}",
-                    body=g.descripcion
-                )
-        else:
-            draw_card("No hay productos disponibles en garage.")
-
-    p.showPage()
-    p.save()
-    return response         
\ No newline at end of file
+    trabajo = encolar(
+        "pdf_cv",
+        {"idperfil": perfil.idperfil, "secciones": secciones, "calidad": calidad},
+        # Mismo perfil + secciones + versión = mismo trabajo
+        clave=clave,
+        prioridad=10,
+        max_intentos=3,
+    )
+    return JsonResponse(_estado_trabajo(trabajo), status=202)
+
+
+@con_rangos
+def cv_pdf_trabajo(request, idtrabajo):
+    """✅ GET /pdf/jobs/<id>/: progreso en JSON, o el PDF cuando está listo."""
+    trabajo = get_object_or_404(Trabajo, idtrabajo=idtrabajo, tipo="pdf_cv")
+
+    if trabajo.estado == Trabajo.FALLIDO:
+        return JsonResponse(_estado_trabajo(trabajo), status=500)
+
+    if trabajo.estado != Trabajo.HECHO or request.GET.get("estado"):
+        status = 200 if trabajo.estado == Trabajo.HECHO else 202
+        return JsonResponse(_estado_trabajo(trabajo), status=status)
+
+    entrada = cache.get(trabajo.resultado["clave"])
+    if entrada is None:
+        # La caché expulsó el PDF (o cambió el contenido): se vuelve a encolar con
+        # la clave de hoy, la misma que calcula un POST /pdf/jobs/ (deduplica)
+        clave = clave_pdf(**trabajo.argumentos)
+        entrada = cache.get(clave)
+        if entrada is None:
+            trabajo = encolar("pdf_cv", trabajo.argumentos, clave=clave, prioridad=10, max_intentos=3)
+            return JsonResponse(_estado_trabajo(trabajo), status=202)
+
+    return respuesta_desde_entrada(request, entrada)
+
+
+
+#  BÚSQUEDA (JSON)
+
+def cv_buscar(request):
+    texto = request.GET.get("q", "").strip()
+    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+
+    if not perfil or not texto:
+        return JsonResponse({"resultados": [], "siguiente": None})
+
+    try:
+        limite = int(request.GET.get("limite", 20))
+    except ValueError:
+        limite = 20
+
+    resultados, siguiente = buscar(
+        perfil.idperfil, texto,
+        cursor=request.GET.get("cursor"),
+        limite=limite,
+    )
+    return JsonResponse({"resultados": resultados, "siguiente": siguiente})